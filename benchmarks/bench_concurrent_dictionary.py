@@ -0,0 +1,106 @@
+"""
+Multi-threaded throughput of Dictionary behind a lock vs ConcurrentDictionary.
+
+Each thread runs a read-mostly mix (``--write-every`` lookups per write)
+against a table preloaded with ``--words`` entries, one word at a time or in
+``--batch`` sized look_many/newentries calls. On a GIL build threads mostly
+take turns, so the gains come from skipping the lock; run it on a
+free-threaded build (python3.13t and later) to see reads scale with threads.
+
+    uv run python -m benchmarks.bench_concurrent_dictionary --threads 1,2,4,8
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from src.exercises.concurrent_dictionary import ConcurrentDictionary
+from src.exercises.dictionary import Dictionary
+
+
+class LockedDictionary:
+    """What callers do today: every call under one external lock."""
+
+    def __init__(self):
+        self._dictionary = Dictionary()
+        self._lock = threading.Lock()
+
+    def newentry(self, word, definition):
+        with self._lock:
+            self._dictionary.newentry(word, definition)
+
+    def look(self, word):
+        with self._lock:
+            return self._dictionary.look(word)
+
+    def newentries(self, entries):
+        with self._lock:
+            for word, definition in entries:
+                self._dictionary.newentry(word, definition)
+
+    def look_many(self, words):
+        with self._lock:
+            return [self._dictionary.look(word) for word in words]
+
+
+def run(d, threads: int, ops: int, write_every: int, batch: int, words: int) -> float:
+    """Total operations per second over ``threads`` threads of ``ops`` each."""
+    start = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [f"word{rng.randrange(words)}" for _ in range(batch)]
+        start.wait()
+        for i in range(0, ops, batch):
+            if batch == 1:
+                if i % write_every == 0:
+                    d.newentry(keys[0], "updated")
+                else:
+                    d.look(keys[0])
+            elif (i // batch) % write_every == 0:
+                d.newentries((key, "updated") for key in keys)
+            else:
+                d.look_many(keys)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - began)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=200_000, help="per thread")
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--write-every", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    print(
+        f"Python {sys.version.split()[0]}, GIL {'on' if is_gil_enabled() else 'off'}, "
+        f"{args.words} words, 1 write per {args.write_every} reads\n"
+    )
+    print(f"{'threads':>8}{'mode':>8}{'locked ops/s':>15}{'concurrent ops/s':>19}")
+    for threads in (int(t) for t in args.threads.split(",")):
+        for batch in (1, args.batch):
+            rates = []
+            for factory in (LockedDictionary, ConcurrentDictionary):
+                d = factory()
+                d.newentries((f"word{i}", "definition") for i in range(args.words))
+                rates.append(
+                    run(d, threads, args.ops, args.write_every, batch, args.words)
+                )
+            mode = "single" if batch == 1 else f"x{batch}"
+            print(f"{threads:>8}{mode:>8}{rates[0]:>15,.0f}{rates[1]:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
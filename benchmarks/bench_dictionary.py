@@ -0,0 +1,90 @@
+"""
+Memory and lookup latency of Dictionary vs CompactDictionary vs frozen.
+
+Builds each variant with the same generated words, measures the memory it
+allocated with tracemalloc, then times hits and misses per lookup. The
+frozen variant is timed from the file written by ``freeze``, including how
+long opening it takes.
+
+    uv run python -m benchmarks.bench_dictionary --words 1000000
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from src.exercises.compact_dictionary import CompactDictionary, FrozenDictionary
+from src.exercises.dictionary import Dictionary
+
+
+def allocated(build):
+    """Return what ``build()`` returns and the bytes it left allocated."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def per_lookup_ns(look, words) -> float:
+    start = time.perf_counter()
+    for word in words:
+        look(word)
+    return (time.perf_counter() - start) / len(words) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    hits = [f"word{rng.randrange(args.words):08d}" for _ in range(args.lookups)]
+    misses = [f"missing{i}" for i in range(args.lookups)]
+
+    def fill(d):
+        # Strings are created here so the dict's heap includes its str objects
+        for i in range(args.words):
+            d.newentry(f"word{i:08d}", f"definition number {i} of the word ✓")
+        return d
+
+    dictionary, dict_bytes = allocated(lambda: fill(Dictionary()))
+    compact, compact_bytes = allocated(lambda: fill(CompactDictionary()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.cdict")
+        compact.freeze(path).close()
+        start = time.perf_counter()
+        FrozenDictionary(path).close()
+        open_s = time.perf_counter() - start
+        frozen, frozen_bytes = allocated(lambda: FrozenDictionary(path))
+        file_bytes = os.path.getsize(path)
+
+        print(f"{args.words} words, {args.lookups} lookups\n")
+        print(f"{'':12}{'heap MB':>10}{'hit ns':>10}{'miss ns':>10}")
+        for name, d, size in (
+            ("dict", dictionary, dict_bytes),
+            ("compact", compact, compact_bytes),
+            ("frozen", frozen, frozen_bytes),
+        ):
+            print(
+                f"{name:12}{size / 2**20:>10.1f}"
+                f"{per_lookup_ns(d.look, hits):>10.0f}"
+                f"{per_lookup_ns(d.look, misses):>10.0f}"
+            )
+        print(
+            f"\nfrozen file {file_bytes / 2**20:.1f} MB, opened in "
+            f"{open_s * 1e3:.2f} ms (mapped, not read)"
+        )
+        frozen.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Payload size and encode time of GET /api/v1/entries per format and encoding.
+
+Seeds an in-memory SQLite database, selects one page of entry columns and
+times each format of ``ENTRY_FORMATS`` (MessagePack only when installed)
+alone and followed by each compressor (zstd only when installed).
+
+    uv run python -m benchmarks.bench_formats --limit 1000
+"""
+
+import argparse
+
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from benchmarks.bench_serialization import best_of
+from src.backend.compression import COMPRESSORS
+from src.backend.models import DictionaryEntry
+from src.backend.pagination import page_statement
+from src.backend.serialization import ENTRY_COLUMNS, ENTRY_FORMATS
+
+
+def compress(name: str, data: bytes) -> bytes:
+    compressor = COMPRESSORS[name]()
+    return compressor.compress(data) + compressor.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(DictionaryEntry.__table__),
+            [
+                {"word": f"word{i}", "definition": f"definition number {i} ✓"}
+                for i in range(args.rows)
+            ],
+        )
+    with Session(engine) as session:
+        rows = session.exec(page_statement(args.limit, columns=ENTRY_COLUMNS)).all()
+
+    print(f"limit={args.limit}, compressors: {', '.join(COMPRESSORS)}\n")
+    print(f"{'format':42}{'encoding':>10}{'bytes':>10}{'ratio':>8}{'ms':>9}")
+    for media_type, fmt in ENTRY_FORMATS.items():
+        body = fmt.encode(rows)
+        encode_s = best_of(lambda fmt=fmt: fmt.encode(rows), args.repeat)
+        print(
+            f"{media_type:42}{'identity':>10}{len(body):>10}{1:>8.2f}"
+            f"{encode_s * 1e3:>9.2f}"
+        )
+        for name in COMPRESSORS:
+            size = len(compress(name, fmt.encode(rows)))
+            total_s = best_of(
+                lambda name=name, fmt=fmt: compress(name, fmt.encode(rows)), args.repeat
+            )
+            print(
+                f"{'':42}{name:>10}{size:>10}{len(body) / size:>8.2f}"
+                f"{total_s * 1e3:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
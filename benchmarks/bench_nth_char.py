@@ -0,0 +1,66 @@
+"""
+nth_char: string concatenation vs join, one long list and many short ones.
+
+Times the original ``result += word[n]`` loop against the join-based
+``nth_char`` on one list of ``--long`` words, then ``nth_char_batch`` over
+``--lists`` short lists in this process and fanned out to a process pool.
+
+    uv run python -m benchmarks.bench_nth_char --processes 4
+"""
+
+import argparse
+import os
+import random
+import time
+
+from src.exercises.nth_char import nth_char, nth_char_batch
+
+
+def concat_nth_char(words):
+    result = ""
+    for n, word in enumerate(words):
+        try:
+            result += word[n]
+        except IndexError:
+            break
+    return result
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--long", type=int, default=20_000)
+    parser.add_argument("--lists", type=int, default=200_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    # One shared word long enough for every position, so nothing stops early
+    long_list = ["xy" * args.long] * args.long
+    rng = random.Random(0)
+    short_lists = [
+        [f"{'w' * n}{rng.randrange(10**6)}" for n in range(20)]
+        for _ in range(args.lists)
+    ]
+
+    print(f"one list of {args.long} words (result {args.long} chars)")
+    concat_s = timed(lambda: concat_nth_char(long_list))
+    join_s = timed(lambda: nth_char(long_list))
+    print(f"  += concat {concat_s * 1e3:9.2f} ms")
+    print(f"  join      {join_s * 1e3:9.2f} ms  ({concat_s / join_s:.1f}x)")
+
+    print(f"\n{args.lists} lists of 20 words")
+    loop_s = timed(lambda: [concat_nth_char(words) for words in short_lists])
+    batch_s = timed(lambda: list(nth_char_batch(short_lists)))
+    pool_s = timed(lambda: list(nth_char_batch(short_lists, processes=args.processes)))
+    print(f"  += concat loop        {loop_s * 1e3:9.2f} ms")
+    print(f"  nth_char_batch        {batch_s * 1e3:9.2f} ms")
+    print(f"  {args.processes} processes{'':11}{pool_s * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
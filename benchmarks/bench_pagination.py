@@ -0,0 +1,102 @@
+"""
+Compare OFFSET and keyset pagination of GET /api/v1/entries on SQLite.
+
+Seeds a SQLite file with ``--rows`` entries (1M by default, reused between
+runs) and times fetching one page at increasing depths with both queries,
+then walks the whole table with the keyset cursor.
+
+    uv run python -m benchmarks.bench_pagination --rows 1000000 --limit 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.backend.models import DictionaryEntry
+from src.backend.pagination import page_statement
+
+
+def seed(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        have = session.exec(select(func.count()).select_from(DictionaryEntry)).one()
+    if have != rows:
+        SQLModel.metadata.drop_all(engine)
+        SQLModel.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for start in range(0, rows, 50_000):
+                conn.execute(
+                    insert(DictionaryEntry.__table__),
+                    [
+                        {"word": f"word{i:08d}", "definition": f"definition {i}"}
+                        for i in range(start, min(start + 50_000, rows))
+                    ],
+                )
+    return engine
+
+
+def timed(session: Session, statement, repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = session.exec(statement).all()
+        best = min(best, time.perf_counter() - start)
+    return best, page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--db", default=os.path.join(tempfile.gettempdir(), "bench_pagination.db")
+    )
+    args = parser.parse_args()
+
+    engine = seed(args.db, args.rows)
+    print(f"{args.rows} rows, page size {args.limit}\n")
+    print(f"{'depth':>10} {'offset ms':>10} {'keyset ms':>10} {'speedup':>8}")
+
+    offset_costs = []
+    with Session(engine) as session:
+        for fraction in (0, 0.25, 0.5, 0.75, 1):
+            skip = max(0, int(args.rows * fraction) - args.limit)
+            offset_s, page = timed(
+                session, page_statement(args.limit, skip=skip), args.repeat
+            )
+            offset_costs.append(offset_s)
+            after_id = page[0].id - 1
+            keyset_s, _ = timed(
+                session, page_statement(args.limit, after_id=after_id), args.repeat
+            )
+            print(
+                f"{skip:>10} {offset_s * 1e3:>10.2f} {keyset_s * 1e3:>10.2f} "
+                f"{offset_s / keyset_s:>7.1f}x"
+            )
+
+        start = time.perf_counter()
+        after_id, pages = None, 0
+        while True:
+            page = session.exec(page_statement(args.limit, after_id=after_id)).all()
+            session.expunge_all()
+            pages += 1
+            if len(page) < args.limit:
+                break
+            after_id = page[-1].id
+        walk_s = time.perf_counter() - start
+
+    # Page cost grows linearly with depth for OFFSET, so the mean of the
+    # sampled depths times the page count estimates a full OFFSET walk.
+    offset_walk_s = sum(offset_costs) / len(offset_costs) * pages
+    print(f"\nkeyset walk of the whole table: {pages} pages in {walk_s:.2f}s")
+    print(f"offset walk of the whole table (estimated): {offset_walk_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
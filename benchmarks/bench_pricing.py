@@ -0,0 +1,65 @@
+"""
+Baskets priced per second: get_total per basket vs PriceCatalog in bulk.
+
+Prices ``--baskets`` random baskets against one catalog with the scalar
+``get_total`` loop, then with ``PriceCatalog.totals`` (encoding included) and
+``totals_encoded`` on baskets encoded beforehand, and checks that all three
+agree exactly.
+
+    uv run python -m benchmarks.bench_pricing --baskets 1000000
+"""
+
+import argparse
+import random
+import time
+
+from src.exercises import price_catalog
+from src.exercises.price_catalog import PriceCatalog
+from src.exercises.spending import get_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baskets", type=int, default=1_000_000)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--basket-size", type=int, default=8)
+    parser.add_argument("--tax", type=float, default=0.09)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    costs = {f"item{i}": round(rng.uniform(0.5, 200), 2) for i in range(args.items)}
+    names = list(costs)
+    baskets = [
+        rng.choices(names, k=rng.randrange(1, 2 * args.basket_size))
+        for _ in range(args.baskets)
+    ]
+
+    def timed(fn):
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+
+    scalar, scalar_s = timed(lambda: [get_total(costs, b, args.tax) for b in baskets])
+    catalog = PriceCatalog(costs)
+    bulk, bulk_s = timed(lambda: catalog.totals(baskets, args.tax))
+    encoded, encode_s = timed(lambda: catalog.encode(baskets))
+    priced, priced_s = timed(lambda: catalog.totals_encoded(*encoded, args.tax))
+    assert list(bulk) == scalar and list(priced) == scalar, "totals differ"
+
+    backend = "numpy" if price_catalog.np is not None else "pure Python"
+    print(f"{args.baskets} baskets, {args.items} catalog items, {backend}\n")
+    print(f"{'':32}{'s':>8}{'baskets/s':>14}{'speedup':>9}")
+    for name, seconds in (
+        ("get_total per basket", scalar_s),
+        ("PriceCatalog.totals", bulk_s),
+        ("  of which encode", encode_s),
+        ("totals_encoded (pre-encoded)", priced_s),
+    ):
+        print(
+            f"{name:32}{seconds:>8.2f}{args.baskets / seconds:>14,.0f}"
+            f"{scalar_s / seconds:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
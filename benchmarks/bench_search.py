@@ -0,0 +1,94 @@
+"""
+Latency of the in-memory word index behind GET /api/v1/search.
+
+Builds the index over ``--words`` synthetic words (1M by default) and reports
+build time, memory and p50/p99 latency of prefix queries and 404 suggestions.
+
+    uv run python -m benchmarks.bench_search --words 1000000
+"""
+
+import argparse
+import random
+import string
+import time
+import tracemalloc
+
+from src.backend.cache import GenerationTable
+from src.backend.search import WordIndex
+
+
+class _WordSource:
+    """Hands the synthetic words to ``ensure_built`` in place of a Session."""
+
+    def __init__(self, words):
+        self.words = words
+
+    def exec(self, statement):
+        return iter(self.words)
+
+
+def percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    return f"p50 {p50:8.1f} us   p99 {p99:8.1f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = list(
+        {
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+            for _ in range(args.words)
+        }
+    )
+
+    index = WordIndex(GenerationTable(slots=64), min_rebuild_interval=0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.ensure_built(_WordSource(words))
+    build_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = sum(
+        stat.size for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+    tracemalloc.stop()
+    print(
+        f"{len(words)} words: built in {build_s:.2f}s, "
+        f"index {current / 2**20:.1f} MiB (peak during build {peak / 2**20:.1f} MiB)"
+    )
+
+    samples = []
+    for _ in range(args.queries):
+        prefix = rng.choice(words)[: rng.randint(1, 4)]
+        start = time.perf_counter()
+        index.prefix(prefix, 20)
+        samples.append(time.perf_counter() - start)
+    print(f"prefix(limit=20)  {percentiles(samples)}")
+
+    samples = []
+    for _ in range(min(args.queries, 1000)):
+        word = list(rng.choice(words))
+        word[rng.randrange(len(word))] = rng.choice(string.ascii_lowercase)
+        start = time.perf_counter()
+        index.suggest("".join(word), 5)
+        samples.append(time.perf_counter() - start)
+    print(f"suggest(limit=5)  {percentiles(samples)}")
+
+    samples = []
+    for _ in range(1000):
+        word = "".join(rng.choices(string.ascii_lowercase, k=8))
+        start = time.perf_counter()
+        index.add(word)
+        samples.append(time.perf_counter() - start)
+    print(f"add               {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
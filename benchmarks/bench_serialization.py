@@ -0,0 +1,98 @@
+"""
+GET /api/v1/entries with and without FAST_JSON_RESPONSES.
+
+Seeds an in-memory SQLite database and times full requests through the ASGI
+app, then the serialization step alone (ORM objects validated through
+``list[WordResponse]`` vs column tuples through the precompiled adapter).
+
+    uv run python -m benchmarks.bench_serialization --limit 1000
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.backend.config import settings
+from src.backend.database import get_session
+from src.backend.models import DictionaryEntry, WordResponse
+from src.backend.pagination import page_statement
+from src.backend.serialization import ENTRY_COLUMNS, encode_entries
+from src.main import app
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(DictionaryEntry.__table__),
+            [
+                {"word": f"word{i}", "definition": f"definition number {i} ✓"}
+                for i in range(args.rows)
+            ],
+        )
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    client = TestClient(app)
+    url = f"/api/v1/entries?limit={args.limit}"
+
+    settings.FAST_JSON_RESPONSES = False
+    regular_body = client.get(url).content
+    regular_s = best_of(lambda: client.get(url), args.repeat)
+    settings.FAST_JSON_RESPONSES = True
+    fast_body = client.get(url).content
+    fast_s = best_of(lambda: client.get(url), args.repeat)
+    assert fast_body == regular_body, "fast path output differs"
+
+    adapter = TypeAdapter(list[WordResponse])
+    with Session(engine) as session:
+        objects = session.exec(page_statement(args.limit)).all()
+        rows = session.exec(page_statement(args.limit, columns=ENTRY_COLUMNS)).all()
+        model_s = best_of(
+            lambda: adapter.dump_json(
+                adapter.validate_python(objects, from_attributes=True)
+            ),
+            args.repeat,
+        )
+        tuple_s = best_of(lambda: encode_entries(rows), args.repeat)
+
+    print(f"limit={args.limit}, {len(regular_body)} bytes, output identical\n")
+    print(f"{'':24}{'regular ms':>12}{'fast ms':>10}{'speedup':>9}")
+    print(
+        f"{'full request':24}{regular_s * 1e3:>12.2f}{fast_s * 1e3:>10.2f}"
+        f"{regular_s / fast_s:>8.1f}x"
+    )
+    print(
+        f"{'serialization only':24}{model_s * 1e3:>12.2f}{tuple_s * 1e3:>10.2f}"
+        f"{model_s / tuple_s:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
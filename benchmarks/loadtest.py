@@ -0,0 +1,268 @@
+"""
+Load test for the dictionary API with a configurable read/write mix.
+
+By default the app runs in-process on a SQLite file through httpx's ASGI
+transport, so nothing else has to be running. Pass ``--base-url`` to drive a
+real server instead, e.g. gunicorn on the same machine against a local
+MariaDB (``docker compose up db``). Results are printed and, with
+``--output``, written as JSON so runs can be compared across commits.
+
+    uv run python -m benchmarks.loadtest --seed 10000 --requests 20000 \\
+        --concurrency 32 --mix look=90,create=5,list=3,delete=2 \\
+        --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+OPERATIONS = ("look", "create", "list", "delete")
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}'")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3),
+        "max_ms": round(latencies[-1] * 1e3, 3) if latencies else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def in_process_client(sqlite_path: str) -> httpx.AsyncClient:
+    """Serve the app in-process against a fresh SQLite file."""
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from src.backend.cache import lookup_cache
+    from src.backend.database import get_session
+    from src.main import app
+
+    if os.path.exists(sqlite_path):
+        os.remove(sqlite_path)
+    engine = create_engine(
+        f"sqlite:///{sqlite_path}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    lookup_cache.clear()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    # App errors become 500s counted as failures, like a real server's
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.random_seed)
+        self.words = [f"seed{i:08d}" for i in range(args.seed)]
+        self.hot = self.words[: args.hot_words]
+        self.created: list[str] = []
+        self.counter = 0
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def seed(self) -> float:
+        body = "\n".join(
+            json.dumps({"word": word, "definition": f"definition of {word}"})
+            for word in self.words
+        )
+        start = time.perf_counter()
+        response = await self.client.post(
+            "/api/v1/bulk?on_conflict=overwrite",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=None,
+        )
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    def pick_lookup_word(self) -> str:
+        if self.hot and self.rng.random() < self.args.hot_fraction:
+            return self.rng.choice(self.hot)
+        if self.rng.random() < self.args.miss_fraction:
+            return f"missing{self.rng.randrange(1_000_000)}"
+        return self.rng.choice(self.words) if self.words else "empty"
+
+    def request_for(self, operation: str):
+        if operation == "look":
+            return "GET", f"/api/v1/look/{self.pick_lookup_word()}", None
+        if operation == "create":
+            self.counter += 1
+            word = f"load{os.getpid()}x{self.counter}"
+            return "POST", "/api/v1/newentry", {"word": word, "definition": "x"}
+        if operation == "list":
+            skip = self.rng.randrange(max(1, len(self.words)))
+            return (
+                "GET",
+                f"/api/v1/entries?skip={skip}&limit={self.args.page_size}",
+                None,
+            )
+        if self.created:
+            word = self.created.pop(self.rng.randrange(len(self.created)))
+        else:
+            word = f"missing{self.rng.randrange(1_000_000)}"
+        return "DELETE", f"/api/v1/entries/{word}", None
+
+    async def worker(self, operations: list[str]):
+        while operations:
+            operation = operations.pop()
+            method, url, body = self.request_for(operation)
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, json=body)
+                ok = response.status_code < 500 and (
+                    response.status_code != 404 or operation in ("look", "delete")
+                )
+                if operation == "create" and response.status_code == 201:
+                    # Only words that exist can be deleted, so none is deleted
+                    # before its create has finished
+                    self.created.append(body["word"])
+            except httpx.HTTPError:
+                ok = False
+            self.latencies[operation].append(time.perf_counter() - start)
+            if not ok:
+                self.errors[operation] += 1
+
+    async def run(self) -> dict:
+        seed_s = await self.seed() if self.args.seed else 0.0
+        names = list(self.args.mix)
+        operations = self.rng.choices(
+            names, weights=[self.args.mix[n] for n in names], k=self.args.requests
+        )
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(self.worker(operations) for _ in range(self.args.concurrency))
+        )
+        elapsed = time.perf_counter() - start
+
+        all_latencies = [x for samples in self.latencies.values() for x in samples]
+        return {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "target": self.args.base_url or f"in-process sqlite:{self.args.sqlite}",
+            "config": {
+                key: value
+                for key, value in vars(self.args).items()
+                if key not in ("output",)
+            },
+            "seed_seconds": round(seed_s, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "total": summarize(all_latencies, sum(self.errors.values()), elapsed),
+            "operations": {
+                name: summarize(self.latencies[name], self.errors[name], elapsed)
+                for name in names
+            },
+        }
+
+
+def print_report(result: dict) -> None:
+    print(f"target {result['target']}  commit {result['commit']}")
+    print(f"seeded in {result['seed_seconds']}s, ran {result['elapsed_seconds']}s\n")
+    header = f"{'operation':<10}{'requests':>10}{'errors':>8}{'rps':>10}"
+    print(header + f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(result["operations"].items()) + [("total", result["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<10}{stats['requests']:>10}{stats['errors']:>8}"
+            f"{stats['throughput_rps']:>10}{stats['p50_ms']:>10}"
+            f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(
+            base_url=args.base_url,
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=30,
+        )
+    else:
+        client = in_process_client(args.sqlite)
+    async with client:
+        return await LoadTest(client, args).run()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", help="Drive a running server instead")
+    parser.add_argument(
+        "--sqlite",
+        default=os.path.join(tempfile.gettempdir(), "loadtest.db"),
+        help="SQLite file for the in-process app (recreated on every run)",
+    )
+    parser.add_argument("--seed", type=int, default=10_000, help="Entries to seed")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix("look=90,create=5,list=3,delete=2")
+    )
+    parser.add_argument("--hot-words", type=int, default=1000)
+    parser.add_argument("--hot-fraction", type=float, default=0.95)
+    parser.add_argument("--miss-fraction", type=float, default=0.05)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    result = asyncio.run(main_async(args))
+    print_report(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Startup profile of the app: import cost per module and time to first request.
+
+Runs ``python -X importtime -c "import src.main"`` in a fresh interpreter and
+reports the costliest modules and packages, then times the first request
+(GET /health/live through the ASGI app, no DB needed) twice: in a cold
+process that imports everything itself, as a worker does without
+``preload_app``, and in a process forked from an already warm parent, as
+gunicorn workers are with ``preload_app = True``.
+
+    uv run python -m benchmarks.profile_startup --top 25
+
+Set ``STARTUP_PROFILE=true`` on a running deployment to get the same
+"app built" and "first request served" timings in the worker logs.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from src.backend.profiling import by_package, parse_importtime
+
+FIRST_REQUEST = """
+import asyncio, json, time
+from src.backend.profiling import process_age
+start = time.perf_counter()
+from src.main import app
+imported = time.perf_counter() - start
+
+async def first_request():
+    import httpx
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://x") as c:
+        (await c.get("/health/live")).raise_for_status()
+
+asyncio.run(first_request())
+print(json.dumps({"import_s": imported, "first_request_s": process_age()}))
+"""
+
+
+def import_profile() -> tuple[list, float]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr), time.perf_counter() - start
+
+
+def cold_first_request() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def forked_first_request() -> float:
+    """Time to first request in a child forked after the app was imported."""
+    import asyncio
+
+    import httpx
+
+    from src.main import app
+
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+
+        async def first_request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://x") as c:
+                (await c.get("/health/live")).raise_for_status()
+
+        asyncio.run(first_request())
+        os.write(write_fd, str(time.perf_counter() - start).encode())
+        os._exit(0)
+    os.close(write_fd)
+    elapsed = float(os.read(read_fd, 64))
+    os.waitpid(pid, 0)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to time")
+    args = parser.parse_args()
+
+    costs, wall = import_profile()
+    total = max(c.cumulative_us for c in costs if c.module == "src.main")
+    print(f"import src.main: {total / 1e3:.1f} ms ({wall:.2f}s with interpreter)\n")
+
+    print(f"{'package':<30}{'self ms':>10}{'share':>8}")
+    for package, self_us in list(by_package(costs).items())[: args.top]:
+        print(f"{package:<30}{self_us / 1e3:>10.1f}{self_us / total:>8.1%}")
+
+    print(f"\n{'module':<50}{'self ms':>10}{'cumul ms':>10}")
+    for cost in sorted(costs, key=lambda c: -c.self_us)[: args.top]:
+        print(
+            f"{cost.module:<50}{cost.self_us / 1e3:>10.1f}"
+            f"{cost.cumulative_us / 1e3:>10.1f}"
+        )
+
+    cold = [cold_first_request() for _ in range(args.runs)]
+    best = min(cold, key=lambda r: r["first_request_s"])
+    print("\ntime to first request")
+    print(
+        f"  cold process:        {best['first_request_s'] * 1e3:8.1f} ms "
+        f"(of which app import {best['import_s'] * 1e3:.1f} ms)"
+    )
+    if hasattr(os, "fork"):
+        forked = min(forked_first_request() for _ in range(args.runs))
+        print(f"  fork of warm master: {forked * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
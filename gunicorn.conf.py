@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the API container.
+
+The app is imported once in the master (``preload_app``) and the workers are
+forked from it, so each worker starts warm instead of paying the full
+FastAPI/SQLAlchemy/pydantic import cost again. Importing ``src.main`` does no
+I/O; engines are created lazily and the startup work runs in each worker's
+lifespan.
+"""
+
+import os
+
+from src.backend.config import settings
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+# Also sizes the DB pools, see DB_CONNECTION_BUDGET
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Nothing should have connected in the master, but never share a socket
+    from src.backend.database import dispose_engines
+
+    dispose_engines()
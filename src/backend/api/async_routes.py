@@ -0,0 +1,200 @@
+"""Async versions of the dictionary endpoints, enabled with DB_ASYNC."""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.cache import MISS, lookup_cache
+from src.backend.conditional import (
+    PAGE_VALIDATOR_COLUMNS,
+    CachedEntry,
+    is_not_modified,
+    not_modified,
+    page_etag,
+    set_cache_headers,
+)
+from src.backend.config import settings
+from src.backend.database import AsyncSessionDep
+from src.backend.ingest import ConflictPolicy, insert_statement
+from src.backend.models import (
+    DefinitionUpdate,
+    DictionaryEntry,
+    WordBase,
+    WordResponse,
+)
+from src.backend.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    page_statement,
+    set_next_cursor,
+)
+from src.backend.search import not_found_detail_async, word_index
+from src.backend.serialization import (
+    ENTRY_COLUMNS,
+    JSON_FORMAT,
+    negotiate_entry_format,
+)
+from src.backend.singleflight import async_lookup_flight
+
+router = APIRouter(prefix="/api/v1", tags=["dictionary"])
+
+
+@router.post("/newentry", response_model=WordResponse, status_code=201)
+async def create_entry(entry: WordBase, db: AsyncSessionDep):
+    """Add a new word directly to the DB."""
+    if settings.SINGLE_STATEMENT_WRITES:
+        created = await _write_entry(
+            db, entry.word, entry.definition, ConflictPolicy.SKIP
+        )
+        if not created:
+            raise HTTPException(
+                status_code=400, detail=f"Entry for '{entry.word}' already exists"
+            )
+        return entry
+
+    statement = select(DictionaryEntry).where(DictionaryEntry.word == entry.word)
+    db_entry = (await db.exec(statement)).first()
+
+    if db_entry:
+        raise HTTPException(
+            status_code=400, detail=f"Entry for '{entry.word}' already exists"
+        )
+
+    new_db_entry = DictionaryEntry(word=entry.word, definition=entry.definition)
+    db.add(new_db_entry)
+    await db.commit()
+    lookup_cache.invalidate(entry.word)
+    word_index.add(entry.word)
+    return new_db_entry
+
+
+async def _write_entry(
+    db: AsyncSession, word: str, definition: str, on_conflict: ConflictPolicy
+) -> bool:
+    """
+    Write one entry with a single INSERT that resolves conflicts on the unique
+    index of ``word``. Returns False when SKIP left an existing word alone.
+    """
+    stmt = insert_statement(
+        db.get_bind().dialect.name,
+        [{"word": word, "definition": definition}],
+        on_conflict,
+    )
+    result = await db.exec(stmt)
+    await db.commit()
+    lookup_cache.invalidate(word)
+    word_index.add(word)
+    return result.rowcount != 0
+
+
+@router.put("/entries/{word}", response_model=WordResponse)
+async def upsert_entry(word: str, entry: DefinitionUpdate, db: AsyncSessionDep):
+    """Create or replace the definition of a word in one statement."""
+    await _write_entry(db, word, entry.definition, ConflictPolicy.OVERWRITE)
+    return {"word": word, "definition": entry.definition}
+
+
+@router.get("/look/{word}", response_model=WordResponse)
+async def get_entry(
+    word: str,
+    db: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    suggest: bool = False,
+):
+    """Look up a word, serving hot words and revalidations from the cache."""
+    cached = lookup_cache.get(word)
+    if cached is MISS:
+        generation = lookup_cache.generation(word)
+
+        async def load():
+            entry = (
+                await db.exec(
+                    select(DictionaryEntry).filter(DictionaryEntry.word == word)
+                )
+            ).first()
+            cached = CachedEntry.from_row(entry) if entry else None
+            lookup_cache.put(word, cached, generation)
+            return cached
+
+        if settings.LOOKUP_SINGLE_FLIGHT:
+            cached = await async_lookup_flight.do((word, generation), load)
+        else:
+            cached = await load()
+
+    if cached is None:
+        detail = await not_found_detail_async(db, word, suggest)
+        raise HTTPException(status_code=404, detail=detail)
+
+    max_age = settings.LOOKUP_MAX_AGE
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(cached.etag, cached.last_modified, max_age)
+    set_cache_headers(response, cached.etag, cached.last_modified, max_age)
+    return {"word": word, "definition": cached.definition}
+
+
+@router.get("/entries", response_model=list[WordResponse])
+async def list_entries(
+    db: AsyncSessionDep,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+):
+    """
+    List entries using server-side pagination.
+    Pass the ``X-Next-Cursor`` header of a page back as ``cursor`` to get the
+    next one with a keyset seek; ``skip`` is still accepted but costs a scan
+    of every skipped row. ``If-None-Match`` is checked against the page's ids
+    and versions before any definition is read. ``Accept`` selects a format
+    of ``ENTRY_FORMATS``: JSON, a columnar layout or MessagePack.
+    """
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor {cursor}")
+
+    fmt = negotiate_entry_format(request.headers.get("accept"))
+    max_age = settings.ENTRIES_MAX_AGE
+    if "if-none-match" in request.headers:
+        statement = page_statement(limit, skip, after_id, PAGE_VALIDATOR_COLUMNS)
+        validators = (await db.exec(statement)).all()
+        etag = page_etag(validators, fmt.tag)
+        if is_not_modified(request, etag):
+            unchanged = not_modified(etag, None, max_age, vary="Accept")
+            set_next_cursor(unchanged, validators, limit)
+            return unchanged
+
+    if fmt is not JSON_FORMAT or settings.FAST_JSON_RESPONSES:
+        statement = page_statement(limit, skip, after_id, columns=ENTRY_COLUMNS)
+        rows = (await db.exec(statement)).all()
+        encoded = Response(fmt.encode(rows), media_type=fmt.media_type)
+        set_next_cursor(encoded, rows, limit)
+        set_cache_headers(encoded, page_etag(rows, fmt.tag), None, max_age, "Accept")
+        return encoded
+
+    entries = (await db.exec(page_statement(limit, skip, after_id))).all()
+    set_next_cursor(response, entries, limit)
+    set_cache_headers(response, page_etag(entries), None, max_age, "Accept")
+    return entries
+
+
+@router.delete("/entries/{word}")
+async def delete_entry(word: str, db: AsyncSessionDep):
+    """Delete a word directly from the database."""
+    entry = (
+        await db.exec(select(DictionaryEntry).filter(DictionaryEntry.word == word))
+    ).first()
+
+    if not entry:
+        raise HTTPException(status_code=404, detail=f"Can't find entry for {word}")
+
+    await db.delete(entry)
+    await db.commit()
+    lookup_cache.invalidate(word)
+    word_index.remove(word)
+
+    return {"word": word, "message": f"Entry for '{word}' deleted successfully"}
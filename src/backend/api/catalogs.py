@@ -0,0 +1,57 @@
+"""Price catalog upload and batch basket totals."""
+
+from fastapi import APIRouter, HTTPException
+
+from src.backend.catalogs import get_catalog, save_catalog
+from src.backend.config import settings
+from src.backend.database import ReadSessionDep, WriteSessionDep
+from src.backend.models import (
+    BasketTotalsRequest,
+    BasketTotalsResponse,
+    CatalogInfo,
+    CatalogUpload,
+)
+
+router = APIRouter(prefix="/api/v1/catalogs", tags=["catalogs"])
+
+
+@router.put("/{catalog_id}", response_model=CatalogInfo)
+def upload_catalog(catalog_id: str, upload: CatalogUpload, db: WriteSessionDep):
+    """Create or replace a catalog of item costs; each upload is a new version."""
+    row = save_catalog(db, catalog_id, upload.costs)
+    return {"id": row.id, "version": row.version, "items": len(row.costs)}
+
+
+@router.post("/{catalog_id}/total", response_model=BasketTotalsResponse)
+def basket_totals(catalog_id: str, request: BasketTotalsRequest, db: ReadSessionDep):
+    """
+    ``get_total`` of many baskets against a stored catalog.
+    The catalog is parsed and indexed once per worker and version, not per
+    request or basket, and all baskets are priced in one pass.
+    """
+    if len(request.baskets) > settings.CATALOG_MAX_BASKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.CATALOG_MAX_BASKETS} baskets per request",
+        )
+    if isinstance(request.tax, list) and len(request.tax) != len(request.baskets):
+        raise HTTPException(status_code=400, detail="Expected one tax rate per basket")
+
+    cached = get_catalog(db, catalog_id)
+    if cached is not None and request.version not in (None, cached.version):
+        # This worker may hold a version uploaded through another pod
+        cached = get_catalog(db, catalog_id, refresh=True)
+    if cached is None:
+        raise HTTPException(status_code=404, detail=f"Can't find catalog {catalog_id}")
+    if request.version not in (None, cached.version):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Catalog {catalog_id} is at version {cached.version}",
+        )
+
+    totals = cached.prices.totals(request.baskets, request.tax)
+    return {
+        "id": catalog_id,
+        "version": cached.version,
+        "totals": totals if isinstance(totals, list) else totals.tolist(),
+    }
@@ -1,17 +1,74 @@
 """API route definitions using direct database access."""
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import select, Session
+from typing import Optional
 
-from src.backend.database import SessionDep
-from src.backend.models import DictionaryEntry, WordBase, WordResponse
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select
+
+from src.backend.cache import MISS, lookup_cache
+from src.backend.conditional import (
+    PAGE_VALIDATOR_COLUMNS,
+    CachedEntry,
+    is_not_modified,
+    not_modified,
+    page_etag,
+    set_cache_headers,
+)
+from src.backend.config import settings
+from src.backend.database import (
+    ReadSessionDep,
+    WriteSessionDep,
+    cache_ttl_cap,
+    skips_read_caches,
+)
+from src.backend.export import MEDIA_TYPES, ExportFormat, iter_export
+from src.backend.ingest import (
+    BulkIngest,
+    ConflictPolicy,
+    DuplicateEntryError,
+    insert_statement,
+    parse_csv_line,
+    parse_ndjson_line,
+)
+from src.backend.models import (
+    BatchLookupRequest,
+    BatchLookupResponse,
+    BulkIngestResult,
+    DefinitionUpdate,
+    DictionaryEntry,
+    SearchResponse,
+    WordBase,
+    WordResponse,
+)
+from src.backend.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    page_statement,
+    set_next_cursor,
+)
+from src.backend.search import not_found_detail, word_index
+from src.backend.serialization import (
+    ENTRY_COLUMNS,
+    JSON_FORMAT,
+    negotiate_entry_format,
+)
+from src.backend.singleflight import lookup_flight
 
 router = APIRouter(prefix="/api/v1", tags=["dictionary"])
 
 
 @router.post("/newentry", response_model=WordResponse, status_code=201)
-def create_entry(entry: WordBase, db: SessionDep):
+def create_entry(entry: WordBase, db: WriteSessionDep):
     """Add a new word directly to the DB."""
+    if settings.SINGLE_STATEMENT_WRITES:
+        if not _write_entry(db, entry.word, entry.definition, ConflictPolicy.SKIP):
+            raise HTTPException(
+                status_code=400, detail=f"Entry for '{entry.word}' already exists"
+            )
+        return entry
+
     statement = select(DictionaryEntry).where(DictionaryEntry.word == entry.word)
     db_entry = db.exec(statement).first()
 
@@ -24,40 +81,275 @@ def create_entry(entry: WordBase, db: SessionDep):
     db.add(new_db_entry)
     db.commit()
     db.refresh(new_db_entry)
+    lookup_cache.invalidate(entry.word)
+    word_index.add(entry.word)
     return new_db_entry
 
 
+def _write_entry(
+    db: Session, word: str, definition: str, on_conflict: ConflictPolicy
+) -> bool:
+    """
+    Write one entry with a single INSERT that resolves conflicts on the unique
+    index of ``word``. Returns False when SKIP left an existing word alone.
+    """
+    stmt = insert_statement(
+        db.get_bind().dialect.name,
+        [{"word": word, "definition": definition}],
+        on_conflict,
+    )
+    result = db.exec(stmt)
+    db.commit()
+    lookup_cache.invalidate(word)
+    word_index.add(word)
+    return result.rowcount != 0
+
+
+@router.put("/entries/{word}", response_model=WordResponse)
+def upsert_entry(word: str, entry: DefinitionUpdate, db: WriteSessionDep):
+    """Create or replace the definition of a word in one statement."""
+    _write_entry(db, word, entry.definition, ConflictPolicy.OVERWRITE)
+    return {"word": word, "definition": entry.definition}
+
+
 @router.get("/look/{word}", response_model=WordResponse)
-def get_entry(word: str, db: SessionDep):
-    """Look up a word using a DB index."""
-    entry = db.exec(
-        select(DictionaryEntry).filter(DictionaryEntry.word == word)
-    ).first()
+def get_entry(
+    word: str,
+    db: ReadSessionDep,
+    request: Request,
+    response: Response,
+    suggest: bool = False,
+):
+    """
+    Look up a word, serving hot words from the in-process cache.
+    Responses carry an ``ETag``; a matching ``If-None-Match`` on a cached word
+    is answered 304 without touching the DB or serializing the entry.
+    Clients that just wrote skip the cache and read the primary.
+    ``suggest=true`` adds "did you mean" suggestions to a 404.
+    """
+    cached = MISS if skips_read_caches(db) else lookup_cache.get(word)
+    if cached is MISS:
+        generation = lookup_cache.generation(word)
 
-    if not entry:
-        raise HTTPException(status_code=404, detail=f"Can't find entry for {word}")
+        def load():
+            entry = db.exec(
+                select(DictionaryEntry).filter(DictionaryEntry.word == word)
+            ).first()
+            cached = CachedEntry.from_row(entry) if entry else None
+            lookup_cache.put(word, cached, generation, cache_ttl_cap(db))
+            return cached
+
+        if settings.LOOKUP_SINGLE_FLIGHT and not skips_read_caches(db):
+            # Keyed by generation too, so a request that started after a write
+            # never joins a query that may have read the old row
+            cached = lookup_flight.do((word, generation), load)
+        else:
+            cached = load()
+
+    if cached is None:
+        detail = not_found_detail(db, word, suggest)
+        raise HTTPException(status_code=404, detail=detail)
+
+    max_age = settings.LOOKUP_MAX_AGE
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(cached.etag, cached.last_modified, max_age)
+    set_cache_headers(response, cached.etag, cached.last_modified, max_age)
+    return {"word": word, "definition": cached.definition}
+
+
+@router.post("/look", response_model=BatchLookupResponse)
+def get_entries(request: BatchLookupRequest, db: ReadSessionDep):
+    """
+    Look up many words at once.
+    Duplicates are collapsed, cached words are answered from the lookup cache
+    and the rest is resolved with one ``WHERE word IN (...)`` per chunk.
+    """
+    words = list(dict.fromkeys(request.words))
+    if len(words) > settings.BATCH_LOOKUP_MAX_WORDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_LOOKUP_MAX_WORDS} words per request",
+        )
+
+    found: dict[str, str] = {}
+    pending = []
+    for word in words:
+        cached = MISS if skips_read_caches(db) else lookup_cache.get(word)
+        if cached is MISS:
+            pending.append(word)
+        elif cached is not None:
+            found[word] = cached.definition
 
-    return entry
+    chunk_size = settings.BATCH_LOOKUP_CHUNK_SIZE
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start : start + chunk_size]
+        found.update(
+            db.exec(
+                select(DictionaryEntry.word, DictionaryEntry.definition).where(
+                    DictionaryEntry.word.in_(chunk)
+                )
+            ).all()
+        )
+
+    return {
+        "entries": {word: found[word] for word in words if word in found},
+        "missing": [word for word in words if word not in found],
+    }
+
+
+@router.get("/search", response_model=SearchResponse)
+def search_entries(prefix: str, db: ReadSessionDep, limit: int = 20):
+    """Autocomplete: words starting with ``prefix`` from the in-memory index."""
+    word_index.ensure_built(db)
+    limit = max(0, min(limit, settings.SEARCH_MAX_RESULTS))
+    return {"prefix": prefix, "words": word_index.prefix(prefix, limit)}
 
 
 @router.get("/entries", response_model=list[WordResponse])
-def list_entries(db: SessionDep, skip: int = 0, limit: int = 100):
+def list_entries(
+    db: ReadSessionDep,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+):
     """
     List entries using server-side pagination.
-    This prevents the API from hanging by only fetching a small slice of data.
+    Pass the ``X-Next-Cursor`` header of a page back as ``cursor`` to get the
+    next one with a keyset seek; ``skip`` is still accepted but costs a scan
+    of every skipped row. The page's ``ETag`` covers the ids and versions of
+    its entries, so ``If-None-Match`` is checked without reading definitions.
+    ``Accept`` selects a format of ``ENTRY_FORMATS``: JSON, a columnar layout
+    or MessagePack.
     """
-    return db.exec(select(DictionaryEntry).offset(skip).limit(limit)).all()
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor {cursor}")
+
+    fmt = negotiate_entry_format(request.headers.get("accept"))
+    max_age = settings.ENTRIES_MAX_AGE
+    if "if-none-match" in request.headers:
+        statement = page_statement(limit, skip, after_id, PAGE_VALIDATOR_COLUMNS)
+        validators = db.exec(statement).all()
+        etag = page_etag(validators, fmt.tag)
+        if is_not_modified(request, etag):
+            unchanged = not_modified(etag, None, max_age, vary="Accept")
+            set_next_cursor(unchanged, validators, limit)
+            return unchanged
+
+    if fmt is not JSON_FORMAT or settings.FAST_JSON_RESPONSES:
+        statement = page_statement(limit, skip, after_id, columns=ENTRY_COLUMNS)
+        rows = db.exec(statement).all()
+        encoded = Response(fmt.encode(rows), media_type=fmt.media_type)
+        set_next_cursor(encoded, rows, limit)
+        set_cache_headers(encoded, page_etag(rows, fmt.tag), None, max_age, "Accept")
+        return encoded
+
+    entries = db.exec(page_statement(limit, skip, after_id)).all()
+    set_next_cursor(response, entries, limit)
+    # No Last-Modified: deleting a row of the page would not advance it
+    set_cache_headers(response, page_etag(entries), None, max_age, "Accept")
+    return entries
 
 
 @router.delete("/entries/{word}")
-def delete_entry(word: str, db: SessionDep):
+def delete_entry(word: str, db: WriteSessionDep):
     """Delete a word directly from the database."""
-    entry = db.exec(select(DictionaryEntry).filter(DictionaryEntry.word == word)).first()
+    entry = db.exec(
+        select(DictionaryEntry).filter(DictionaryEntry.word == word)
+    ).first()
 
     if not entry:
         raise HTTPException(status_code=404, detail=f"Can't find entry for {word}")
 
     db.delete(entry)
     db.commit()
+    lookup_cache.invalidate(word)
+    word_index.remove(word)
 
     return {"word": word, "message": f"Entry for '{word}' deleted successfully"}
+
+
+async def _iter_lines(request: Request):
+    """Yield decoded lines from the request body as it streams in."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+@router.post("/bulk", response_model=BulkIngestResult)
+async def bulk_ingest(
+    request: Request,
+    db: WriteSessionDep,
+    on_conflict: ConflictPolicy = ConflictPolicy.SKIP,
+):
+    """
+    Stream NDJSON (default) or CSV (``Content-Type: text/csv``) entries into
+    the DB with batched multi-row inserts.
+    CSV records are ``word,definition`` lines, optionally after a header row,
+    and must not contain embedded newlines.
+    """
+    is_csv = request.headers.get("content-type", "").startswith("text/csv")
+    parse = parse_csv_line if is_csv else parse_ndjson_line
+    ingest = BulkIngest(
+        db,
+        on_conflict,
+        batch_size=settings.BULK_INSERT_BATCH_SIZE,
+        commit_batches=settings.BULK_COMMIT_BATCHES,
+    )
+
+    first = True
+    try:
+        async for raw in _iter_lines(request):
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                row = parse(line.decode("utf-8"))
+            except ValueError:
+                # UnicodeDecodeError and JSONDecodeError are ValueErrors too
+                ingest.reject()
+                continue
+            if first and is_csv and row == {"word": "word", "definition": "definition"}:
+                first = False
+                continue
+            first = False
+            ingest.add(row)
+            if ingest.batch_full:
+                await run_in_threadpool(ingest.flush)
+        await run_in_threadpool(ingest.finish)
+    except DuplicateEntryError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{e}; {ingest.written} entries were written before the conflict",
+        )
+
+    return ingest.result()
+
+
+@router.get("/export")
+def export_entries(db: ReadSessionDep, format: ExportFormat = ExportFormat.NDJSON):
+    """Stream every entry as NDJSON or CSV without buffering the table."""
+    return StreamingResponse(
+        iter_export(db, format, settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="dictionary.{format.value}"'
+        },
+    )
+
+
+@router.get("/cache/stats", tags=["health"])
+def cache_stats():
+    """
+    Hit/miss/eviction counters for the lookup cache of this worker, and how
+    many lookup misses joined another request's in-flight query.
+    """
+    return {**lookup_cache.stats(), "single_flight": lookup_flight.stats()}
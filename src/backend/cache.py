@@ -0,0 +1,235 @@
+"""In-process read-through cache for dictionary lookups."""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+from src.backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sentinel returned by ``LookupCache.get`` when the word is not cached at all,
+# as opposed to ``None`` which means "cached as missing" (a negative entry).
+MISS = object()
+
+_COUNTER = struct.Struct("<Q")
+
+
+class GenerationTable:
+    """
+    Invalidation counters for words, optionally shared between processes.
+
+    Slot 0 is a global epoch bumped by ``bump()`` without a word, slot 1 counts
+    every bump, and the remaining slots are buckets selected by a CRC32 of the
+    word (Python's ``hash`` is salted per process, so it can't be used to agree
+    on a slot across workers). With ``path`` the
+    counters live in a mmap'ed file, so a bump in one gunicorn worker is seen
+    by the next ``read`` in every other worker without any messaging.
+    """
+
+    def __init__(self, slots: int, path: Optional[str] = None):
+        self.slots = slots
+        self.path = None
+        self._fd = None
+        self._lock = threading.Lock()
+        size = (slots + 2) * _COUNTER.size
+
+        if path and fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(self._fd).st_size < size:
+                        os.ftruncate(self._fd, size)
+                finally:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                self._buf = mmap.mmap(self._fd, size)
+                self.path = path
+            except OSError as e:
+                logger.warning(
+                    f"Shared cache generations unavailable ({e}), "
+                    "falling back to per-process invalidation."
+                )
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+        if self.path is None:
+            self._buf = bytearray(size)
+        elif hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # flock() locks belong to the open file description, which a forked
+        # worker shares with its parent and siblings, so each worker needs its
+        # own descriptor for bump() to exclude the others. The mapping stays.
+        old_fd, self._fd = self._fd, os.open(self.path, os.O_RDWR)
+        os.close(old_fd)
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        return self.path is not None
+
+    def _offset(self, word: str) -> int:
+        return (2 + zlib.crc32(word.encode("utf-8")) % self.slots) * _COUNTER.size
+
+    def read(self, word: str) -> tuple[int, int]:
+        """Return the ``(epoch, bucket)`` generation currently seen for ``word``."""
+        return (
+            _COUNTER.unpack_from(self._buf, 0)[0],
+            _COUNTER.unpack_from(self._buf, self._offset(word))[0],
+        )
+
+    def writes(self) -> int:
+        """Return how many bumps any process has made so far."""
+        return _COUNTER.unpack_from(self._buf, _COUNTER.size)[0]
+
+    def bump(self, word: Optional[str] = None) -> None:
+        """Invalidate ``word``, or every word when called without one."""
+        offsets = (0 if word is None else self._offset(word), _COUNTER.size)
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for offset in offsets:
+                    value = _COUNTER.unpack_from(self._buf, offset)[0]
+                    _COUNTER.pack_into(self._buf, offset, value + 1)
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class LookupCache:
+    """
+    Bounded LRU cache with TTL for word lookups.
+
+    Positive entries hold the definition for ``ttl`` seconds, negative entries
+    (words that returned 404) hold ``None`` for the shorter ``negative_ttl``.
+    Every entry remembers the generation of its word when it was read from the
+    DB, and is treated as a miss once that generation moves on, whichever
+    worker did the write. Callers snapshot ``generation`` before the DB read so
+    a fill that raced a write is discarded instead of caching the old row.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        generations: Optional[GenerationTable] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.generations = generations or GenerationTable(slots=1024)
+        self._data: OrderedDict[str, tuple] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def generation(self, word: str) -> tuple[int, int]:
+        """Return the invalidation generation to pass back into ``put``."""
+        return self.generations.read(word)
+
+    def get(self, word: str):
+        """Return the cached definition, ``None`` for a cached 404, or ``MISS``."""
+        if not self.enabled:
+            return MISS
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(word)
+            if item is None or item[1] < now or item[2] != self.generations.read(word):
+                if item is not None:
+                    del self._data[word]
+                self.misses += 1
+                return MISS
+            self._data.move_to_end(word)
+            self.hits += 1
+            return item[0]
+
+    def put(
+        self,
+        word: str,
+        definition: Optional[str],
+        generation: tuple,
+        max_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Cache a lookup result unless a write happened since ``generation``.
+        ``max_ttl`` shortens the entry's lifetime, e.g. for replica reads.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if definition is not None else self.negative_ttl
+        if max_ttl is not None:
+            ttl = min(ttl, max_ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generations.read(word):
+                return
+            self._data[word] = (definition, time.monotonic() + ttl, generation)
+            self._data.move_to_end(word)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, word: str) -> None:
+        """Drop a word after it was created, updated or deleted."""
+        self.generations.bump(word)
+        with self._lock:
+            self._data.pop(word, None)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached entry in every worker, e.g. after a bulk load."""
+        self.generations.bump()
+        with self._lock:
+            self._data.clear()
+
+    def clear(self) -> None:
+        """Drop every cached entry in every worker and reset the counters."""
+        self.invalidate_all()
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "shared_generations": self.generations.shared,
+        }
+
+
+lookup_cache = LookupCache(
+    maxsize=settings.LOOKUP_CACHE_SIZE,
+    ttl=settings.LOOKUP_CACHE_TTL,
+    negative_ttl=settings.LOOKUP_CACHE_NEGATIVE_TTL,
+    generations=GenerationTable(
+        slots=settings.CACHE_GENERATION_SLOTS,
+        path=(
+            os.path.join(settings.SHARED_STATE_DIR, "generations.bin")
+            if settings.CACHE_SHARED_GENERATIONS
+            else None
+        ),
+    ),
+)
@@ -0,0 +1,96 @@
+"""Versioned price catalogs, parsed and indexed once per worker."""
+
+import os
+from typing import NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from src.backend.cache import MISS, GenerationTable, LookupCache
+from src.backend.config import settings
+from src.backend.database import cache_ttl_cap, skips_read_caches
+from src.backend.models import Catalog, utcnow
+from src.backend.singleflight import SingleFlight
+from src.exercises.price_catalog import PriceCatalog
+
+
+class CachedCatalog(NamedTuple):
+    version: int
+    prices: PriceCatalog
+
+
+# Its own shared generation table, so an upload handled by any worker of the
+# pod invalidates every worker's copy without counting as a dictionary write
+# (which would make every worker rebuild its word index)
+catalog_cache = LookupCache(
+    maxsize=settings.CATALOG_CACHE_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL,
+    negative_ttl=0,
+    generations=GenerationTable(
+        slots=1024,
+        path=(
+            os.path.join(settings.SHARED_STATE_DIR, "catalogs.bin")
+            if settings.CACHE_SHARED_GENERATIONS
+            else None
+        ),
+    ),
+)
+catalog_flight = SingleFlight("catalog")
+
+
+def catalog_key(catalog_id: str) -> str:
+    return f"catalog:{catalog_id}"
+
+
+def save_catalog(db: Session, catalog_id: str, costs: dict[str, float]) -> Catalog:
+    """Create the catalog or replace its costs, bumping its version."""
+    for attempt in range(2):
+        row = db.exec(
+            select(Catalog).where(Catalog.id == catalog_id).with_for_update()
+        ).first()
+        if row is None:
+            row = Catalog(id=catalog_id, costs=costs)
+        else:
+            row.costs = costs
+            row.version += 1
+            row.updated_at = utcnow()
+        db.add(row)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            # Another worker created it first: replace that one instead
+            db.rollback()
+            if attempt:
+                raise
+    db.refresh(row)
+    catalog_cache.invalidate(catalog_key(catalog_id))
+    return row
+
+
+def get_catalog(
+    db: Session, catalog_id: str, refresh: bool = False
+) -> Optional[CachedCatalog]:
+    """
+    The indexed catalog from this worker's cache, loading and indexing it on
+    a miss (concurrent misses share one load). ``refresh`` skips the cache,
+    e.g. when a caller asked for a newer version than the cached one, and so
+    do clients that just uploaded, which read the primary.
+    """
+    key = catalog_key(catalog_id)
+    own_writes = skips_read_caches(db)
+    cached = MISS if refresh or own_writes else catalog_cache.get(key)
+    if cached is not MISS:
+        return cached
+    generation = catalog_cache.generation(key)
+
+    def load():
+        row = db.get(Catalog, catalog_id, populate_existing=True)
+        cached = CachedCatalog(row.version, PriceCatalog(row.costs)) if row else None
+        catalog_cache.put(key, cached, generation, cache_ttl_cap(db))
+        return cached
+
+    if own_writes:
+        # Don't join a load that may be reading a lagging replica
+        return load()
+    return catalog_flight.do((key, generation, refresh), load)
@@ -0,0 +1,145 @@
+"""Response compression: gzip, and zstd when ``zstandard`` is installed."""
+
+import zlib
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: only gzip is offered without it
+    zstandard = None
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.backend.config import settings
+from src.backend.negotiation import choose
+
+
+def _gzip():
+    # wbits=31: deflate with a gzip header and trailer
+    return zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def _zstd():
+    return zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL).compressobj()
+
+
+# Streaming compressors by content coding; each has compress() and flush()
+COMPRESSORS = {"gzip": _gzip}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _zstd
+
+
+def offered_encodings() -> list[str]:
+    """COMPRESSION_ENCODINGS that can be produced here, in preference order."""
+    return [name for name in settings.COMPRESSION_ENCODINGS if name in COMPRESSORS]
+
+
+def _compressible(message) -> bool:
+    if message["status"] < 200 or message["status"] in (204, 304):
+        return False
+    headers = Headers(raw=message["headers"])
+    if "content-encoding" in headers:
+        return False
+    # Text, JSON (also NDJSON and +json) and MessagePack; not images or archives
+    media_type = headers.get("content-type", "").split(";")[0].strip()
+    return media_type.startswith("text/") or media_type.endswith(("json", "msgpack"))
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing responses with the client's preferred
+    encoding of ``offered_encodings()``.
+
+    The body is held back until it reaches COMPRESSION_MIN_SIZE: small
+    responses go out untouched, since a gzip header and the CPU cost outweigh
+    the bytes saved. Past the threshold streamed responses such as exports
+    are compressed chunk by chunk, so memory stays constant. Every response of
+    a compressible type carries ``Vary: Accept-Encoding``, compressed or not.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose(
+            Headers(scope=scope).get("accept-encoding"), offered_encodings()
+        )
+
+        start = None
+        pending = []
+        pending_size = 0
+        compressor = None
+
+        async def send_wrapper(message):
+            nonlocal start, pending_size, compressor
+            if message["type"] == "http.response.start":
+                if not _compressible(message):
+                    await send(message)
+                    return
+                # Caches must key on Accept-Encoding whichever representation
+                # this client gets, identity included
+                headers = MutableHeaders(raw=list(message["headers"]))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "headers": headers.raw}
+                if encoding is None:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                pending.append(body)
+                pending_size += len(body)
+                if more_body and pending_size < settings.COMPRESSION_MIN_SIZE:
+                    return
+                body = b"".join(pending)
+                pending.clear()
+                if pending_size < settings.COMPRESSION_MIN_SIZE:
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    start = None
+                    return
+                compressor = COMPRESSORS[encoding]()
+                if not more_body:
+                    # Complete body: compress it at once and keep Content-Length
+                    body = compressor.compress(body) + compressor.flush()
+                    await send(self._compressed_start(start, encoding, len(body)))
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(self._compressed_start(start, encoding))
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.flush()
+            if chunk or not more_body:
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": more_body,
+                    }
+                )
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressed_start(start, encoding: str, length: Optional[int] = None):
+        headers = MutableHeaders(raw=list(start["headers"]))
+        del headers["content-length"]
+        if length is not None:
+            headers["content-length"] = str(length)
+        headers["content-encoding"] = encoding
+        # The bytes differ from the identity representation, so a strong ETag
+        # would be wrong; If-None-Match uses the weak comparison anyway
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return {**start, "headers": headers.raw}
@@ -0,0 +1,108 @@
+"""ETag/Last-Modified validators and conditional GET handling for reads."""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from src.backend.models import DictionaryEntry
+
+# Enough to tell whether a page changed without fetching its definitions
+PAGE_VALIDATOR_COLUMNS = (DictionaryEntry.id, DictionaryEntry.version)
+
+
+class CachedEntry(NamedTuple):
+    """What the lookup cache keeps per word: enough to answer 200 or 304."""
+
+    definition: str
+    etag: str
+    last_modified: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: DictionaryEntry) -> "CachedEntry":
+        return cls(row.definition, entry_etag(row), row.updated_at)
+
+
+def entry_etag(row) -> str:
+    """
+    Strong validator of one entry. The version is bumped on every overwrite
+    and a re-created word gets a new id, so the pair never repeats.
+    """
+    return f'"{row.id}-{row.version}"'
+
+
+def page_etag(rows, variant: str = "") -> str:
+    """
+    Strong validator of a page: its entries' ids and versions, in order, and
+    the ``variant`` naming a non-default representation of them.
+    """
+    digest = hashlib.sha1(usedforsecurity=False)
+    for row in rows:
+        digest.update(f"{row.id}-{row.version},".encode())
+    suffix = f"-{variant}" if variant else ""
+    return f'"p{len(rows)}-{digest.hexdigest()[:20]}{suffix}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        # Some drivers return the stored UTC value without an offset
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_listed(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    candidates = (c.strip().removeprefix("W/") for c in header.split(","))
+    return any(c == "*" or c == etag for c in candidates)
+
+
+def is_not_modified(
+    request: Request, etag: str, modified: Optional[datetime] = None
+) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when there is none."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_listed(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole seconds
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_cache_headers(
+    response: Response,
+    etag: str,
+    modified: Optional[datetime],
+    max_age: int,
+    vary: Optional[str] = None,
+) -> None:
+    response.headers["ETag"] = etag
+    if vary:
+        response.headers["Vary"] = vary
+    if modified is not None:
+        response.headers["Last-Modified"] = _http_date(modified)
+    # max-age 0: caches may store it but must revalidate (cheap with the ETag)
+    response.headers["Cache-Control"] = (
+        f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    )
+
+
+def not_modified(
+    etag: str,
+    modified: Optional[datetime],
+    max_age: int,
+    vary: Optional[str] = None,
+) -> Response:
+    """A bodyless 304 carrying the same validators as the 200 would."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, modified, max_age, vary)
+    return response
@@ -1,9 +1,20 @@
 """Configuration settings for the FastAPI application."""
 
+import os
+import tempfile
+from typing import Literal, Optional
+
 from pydantic import ConfigDict, Field, computed_field
 from pydantic_settings import BaseSettings
 
 
+def _default_shared_state_dir() -> str:
+    # /dev/shm is RAM-backed and private to the pod, so every gunicorn worker
+    # of the pod sees the same files without touching the container disk.
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "dictionary-api")
+
+
 class Settings(BaseSettings):
     app_name: str = "Dictionary API"
     app_version: str = "1.0.0"
@@ -12,6 +23,105 @@ class Settings(BaseSettings):
     DB_HOST: str = Field(default="mariadb-operator-instance")
     DB_PORT: str = Field(default="3306")
     DB_NAME: str = Field(default="dictionary-db")
+    # Startup: connection attempts with jittered exponential backoff (seconds)
+    DB_CONNECT_MAX_ATTEMPTS: int = Field(default=8)
+    DB_CONNECT_BACKOFF_BASE: float = Field(default=0.5)
+    DB_CONNECT_BACKOFF_MAX: float = Field(default=10.0)
+    # "leader": first worker of a pod runs create_all under a file lock,
+    # "always": every worker does, "skip": `python -m src.backend.schema` did
+    SCHEMA_INIT_MODE: Literal["leader", "always", "skip"] = Field(default="leader")
+    # Connection pools are sized so that every worker of every pod together
+    # stays within DB_CONNECTION_BUDGET connections per database server (keep
+    # it below MariaDB max_connections). POD_REPLICAS should include the
+    # rolling-update surge. DB_POOL_SIZE/DB_MAX_OVERFLOW override the result.
+    DB_CONNECTION_BUDGET: int = Field(default=100)
+    WEB_CONCURRENCY: int = Field(default=8)
+    POD_REPLICAS: int = Field(default=2)
+    DB_POOL_SIZE: Optional[int] = Field(default=None)
+    DB_MAX_OVERFLOW: Optional[int] = Field(default=None)
+    DB_POOL_TIMEOUT: float = Field(default=30.0)
+    # Shed load: answer 503 with Retry-After once a request has waited this
+    # many seconds for a pool connection, instead of DB_POOL_TIMEOUT (0 = off)
+    DB_POOL_SHED_AFTER: float = Field(default=0.0)
+    DB_POOL_RETRY_AFTER: int = Field(default=1)
+    # Read replicas (JSON list of SQLAlchemy URLs) for lookups, listing, search
+    # and export; "round_robin" or "least_loaded" picks one per request. After
+    # a write, that client reads from the primary for READ_YOUR_WRITES_SECONDS
+    # (0 disables it)
+    DB_REPLICA_URLS: list[str] = Field(default_factory=list)
+    DB_REPLICA_STRATEGY: Literal["round_robin", "least_loaded"] = Field(
+        default="round_robin"
+    )
+    READ_YOUR_WRITES_SECONDS: float = Field(default=5.0)
+    # Serve the dictionary endpoints with async handlers on an aiomysql engine
+    DB_ASYNC: bool = Field(default=False)
+
+    # Read-through cache in front of GET /api/v1/look/{word} (0 disables it)
+    LOOKUP_CACHE_SIZE: int = Field(default=10000)
+    LOOKUP_CACHE_TTL: float = Field(default=300.0)
+    LOOKUP_CACHE_NEGATIVE_TTL: float = Field(default=5.0)
+    # Concurrent misses for the same word in a worker share one DB query
+    LOOKUP_SINGLE_FLIGHT: bool = Field(default=True)
+
+    # Cache-Control max-age (seconds) of dictionary reads; 0 = always revalidate
+    LOOKUP_MAX_AGE: int = Field(default=60)
+    ENTRIES_MAX_AGE: int = Field(default=0)
+
+    # Response compression, in server preference order; zstd needs zstandard
+    COMPRESSION_ENABLED: bool = Field(default=True)
+    COMPRESSION_ENCODINGS: list[str] = Field(default_factory=lambda: ["zstd", "gzip"])
+    COMPRESSION_MIN_SIZE: int = Field(default=1024)
+    GZIP_LEVEL: int = Field(default=6)
+    ZSTD_LEVEL: int = Field(default=3)
+
+    # Invalidation counters shared by all worker processes of a pod
+    SHARED_STATE_DIR: str = Field(default_factory=_default_shared_state_dir)
+    CACHE_SHARED_GENERATIONS: bool = Field(default=True)
+    CACHE_GENERATION_SLOTS: int = Field(default=65536)
+
+    # Parsed price catalogs kept per worker. Uploads in any worker of the pod
+    # invalidate them at once through the shared generations; the TTL bounds
+    # how long an upload through another pod can go unseen.
+    CATALOG_CACHE_SIZE: int = Field(default=64)
+    CATALOG_CACHE_TTL: float = Field(default=60.0)
+    CATALOG_MAX_BASKETS: int = Field(default=10000)
+
+    # Create entries with one INSERT relying on the unique index on word,
+    # instead of SELECT + INSERT + refresh
+    SINGLE_STATEMENT_WRITES: bool = Field(default=False)
+
+    # POST /api/v1/bulk: rows per multi-row INSERT and INSERTs per transaction
+    BULK_INSERT_BATCH_SIZE: int = Field(default=1000)
+    BULK_COMMIT_BATCHES: int = Field(default=10)
+    # Encode GET /api/v1/entries pages straight from column tuples to JSON
+    FAST_JSON_RESPONSES: bool = Field(default=False)
+
+    # POST /api/v1/look: words per WHERE word IN (...) query and per request
+    BATCH_LOOKUP_CHUNK_SIZE: int = Field(default=500)
+    BATCH_LOOKUP_MAX_WORDS: int = Field(default=10000)
+    # Prefix search, and "did you mean" suggestions on a 404 of
+    # /look/{word}?suggest=true (0 disables them)
+    SEARCH_MAX_RESULTS: int = Field(default=100)
+    SEARCH_SUGGESTIONS: int = Field(default=5)
+    SEARCH_INDEX_MIN_REBUILD_INTERVAL: float = Field(default=30.0)
+    # Rebuild at least this often (0 never) to pick up writes made through
+    # other pods and rows a lagging replica hadn't replayed at build time
+    SEARCH_INDEX_MAX_AGE: float = Field(default=600.0)
+    # Words streamed per round trip while (re)building the index
+    SEARCH_INDEX_FETCH_SIZE: int = Field(default=10000)
+    # GET /api/v1/export: rows fetched from the server-side cursor per chunk
+    EXPORT_BATCH_SIZE: int = Field(default=1000)
+    # Request, query and pool metrics served on /metrics, aggregated over the
+    # per-worker files in SHARED_STATE_DIR/metrics
+    METRICS_ENABLED: bool = Field(default=True)
+    # Log when the app was built and when its first request was served,
+    # relative to process start (see benchmarks/profile_startup.py)
+    STARTUP_PROFILE: bool = Field(default=False)
+    # Background DB probe behind /health/ready: seconds between probes, probe
+    # timeout, and consecutive failures before the pod is reported unready
+    HEALTH_PROBE_INTERVAL: float = Field(default=5.0)
+    HEALTH_PROBE_TIMEOUT: float = Field(default=2.0)
+    HEALTH_FAILURE_THRESHOLD: int = Field(default=3)
 
     @computed_field
     @property
@@ -19,6 +129,11 @@ class Settings(BaseSettings):
         # Properly formatted for SQLAlchemy + PyMySQL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     model_config = ConfigDict(env_file=".env", extra="ignore")
 
 
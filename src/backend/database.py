@@ -1,53 +1,327 @@
 """Database connection and session management."""
 
+import asyncio
+import itertools
 import logging
+import threading
 import time
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Optional
 
-from fastapi import Depends
-from sqlalchemy.orm import exc
-from sqlmodel import Session, SQLModel, create_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy import Engine
+from sqlmodel import Session, create_engine
 
 from src.backend.config import settings
+from src.backend.metrics import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+)
+from src.backend.schema import create_schema, ensure_schema, wait_for_db
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 # Setup logging to see retry attempts in 'kubectl logs'
 logger = logging.getLogger(__name__)
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    pool_size=10,
-    max_overflow=5,
-    pool_timeout=30,
-    echo=False,
-)
+_engine: Engine | None = None
+
+
+def pool_limits(
+    budget: int,
+    workers: int,
+    pods: int,
+    engines_per_worker: int = 1,
+    reserved_per_worker: int = 1,
+) -> tuple[int, int]:
+    """
+    Split a per-server connection budget into ``(pool_size, max_overflow)``
+    for one engine of one worker process. ``reserved_per_worker`` covers
+    connections held outside the pools, like the health probe's. About two
+    thirds of an engine's share stay open in the pool, and the rest is
+    overflow that is closed again once the burst that needed it is over.
+    Raises ``ValueError`` when the budget can't give every engine at least
+    one connection, instead of quietly exceeding it.
+    """
+    per_worker = budget // max(1, workers * pods) - reserved_per_worker
+    per_engine = per_worker // engines_per_worker
+    if per_engine < 1:
+        needed = (engines_per_worker + reserved_per_worker) * workers * pods
+        raise ValueError(
+            f"A budget of {budget} DB connections is too small for {workers} "
+            f"workers x {pods} pods, which need at least {needed}"
+        )
+    pool_size = max(1, round(per_engine * 2 / 3))
+    return pool_size, per_engine - pool_size
+
+
+def _pool_options() -> dict:
+    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if pool_size is None or max_overflow is None:
+        try:
+            derived = pool_limits(
+                settings.DB_CONNECTION_BUDGET,
+                settings.WEB_CONCURRENCY,
+                settings.POD_REPLICAS,
+                # Async mode keeps the sync engine for bulk, export and search
+                engines_per_worker=2 if settings.DB_ASYNC else 1,
+            )
+        except ValueError as e:
+            logger.error(
+                f"{e}: raise DB_CONNECTION_BUDGET, lower WEB_CONCURRENCY "
+                "or POD_REPLICAS, or set DB_POOL_SIZE and DB_MAX_OVERFLOW."
+            )
+            raise
+        if pool_size is None:
+            pool_size = derived[0]
+        if max_overflow is None:
+            max_overflow = derived[1]
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_SHED_AFTER or settings.DB_POOL_TIMEOUT,
+    }
+
+
+def _create_engine(url: str, name: str) -> Engine:
+    # SQLite files stand in for replicas locally; sessions cross threads there
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    options = _pool_options()
+    logger.info(
+        f"DB pool {name}: pool_size={options['pool_size']} "
+        f"max_overflow={options['max_overflow']} for {settings.WEB_CONCURRENCY} "
+        f"workers x {settings.POD_REPLICAS} pods within a budget of "
+        f"{settings.DB_CONNECTION_BUDGET}"
+    )
+    engine = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        poolclass=TimedQueuePool,
+        pool_logging_name=name,
+        connect_args=connect_args,
+        echo=False,
+        **options,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+def get_engine() -> Engine:
+    """
+    Create the engine on first use rather than at import, so a preloaded
+    gunicorn master can import the app without owning a pool its workers
+    would inherit.
+    """
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(SQLALCHEMY_DATABASE_URL, "primary")
+    return _engine
 
 
 def get_session():
-    with Session(autocommit=False, autoflush=False, bind=engine) as session:
+    with Session(autocommit=False, autoflush=False, bind=get_engine()) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
-def init_db():
-    """Initialize database with retries for Kubernetes resilience."""
-    max_retries = 5
-    retry_delay = 5
+class ReplicaSet:
+    """
+    Read replicas picked per session, either in turn (``round_robin``) or by
+    fewest connections currently checked out of their pool (``least_loaded``).
+    """
 
-    for i in range(max_retries):
-        try:
-            logger.info(f"Connecting to database (attempt {i + 1}/{max_retries})...")
-            SQLModel.metadata.create_all(engine)
-            logger.info("Database initialized successfully.")
-            break
-        except exc.OperationalError as e:
-            if i == max_retries - 1:
-                logger.error("Could not connect to database after max retries.")
-                raise e
-            logger.warning(f"Database not ready, retrying in {retry_delay}s...")
-            time.sleep(retry_delay)
+    def __init__(self, urls: list[str], strategy: str = "round_robin"):
+        self.engines = [
+            _create_engine(url, f"replica{i}") for i, url in enumerate(urls)
+        ]
+        self.strategy = strategy
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def pick(self) -> Engine:
+        with self._lock:
+            turn = next(self._turn)
+        if self.strategy == "least_loaded":
+            # Rotate first so equally loaded replicas still take turns
+            n = len(self.engines)
+            rotated = [self.engines[(turn + i) % n] for i in range(n)]
+            return min(rotated, key=lambda engine: engine.pool.checkedout())
+        return self.engines[turn % len(self.engines)]
+
+    def dispose(self, close: bool = True) -> None:
+        for engine in self.engines:
+            engine.dispose(close=close)
+
+
+_replicas: Optional[ReplicaSet] = None
+
+
+def get_replicas() -> Optional[ReplicaSet]:
+    """The configured read replicas, or None when every query uses the primary."""
+    global _replicas
+    if _replicas is None and settings.DB_REPLICA_URLS:
+        _replicas = ReplicaSet(settings.DB_REPLICA_URLS, settings.DB_REPLICA_STRATEGY)
+    return _replicas
+
+
+READ_YOUR_WRITES_COOKIE = "db_read_primary_until"
+
+# Session.info keys set by get_read_session
+_REPLICA = "replica"
+_READ_YOUR_WRITES = "read_your_writes"
+
+
+def _recently_wrote(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_session(request: Request, primary: SessionDep):
+    """
+    Session for read-only endpoints: a replica when any are configured,
+    except for clients that wrote within READ_YOUR_WRITES_SECONDS, which keep
+    reading from the primary so they see their own writes despite lag.
+    """
+    replicas = get_replicas()
+    if replicas is None or _recently_wrote(request):
+        if replicas is not None:
+            primary.info[_READ_YOUR_WRITES] = True
+        yield primary
+        return
+    with Session(autocommit=False, autoflush=False, bind=replicas.pick()) as session:
+        session.info[_REPLICA] = True
+        yield session
+
+
+def skips_read_caches(db: Session) -> bool:
+    """
+    Whether ``db`` serves a client within its read-your-writes window. Such a
+    client must not be answered from a worker's cache, which another client
+    may have filled from a lagging replica after the write.
+    """
+    return db.info.get(_READ_YOUR_WRITES, False)
+
+
+def cache_ttl_cap(db: Session) -> Optional[float]:
+    """
+    Longest time a cache may keep what was read through ``db``: rows from a
+    replica may predate a write it hasn't replayed yet, so they are only kept
+    for ``READ_YOUR_WRITES_SECONDS``. None for the primary.
+    """
+    return settings.READ_YOUR_WRITES_SECONDS if db.info.get(_REPLICA) else None
+
+
+def get_write_session(response: Response, primary: SessionDep):
+    """Primary session that also pins the client's next reads to the primary."""
+    seconds = settings.READ_YOUR_WRITES_SECONDS
+    if seconds > 0 and settings.DB_REPLICA_URLS:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time() + seconds),
+            max_age=int(seconds) + 1,
+            httponly=True,
+        )
+    yield primary
+
+
+ReadSessionDep = Annotated[Session, Depends(get_read_session)]
+WriteSessionDep = Annotated[Session, Depends(get_write_session)]
+
+
+_async_engine: "AsyncEngine | None" = None
+
+
+def get_async_engine() -> "AsyncEngine":
+    """Create the async engine on first use so sync deployments never load aiomysql."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            poolclass=TimedAsyncQueuePool,
+            echo=False,
+            **_pool_options(),
+        )
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+async def get_async_session():
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    async with AsyncSession(
+        get_async_engine(), autoflush=False, expire_on_commit=False
+    ) as session:
+        yield session
+
+
+def dispose_engines() -> None:
+    """
+    Forget connections inherited from the parent process. Called in every
+    forked worker; ``close=False`` leaves the parent's sockets alone.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _replicas is not None:
+        _replicas.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+def __getattr__(name: str):
+    # ``engine`` used to be a module attribute created at import time, and
+    # AsyncSessionDep would pull in the asyncio extension for sync deployments
+    if name == "engine":
+        return get_engine()
+    if name == "AsyncSessionDep":
+        from sqlmodel.ext.asyncio.session import AsyncSession
+
+        return Annotated[AsyncSession, Depends(get_async_session)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def init_db() -> dict[str, float]:
+    """
+    Wait for the database with jittered backoff and prepare the schema
+    according to SCHEMA_INIT_MODE, logging how long each phase took.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    engine = get_engine()
+    attempts = await wait_for_db(
+        engine,
+        settings.DB_CONNECT_MAX_ATTEMPTS,
+        settings.DB_CONNECT_BACKOFF_BASE,
+        settings.DB_CONNECT_BACKOFF_MAX,
+    )
+    timings["connect"] = time.perf_counter() - start
+    logger.info(
+        f"Startup: database reachable after {attempts} attempt(s) "
+        f"in {timings['connect']:.3f}s"
+    )
+
+    start = time.perf_counter()
+    mode = settings.SCHEMA_INIT_MODE
+    if mode == "always":
+        await asyncio.to_thread(create_schema, engine)
+        outcome = "created"
+    elif mode == "leader":
+        created = await asyncio.to_thread(ensure_schema, engine)
+        outcome = "created" if created else "already created by another worker"
+    else:
+        outcome = "skipped"
+    timings["schema"] = time.perf_counter() - start
+    logger.info(f"Startup: schema {outcome} in {timings['schema']:.3f}s")
+    return timings
@@ -0,0 +1,58 @@
+"""Constant-memory streaming export of the dictionary table."""
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Iterator
+
+from sqlmodel import Session, select
+
+from src.backend.models import DictionaryEntry
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def iter_export(db: Session, fmt: ExportFormat, batch_size: int) -> Iterator[bytes]:
+    """
+    Yield the whole table as encoded chunks of ``batch_size`` rows.
+
+    ``yield_per`` makes SQLAlchemy stream the result through a server-side
+    cursor (an unbuffered ``SSCursor`` on PyMySQL), so only one batch of rows
+    and one encoded chunk are ever held in memory.
+    """
+    statement = (
+        select(DictionaryEntry.word, DictionaryEntry.definition)
+        .order_by(DictionaryEntry.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = db.exec(statement)
+
+    if fmt is ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(("word", "definition"))
+        for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+        return
+
+    for rows in result.partitions():
+        yield "".join(
+            json.dumps({"word": word, "definition": definition}, ensure_ascii=False)
+            + "\n"
+            for word, definition in rows
+        ).encode("utf-8")
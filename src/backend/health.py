@@ -0,0 +1,162 @@
+"""Background database probe behind the readiness endpoint."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.pool import Pool
+
+from src.backend.config import settings
+from src.backend.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProbe:
+    """
+    Runs ``SELECT 1`` every ``interval`` seconds and caches the outcome.
+
+    Kubernetes probes only read the cached state, so however often they hit
+    a pod they never open a connection themselves. The probe has its own
+    single-connection engine so it neither competes with requests for the
+    request pool nor reports unhealthy just because that pool is busy. A
+    saturated request pool is only reported (``pool_exhausted`` and a gauge):
+    it means load, which every pod sees at once, and failing readiness on it
+    would take every endpoint out of the Service together. A pod becomes
+    ready with its first successful probe and stops being ready after
+    ``failure_threshold`` consecutive failures to reach the DB, or when the
+    last result is too old because the probe itself is stuck.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        timeout: float,
+        failure_threshold: int,
+        engine: Optional[Engine] = None,
+        pool: Optional[Pool] = None,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.engine = engine
+        self.pool = pool
+        self.database_ok: Optional[bool] = None
+        self.pool_exhausted = False
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.latency: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.ever_ok = False
+        self._task: Optional[asyncio.Task] = None
+
+    def _select_one(self) -> None:
+        if self.engine is None:
+            self.engine = create_engine(
+                settings.DATABASE_URL,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=self.timeout,
+                pool_recycle=3600,
+            )
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    def _pool_exhausted(self) -> bool:
+        if self.pool is None or not hasattr(self.pool, "overflow"):
+            return False
+        capacity = self.pool.size() + getattr(self.pool, "_max_overflow", 0)
+        return self.pool.checkedout() >= capacity
+
+    async def check(self) -> None:
+        """Probe the DB once and record the outcome."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self._select_one), self.timeout)
+            self.database_ok, self.last_error = True, None
+            self.ever_ok = True
+        except Exception as e:  # any failure means "not ready", never a crash
+            self.database_ok = False
+            self.last_error = f"{type(e).__name__}: {e}"[:200]
+            if self.engine is not None:
+                # Drop a half-dead connection so the next probe reconnects
+                self.engine.dispose()
+        self.latency = time.perf_counter() - start
+        self.checked_at = time.monotonic()
+        self.pool_exhausted = self._pool_exhausted()
+
+        if self.database_ok:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            if self.consecutive_failures == self.failure_threshold:
+                logger.warning(f"Readiness lost: {self.status()}")
+
+        if settings.METRICS_ENABLED:
+            metrics.set("health_database_up", (), 1 if self.database_ok else 0)
+            metrics.set("health_probe_latency_seconds", (), self.latency)
+            metrics.set("health_pool_exhausted", (), 1 if self.pool_exhausted else 0)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def start(self) -> None:
+        """Probe once so the first readiness answer is real, then keep probing."""
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.engine is not None:
+            self.engine.dispose()
+
+    @property
+    def stale(self) -> bool:
+        max_age = self.interval * self.failure_threshold + self.timeout
+        return self.checked_at is None or time.monotonic() - self.checked_at > max_age
+
+    @property
+    def ready(self) -> bool:
+        return (
+            self.ever_ok
+            and not self.stale
+            and self.consecutive_failures < self.failure_threshold
+        )
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "database": {
+                None: "unknown",
+                True: "connected",
+                False: "disconnected",
+            }[self.database_ok],
+            "pool_exhausted": self.pool_exhausted,
+            "consecutive_failures": self.consecutive_failures,
+            "probe_latency_ms": (
+                round(self.latency * 1e3, 3) if self.latency is not None else None
+            ),
+            "checked_seconds_ago": (
+                round(time.monotonic() - self.checked_at, 3)
+                if self.checked_at is not None
+                else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+health_probe = HealthProbe(
+    interval=settings.HEALTH_PROBE_INTERVAL,
+    timeout=settings.HEALTH_PROBE_TIMEOUT,
+    failure_threshold=settings.HEALTH_FAILURE_THRESHOLD,
+)
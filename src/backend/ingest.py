@@ -0,0 +1,215 @@
+"""Batched multi-row writes used by the bulk ingest endpoint."""
+
+import csv
+import json
+import time
+from enum import Enum
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from src.backend.cache import lookup_cache
+from src.backend.models import MAX_TEXT_LENGTH, DictionaryEntry, utcnow
+from src.backend.search import word_index
+
+
+class ConflictPolicy(str, Enum):
+    """What to do with a row whose word already exists."""
+
+    SKIP = "skip"
+    OVERWRITE = "overwrite"
+    FAIL = "fail"
+
+
+class DuplicateEntryError(Exception):
+    """Raised under ``ConflictPolicy.FAIL`` when a word already exists."""
+
+    def __init__(self, word: str):
+        super().__init__(f"Entry for '{word}' already exists")
+        self.word = word
+
+
+def insert_statement(dialect_name: str, rows: list[dict], on_conflict: ConflictPolicy):
+    """
+    Build one multi-row INSERT for ``rows`` that resolves conflicts on the
+    unique index of ``word`` inside the database.
+
+    MariaDB/MySQL use ``INSERT IGNORE`` / ``ON DUPLICATE KEY UPDATE``, SQLite
+    and PostgreSQL use ``ON CONFLICT (word)``. ``INSERT IGNORE`` rather than a
+    no-op ``ON DUPLICATE KEY UPDATE`` keeps SKIP's rowcount exact: SQLAlchemy
+    always connects with ``CLIENT_FOUND_ROWS``, which counts a duplicate left
+    alone as one affected row. IGNORE also downgrades every other error to a
+    warning, so rows must pass ``MAX_TEXT_LENGTH`` validation first.
+    """
+    table = DictionaryEntry.__table__
+    # An overwrite is a new version of the entry, which changes its ETag
+    touched = {"version": table.c.version + 1, "updated_at": utcnow()}
+
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql.insert(table).values(rows)
+        if on_conflict is ConflictPolicy.SKIP:
+            return stmt.prefix_with("IGNORE")
+        if on_conflict is ConflictPolicy.OVERWRITE:
+            return stmt.on_duplicate_key_update(
+                definition=stmt.inserted.definition, **touched
+            )
+        return stmt
+
+    if dialect_name in ("sqlite", "postgresql"):
+        dialect = sqlite if dialect_name == "sqlite" else postgresql
+        stmt = dialect.insert(table).values(rows)
+        if on_conflict is ConflictPolicy.SKIP:
+            return stmt.on_conflict_do_nothing(index_elements=["word"])
+        if on_conflict is ConflictPolicy.OVERWRITE:
+            return stmt.on_conflict_do_update(
+                index_elements=["word"],
+                set_={"definition": stmt.excluded.definition, **touched},
+            )
+        return stmt
+
+    if on_conflict is not ConflictPolicy.FAIL:
+        raise ValueError(f"'{on_conflict.value}' is not supported on {dialect_name}")
+    return insert(table).values(rows)
+
+
+def parse_ndjson_line(line: str) -> dict:
+    """Parse ``{"word": ..., "definition": ...}`` or raise ``ValueError``."""
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise ValueError("Expected a JSON object")
+    return _validate(row.get("word"), row.get("definition"))
+
+
+def parse_csv_line(line: str) -> dict:
+    """Parse a ``word,definition`` record or raise ``ValueError``."""
+    fields = next(csv.reader([line]))
+    if len(fields) != 2:
+        raise ValueError("Expected two columns: word,definition")
+    return _validate(*fields)
+
+
+def _validate(word, definition) -> dict:
+    if not isinstance(word, str) or not word or not isinstance(definition, str):
+        raise ValueError("Both 'word' and 'definition' must be strings")
+    if len(word) > MAX_TEXT_LENGTH or len(definition) > MAX_TEXT_LENGTH:
+        raise ValueError(f"Longer than {MAX_TEXT_LENGTH} characters")
+    return {"word": word, "definition": definition}
+
+
+class BulkIngest:
+    """
+    Accumulate parsed rows and write them in multi-row INSERTs.
+
+    Every ``batch_size`` rows become one INSERT, and every ``commit_batches``
+    INSERTs share one transaction, so a 2M-row load costs a few thousand round
+    trips instead of four per word. Rows repeated within a batch are collapsed
+    before they reach the DB: the first one wins for SKIP, the last one for
+    OVERWRITE, and FAIL rejects the repeat.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        on_conflict: ConflictPolicy,
+        batch_size: int,
+        commit_batches: int,
+    ):
+        self.db = db
+        self.on_conflict = on_conflict
+        self.batch_size = batch_size
+        self.commit_batches = commit_batches
+        self.dialect_name = db.get_bind().dialect.name
+        self.received = 0
+        self.written = 0
+        self.rejected = 0
+        self._batch: dict[str, str] = {}
+        self._pending_batches = 0
+        self._pending_written = 0
+        self._started = time.perf_counter()
+
+    @property
+    def batch_full(self) -> bool:
+        return len(self._batch) >= self.batch_size
+
+    def add(self, row: dict) -> None:
+        """Queue a parsed row; call ``flush`` once ``batch_full`` is set."""
+        self.received += 1
+        word = row["word"]
+        if word in self._batch:
+            if self.on_conflict is ConflictPolicy.FAIL:
+                self.rollback()
+                raise DuplicateEntryError(word)
+            if self.on_conflict is ConflictPolicy.SKIP:
+                self.rejected += 1
+                return
+        self._batch[word] = row["definition"]
+
+    def reject(self) -> None:
+        """Count a line that could not be parsed."""
+        self.received += 1
+        self.rejected += 1
+
+    def flush(self) -> None:
+        """Write the queued batch, committing once enough batches are pending."""
+        self._write_batch()
+        if self._pending_batches >= self.commit_batches:
+            self.commit()
+
+    def _write_batch(self) -> None:
+        if not self._batch:
+            return
+        rows = [{"word": w, "definition": d} for w, d in self._batch.items()]
+        self._batch = {}
+        stmt = insert_statement(self.dialect_name, rows, self.on_conflict)
+        try:
+            result = self.db.exec(stmt)
+        except IntegrityError as e:
+            self.rollback()
+            existing = self.db.exec(
+                select(DictionaryEntry.word).where(
+                    DictionaryEntry.word.in_([row["word"] for row in rows])
+                )
+            ).first()
+            raise DuplicateEntryError(existing or rows[0]["word"]) from e
+
+        if self.on_conflict is ConflictPolicy.SKIP:
+            inserted = max(result.rowcount, 0)
+            self.rejected += len(rows) - inserted
+            self._pending_written += inserted
+        else:
+            self._pending_written += len(rows)
+        self._pending_batches += 1
+
+    def commit(self) -> None:
+        """Commit the current chunk and drop every cached lookup."""
+        if self._pending_batches:
+            self.db.commit()
+            self.written += self._pending_written
+            self._pending_batches = 0
+            self._pending_written = 0
+            lookup_cache.invalidate_all()
+            word_index.reset()
+
+    def rollback(self) -> None:
+        """Abandon the uncommitted chunk after a conflict."""
+        self.db.rollback()
+        self._batch = {}
+        self._pending_batches = 0
+        self._pending_written = 0
+
+    def finish(self) -> None:
+        """Write whatever is left and commit it."""
+        self._write_batch()
+        self.commit()
+
+    def result(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "received": self.received,
+            "written": self.written,
+            "rejected": self.rejected,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.received / elapsed, 1) if elapsed else 0.0,
+        }
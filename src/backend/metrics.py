@@ -0,0 +1,384 @@
+"""Prometheus-style metrics aggregated across the gunicorn workers of a pod."""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.backend.config import settings
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# name -> (type, help). Gauges are summed over live workers only.
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by route, method and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by route."),
+    "db_query_duration_seconds": ("histogram", "DB statement latency by type."),
+    "db_pool_wait_seconds": ("histogram", "Time spent waiting for a pool connection."),
+    "db_pool_checked_out": ("gauge", "Connections currently checked out."),
+    "db_pool_overflow": ("gauge", "Connections open beyond pool_size."),
+    "db_pool_size": ("gauge", "Configured pool_size."),
+    "db_pool_shed_total": ("counter", "Requests shed with 503 after a pool wait."),
+    "singleflight_coalesced_total": (
+        "counter",
+        "Calls that joined an in-flight query.",
+    ),
+    "health_database_up": ("gauge", "1 if the last readiness probe reached the DB."),
+    "health_probe_latency_seconds": ("gauge", "Duration of the last readiness probe."),
+    "health_pool_exhausted": ("gauge", "1 if the request pool had no connection left."),
+}
+
+_USED = struct.Struct("<Q")
+_KEY_LEN = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+
+class MetricsFile:
+    """
+    Append-only ``key -> float`` store in a mmap'ed file owned by one process.
+
+    The first 8 bytes hold the number of bytes in use, followed by records of
+    ``[u32 key length][key][padding to 8][f64 value]``. Only the owning
+    process writes, and it publishes a new record by bumping the used-bytes
+    header after writing it, so readers in other processes never see a
+    partial record. This is the same scheme prometheus_client uses for its
+    multiprocess mode.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets: dict[str, int] = {}
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < _INITIAL_SIZE:
+            os.ftruncate(self._fd, _INITIAL_SIZE)
+        self._map()
+        for key, _, offset in _read_records(self._buf, self._used):
+            self._offsets[key] = offset
+
+    def _map(self) -> None:
+        self._size = os.fstat(self._fd).st_size
+        self._buf = mmap.mmap(self._fd, self._size)
+        self._used = _USED.unpack_from(self._buf, 0)[0] or _USED.size
+
+    def _allocate(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        padded = _KEY_LEN.size + len(encoded)
+        padded += -padded % 8
+        needed = self._used + padded + _VALUE.size
+        if needed > self._size:
+            self._buf.close()
+            os.ftruncate(self._fd, max(needed, self._size * 2))
+            self._map()
+        _KEY_LEN.pack_into(self._buf, self._used, len(encoded))
+        self._buf[
+            self._used + _KEY_LEN.size : self._used + _KEY_LEN.size + len(encoded)
+        ] = encoded
+        offset = self._used + padded
+        _VALUE.pack_into(self._buf, offset, 0.0)
+        self._used = needed
+        _USED.pack_into(self._buf, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def add(self, key: str, amount: float) -> None:
+        offset = self._offsets.get(key) or self._allocate(key)
+        _VALUE.pack_into(
+            self._buf, offset, _VALUE.unpack_from(self._buf, offset)[0] + amount
+        )
+
+    def set(self, key: str, value: float) -> None:
+        offset = self._offsets.get(key) or self._allocate(key)
+        _VALUE.pack_into(self._buf, offset, value)
+
+
+def _read_records(buf, used: Optional[int] = None):
+    used = used or _USED.unpack_from(buf, 0)[0]
+    pos = _USED.size
+    while pos < used:
+        length = _KEY_LEN.unpack_from(buf, pos)[0]
+        key = bytes(buf[pos + _KEY_LEN.size : pos + _KEY_LEN.size + length]).decode(
+            "utf-8"
+        )
+        pos += _KEY_LEN.size + length
+        pos += -pos % 8
+        yield key, _VALUE.unpack_from(buf, pos)[0], pos
+        pos += _VALUE.size
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Metrics:
+    """
+    Counters, gauges and histograms written to a per-process ``MetricsFile``.
+
+    The file is opened lazily and reopened after a fork, so gunicorn workers
+    forked from a preloaded master each get their own. ``render`` reads every
+    worker's file: counters and histograms are summed over all of them (dead
+    workers included, so totals don't drop when a worker is recycled), gauges
+    only over workers that are still alive.
+    """
+
+    def __init__(self, directory: str, pid: Optional[int] = None):
+        self.directory = directory
+        self._fixed_pid = pid
+        self._pid = None
+        self._file: Optional[MetricsFile] = None
+        self._keys: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def _current_file(self) -> MetricsFile:
+        pid = self._fixed_pid or os.getpid()
+        if self._pid != pid:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = MetricsFile(os.path.join(self.directory, f"{pid}.db"))
+            self._pid = pid
+        return self._file
+
+    def _key(self, name: str, labels: tuple) -> str:
+        key = self._keys.get((name, labels))
+        if key is None:
+            key = self._keys[(name, labels)] = json.dumps([name, dict(labels)])
+        return key
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._current_file().add(self._key(name, labels), amount)
+
+    def set(self, name: str, labels: tuple, value: float) -> None:
+        with self._lock:
+            self._current_file().set(self._key(name, labels), value)
+
+    def observe(
+        self, name: str, labels: tuple, value: float, buckets=LATENCY_BUCKETS
+    ) -> None:
+        i = bisect.bisect_left(buckets, value)
+        le = str(buckets[i]) if i < len(buckets) else "+Inf"
+        with self._lock:
+            metrics_file = self._current_file()
+            metrics_file.add(self._key(name + "_bucket", labels + (("le", le),)), 1)
+            metrics_file.add(self._key(name + "_sum", labels), value)
+            metrics_file.add(self._key(name + "_count", labels), 1)
+
+    def collect(self) -> dict[tuple, float]:
+        """Sum the samples of every worker file into ``(name, labels) -> value``."""
+        totals: dict[tuple, float] = defaultdict(float)
+        if not os.path.isdir(self.directory):
+            return totals
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".db"):
+                continue
+            pid = int(filename[:-3])
+            try:
+                with open(os.path.join(self.directory, filename), "rb") as f:
+                    buf = f.read()
+            except OSError:
+                continue
+            if len(buf) < _USED.size:
+                continue
+            alive = None
+            for key, value, _ in _read_records(buf):
+                name, labels = json.loads(key)
+                if METRICS.get(name, ("",))[0] == "gauge":
+                    if alive is None:
+                        alive = _pid_alive(pid)
+                    if not alive:
+                        continue
+                totals[(name, tuple(sorted(labels.items())))] += value
+        return totals
+
+    def render(self) -> str:
+        """Render the aggregated samples in the Prometheus text format."""
+        samples: dict[str, list] = defaultdict(list)
+        for (name, labels), value in self.collect().items():
+            base = name
+            for suffix in ("_bucket", "_sum", "_count"):
+                if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+                    base = name[: -len(suffix)]
+            samples[base].append((name, labels, value))
+
+        lines = []
+        for base in sorted(samples):
+            kind, help_text = METRICS.get(base, ("untyped", ""))
+            lines.append(f"# HELP {base} {help_text}")
+            lines.append(f"# TYPE {base} {kind}")
+            if kind == "histogram":
+                lines.extend(_render_histogram(base, samples[base]))
+            else:
+                for name, labels, value in sorted(samples[base]):
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(base: str, samples: list) -> list[str]:
+    """Turn per-bucket counts into cumulative ``le`` buckets per label set."""
+    series: dict[tuple, dict] = defaultdict(lambda: {"buckets": {}})
+    for name, labels, value in samples:
+        if name.endswith("_bucket"):
+            le = dict(labels)["le"]
+            rest = tuple(kv for kv in labels if kv[0] != "le")
+            series[rest]["buckets"][le] = value
+        else:
+            series[labels][name[len(base) + 1 :]] = value
+
+    lines = []
+    for labels in sorted(series):
+        data = series[labels]
+        cumulative = 0.0
+        for bound in LATENCY_BUCKETS + ("+Inf",):
+            cumulative += data["buckets"].get(str(bound), 0.0)
+            lines.append(
+                f"{base}_bucket{_format_labels(labels + (('le', str(bound)),))} "
+                f"{_format_value(cumulative)}"
+            )
+        lines.append(
+            f"{base}_sum{_format_labels(labels)} {_format_value(data.get('sum', 0.0))}"
+        )
+        lines.append(
+            f"{base}_count{_format_labels(labels)} {_format_value(data.get('count', 0.0))}"
+        )
+    return lines
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+metrics = Metrics(os.path.join(settings.SHARED_STATE_DIR, "metrics"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Route templates keep the label set bounded; raw paths would not
+            path = getattr(route, "path", None) or "unmatched"
+            labels = (("method", scope["method"]), ("route", path))
+            metrics.inc("http_requests_total", labels + (("status", str(status)),))
+            metrics.observe(
+                "http_request_duration_seconds", labels, time.perf_counter() - start
+            )
+
+
+class _TimedCheckout:
+    """
+    Pool mixin recording how long each checkout waited for a connection and
+    publishing the pool gauges once a checkout or checkin has completed.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if settings.METRICS_ENABLED:
+                metrics.observe(
+                    "db_pool_wait_seconds",
+                    (("pool", self.logging_name or "default"),),
+                    time.perf_counter() - start,
+                )
+                self._publish()
+
+    def _do_return_conn(self, record):
+        try:
+            super()._do_return_conn(record)
+        finally:
+            if settings.METRICS_ENABLED:
+                self._publish()
+
+    def _publish(self):
+        labels = (("pool", self.logging_name or "default"),)
+        metrics.set("db_pool_checked_out", labels, self.checkedout())
+        metrics.set("db_pool_overflow", labels, max(0, self.overflow()))
+        metrics.set("db_pool_size", labels, self.size())
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Publish per-statement timings of ``engine`` by statement type."""
+
+    # The start time lives on the statement's own execution context, so a
+    # statement that fails before after_cursor_execute leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        if settings.METRICS_ENABLED:
+            kind = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+            metrics.observe(
+                "db_query_duration_seconds", (("statement", kind),), elapsed
+            )
@@ -1,16 +1,93 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Optional, Union
 
+from sqlalchemy import JSON, Column
 from sqlmodel import Field, SQLModel
 
+# Both text columns are VARCHAR(255) on MariaDB. Longer values must fail
+# validation: INSERT IGNORE would otherwise truncate them with a warning.
+MAX_TEXT_LENGTH = 255
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 
 class WordBase(SQLModel):
-    word: str = Field(unique=True, index=True)
-    definition: str
+    word: str = Field(unique=True, index=True, max_length=MAX_TEXT_LENGTH)
+    definition: str = Field(max_length=MAX_TEXT_LENGTH)
 
 
 class DictionaryEntry(WordBase, table=True):
+    # Never reuse the id of a deleted row on SQLite, ETags are built from it
+    __table_args__ = {"sqlite_autoincrement": True}
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Bumped by every overwrite; with id it forms the entry's ETag
+    version: int = Field(default=1)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 
 class WordResponse(WordBase):
     pass
+
+
+class DefinitionUpdate(SQLModel):
+    definition: str = Field(max_length=MAX_TEXT_LENGTH)
+
+
+class BatchLookupRequest(SQLModel):
+    words: list[str]
+
+
+class BatchLookupResponse(SQLModel):
+    entries: dict[str, str]
+    missing: list[str]
+
+
+class SearchResponse(SQLModel):
+    prefix: str
+    words: list[str]
+
+
+class BulkIngestResult(SQLModel):
+    received: int
+    written: int
+    rejected: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class Catalog(SQLModel, table=True):
+    """A price catalog for basket totals, replaced as a whole on upload."""
+
+    id: str = Field(primary_key=True, max_length=64)
+    costs: dict[str, float] = Field(sa_column=Column(JSON, nullable=False))
+    # Bumped by every upload; echoed with totals so callers can tell which
+    # catalog priced their baskets
+    version: int = Field(default=1)
+    updated_at: datetime = Field(default_factory=utcnow)
+
+
+class CatalogUpload(SQLModel):
+    costs: dict[str, float]
+
+
+class CatalogInfo(SQLModel):
+    id: str
+    version: int
+    items: int
+
+
+class BasketTotalsRequest(SQLModel):
+    baskets: list[list[str]]
+    # One rate for every basket, or one per basket
+    tax: Union[float, list[float]]
+    # Price with exactly this catalog version, or fail with 409
+    version: Optional[int] = None
+
+
+class BasketTotalsResponse(SQLModel):
+    id: str
+    version: int
+    totals: list[float]
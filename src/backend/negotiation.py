@@ -0,0 +1,54 @@
+"""Proactive negotiation over Accept and Accept-Encoding headers."""
+
+from typing import Optional, Sequence
+
+
+def parse_accept(header: str) -> list[tuple[str, float]]:
+    """Split an Accept or Accept-Encoding header into ``(value, q)`` pairs."""
+    accepted = []
+    for part in header.split(","):
+        value, *params = part.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        accepted.append((value, q))
+    return accepted
+
+
+def _specificity(pattern: str, value: str) -> int:
+    """How closely ``pattern`` matches ``value``: -1 (not at all) up to 2."""
+    if pattern == value:
+        return 2
+    if pattern.endswith("/*") and value.startswith(pattern[:-1]):
+        return 1
+    if pattern in ("*", "*/*"):
+        return 0
+    return -1
+
+
+def choose(header: Optional[str], offered: Sequence[str]) -> Optional[str]:
+    """
+    The offered value the client ranks highest, or None if it accepts none.
+
+    Each value gets the q of its most specific match, so ``*;q=0, gzip`` still
+    accepts gzip; ties go to the value offered first.
+    """
+    accepted = parse_accept(header or "")
+    best, best_q = None, 0.0
+    for value in offered:
+        q, specificity = 0.0, -1
+        for pattern, pattern_q in accepted:
+            match = _specificity(pattern, value)
+            if match > specificity:
+                q, specificity = pattern_q, match
+        if q > best_q:
+            best, best_q = value, q
+    return best
@@ -0,0 +1,57 @@
+"""Keyset (cursor) pagination helpers for listing dictionary entries."""
+
+import base64
+import binascii
+from typing import Optional
+
+from fastapi import Response
+from sqlmodel import select
+
+from src.backend.models import DictionaryEntry
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(last_id: int) -> str:
+    """Turn the last id of a page into an opaque ``next_cursor`` token."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def page_statement(
+    limit: int,
+    skip: int = 0,
+    after_id: Optional[int] = None,
+    columns: Optional[tuple] = None,
+):
+    """
+    Select one page of entries (or only ``columns`` of them) ordered by
+    primary key.
+
+    With ``after_id`` the page starts right after that id, so the DB seeks
+    straight into the primary key index instead of scanning and discarding
+    ``skip`` rows like OFFSET does.
+    """
+    statement = select(*columns) if columns else select(DictionaryEntry)
+    statement = statement.order_by(DictionaryEntry.id).limit(limit)
+    if after_id is not None:
+        return statement.where(DictionaryEntry.id > after_id)
+    return statement.offset(skip)
+
+
+def set_next_cursor(response: Response, rows: list, limit: int) -> None:
+    """Advertise the next page in ``X-Next-Cursor`` when this one is full."""
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
@@ -0,0 +1,71 @@
+"""Startup profiling helpers: process age, first-request timing, import costs."""
+
+import logging
+import os
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+_MODULE_LOADED = time.monotonic()
+
+
+def process_age() -> float:
+    """
+    Seconds since this process started (for a gunicorn worker: since it was
+    forked). Read from /proc on Linux; elsewhere this falls back to the time
+    since this module was imported.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces, so split after its ")"
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return uptime - started
+    except (OSError, IndexError, ValueError):
+        return time.monotonic() - _MODULE_LOADED
+
+
+class FirstRequestTimer:
+    """ASGI middleware logging how long after process start the first request finished."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+        if not self.done and scope["type"] == "http":
+            self.done = True
+            logger.info(
+                f"Startup: first request ({scope['path']}) served "
+                f"{process_age():.3f}s after process start"
+            )
+
+
+class ImportCost(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> list[ImportCost]:
+    """Parse the ``python -X importtime`` report into one entry per module."""
+    costs = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        costs.append(ImportCost(module.strip(), int(self_us), int(cumulative_us)))
+    return costs
+
+
+def by_package(costs: list[ImportCost]) -> dict[str, int]:
+    """Sum the self time of every module per top-level package, costliest first."""
+    totals: dict[str, int] = {}
+    for cost in costs:
+        package = cost.module.split(".")[0]
+        totals[package] = totals.get(package, 0) + cost.self_us
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
@@ -0,0 +1,161 @@
+"""
+Database startup: wait for the DB with backoff, then create the schema once.
+
+Run ``python -m src.backend.schema`` as a one-shot step (a Job, an init
+container or a deploy script) and set ``SCHEMA_INIT_MODE=skip`` so workers
+never issue DDL. With the default ``leader`` mode the first worker of a pod
+creates the schema under a file lock and the others skip it.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import Engine, inspect, text, update
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+from src.backend.config import settings
+from src.backend.models import DictionaryEntry, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(
+    attempt: int, base: float, maximum: float, rng: Callable[[], float] = random.random
+) -> float:
+    """Exponential backoff with "equal jitter": half fixed, half random."""
+    delay = min(maximum, base * 2**attempt)
+    return delay / 2 + rng() * delay / 2
+
+
+def _ping(engine: Engine) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def wait_for_db(
+    engine: Engine, max_attempts: int, base_delay: float, max_delay: float
+) -> int:
+    """
+    Retry ``SELECT 1`` until the DB answers, sleeping without blocking the
+    event loop. The jitter keeps the workers of every pod from retrying in
+    lockstep against a DB that is just coming up. Returns the attempts used.
+    """
+    for attempt in range(max_attempts):
+        try:
+            await asyncio.to_thread(_ping, engine)
+            return attempt + 1
+        except OperationalError:
+            if attempt == max_attempts - 1:
+                logger.error("Could not connect to database after max retries.")
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning(
+                f"Database not ready (attempt {attempt + 1}/{max_attempts}), "
+                f"retrying in {delay:.2f}s..."
+            )
+            await asyncio.sleep(delay)
+
+
+def _schema_fingerprint(engine: Engine) -> str:
+    tables = ",".join(
+        f"{name}({','.join(table.columns.keys())})"
+        for name, table in sorted(SQLModel.metadata.tables.items())
+    )
+    return hashlib.sha256(f"{engine.url}|{tables}".encode()).hexdigest()
+
+
+# Columns added to existing tables after their first release. create_all only
+# creates missing tables, so these are added with ALTER TABLE.
+_ADDED_COLUMNS = {
+    "version": "INTEGER NOT NULL DEFAULT 1",
+    "updated_at": "DATETIME NULL",
+}
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    table = DictionaryEntry.__table__
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    missing = [name for name in _ADDED_COLUMNS if name not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        for name in missing:
+            logger.info(f"Adding column {table.name}.{name}")
+            column = f"{name} {_ADDED_COLUMNS[name]}"
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column}"))
+        if "updated_at" in missing:
+            conn.execute(
+                update(table)
+                .where(table.c.updated_at.is_(None))
+                .values(updated_at=utcnow())
+            )
+
+
+def create_schema(engine: Engine) -> None:
+    SQLModel.metadata.create_all(engine)
+    _add_missing_columns(engine)
+
+
+def ensure_schema(engine: Engine, state_dir: Optional[str] = None) -> bool:
+    """
+    Create the schema unless another worker of this pod already did.
+
+    Workers serialize on a lock file in ``state_dir`` and the leader leaves a
+    marker naming the DB and tables it created, so the others skip
+    ``create_all`` and its reflection queries. Returns whether this call ran
+    ``create_all``.
+    """
+    state_dir = state_dir or settings.SHARED_STATE_DIR
+    if fcntl is None:
+        create_schema(engine)
+        return True
+
+    os.makedirs(state_dir, exist_ok=True)
+    marker = os.path.join(state_dir, "schema.done")
+    fingerprint = _schema_fingerprint(engine)
+    with open(os.path.join(state_dir, "schema.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(marker):
+                with open(marker) as f:
+                    if f.read() == fingerprint:
+                        return False
+            create_schema(engine)
+            with open(marker, "w") as f:
+                f.write(fingerprint)
+            return True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    from src.backend.database import get_engine
+
+    engine = get_engine()
+    asyncio.run(
+        wait_for_db(
+            engine,
+            settings.DB_CONNECT_MAX_ATTEMPTS,
+            settings.DB_CONNECT_BACKOFF_BASE,
+            settings.DB_CONNECT_BACKOFF_MAX,
+        )
+    )
+    start = time.perf_counter()
+    create_schema(engine)
+    logger.info(f"Schema created in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
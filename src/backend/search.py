@@ -0,0 +1,342 @@
+"""In-memory prefix and "did you mean" index over dictionary words."""
+
+import bisect
+import heapq
+import logging
+import string
+import threading
+import time
+from array import array
+from itertools import accumulate, islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from sqlmodel import Session, select
+
+from src.backend.cache import GenerationTable, lookup_cache
+from src.backend.config import settings
+from src.backend.database import get_engine
+from src.backend.models import DictionaryEntry
+from src.backend.singleflight import AsyncSingleFlight
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_SEPARATOR = "\x00"
+
+
+class SortedWords:
+    """
+    Immutable sorted word array packed into one string plus an offset array.
+
+    A million short words take ~12 MB this way instead of the ~70 MB of a
+    ``list[str]``, which matters with eight workers in a 512Mi pod.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        words = sorted(set(words))
+        self._blob = _SEPARATOR.join(words)
+        self._offsets = array("I", accumulate((len(w) + 1 for w in words), initial=0))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._blob[self._offsets[i] : self._offsets[i + 1] - 1]
+
+    def __contains__(self, word: str) -> bool:
+        i = bisect.bisect_left(self, word)
+        return i < len(self) and self[i] == word
+
+    def iter_from(self, word: str) -> Iterator[str]:
+        for i in range(bisect.bisect_left(self, word), len(self)):
+            yield self[i]
+
+
+class WordIndex:
+    """
+    Sorted word index answering prefix queries and 404 suggestions.
+
+    Built lazily from the DB, then kept current by the write endpoints
+    through ``add``/``remove``: new words go to a small sorted delta list and
+    deletions to a tombstone set, and both are folded into the packed base
+    array once they grow past ``compact_after``. Writes from other workers
+    are detected through the shared write counter of the lookup cache's
+    generation table, which triggers a rebuild at most every
+    ``min_rebuild_interval`` seconds. That counter is per pod, so the index is
+    also rebuilt once it is ``max_age`` seconds old. Only the first build
+    runs in a request, which waits for it. Rebuilds run one at a time on a
+    background thread with their own session, streaming the words
+    ``fetch_size`` rows at a time, while queries keep using the current index
+    until the new one is swapped in with the writes made meanwhile replayed.
+    """
+
+    def __init__(
+        self,
+        generations: GenerationTable,
+        min_rebuild_interval: float,
+        max_age: float = 0.0,
+        compact_after: int = 1000,
+        fetch_size: int = 10_000,
+    ):
+        self.generations = generations
+        self.min_rebuild_interval = min_rebuild_interval
+        self.max_age = max_age
+        self.compact_after = compact_after
+        self.fetch_size = fetch_size
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._async_flight = AsyncSingleFlight("word_index")
+        self._base: Optional[SortedWords] = None
+        self._added: list[str] = []
+        self._deleted: set[str] = set()
+        self._expected_writes = 0
+        self._built_at = 0.0
+        # Writes made by this worker while a build runs, replayed onto its result
+        self._replay: Optional[list[tuple[bool, str]]] = None
+        self._rebuilder: Optional[threading.Thread] = None
+
+    @property
+    def built(self) -> bool:
+        return self._base is not None
+
+    def reset(self) -> None:
+        """Forget the index; the next query rebuilds it from the DB."""
+        with self._lock:
+            self._base = None
+            self._added, self._deleted = [], set()
+
+    def _needs_build(self) -> bool:
+        if self._base is None:
+            return True
+        age = time.monotonic() - self._built_at
+        if self.max_age > 0 and age >= self.max_age:
+            return True
+        return (
+            self.generations.writes() != self._expected_writes
+            and age >= self.min_rebuild_interval
+        )
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._needs_build():
+            return
+        if self._base is not None:
+            self._rebuild_in_background(db.get_bind())
+            return
+        with self._build_lock:
+            # Whoever held the lock may have just built it
+            if self._base is None:
+                self._build(lambda: db.exec(self._statement()))
+
+    async def ensure_built_async(self, db: "AsyncSession") -> None:
+        """``ensure_built`` for the async handlers, sharing one build per loop."""
+
+        async def build():
+            if self._base is None:
+                words = set()
+                writes = self._begin_build()
+                try:
+                    async for word in await db.stream_scalars(self._statement()):
+                        words.add(word)
+                except BaseException:
+                    self._abort_build()
+                    raise
+                self._install(SortedWords(words), writes)
+
+        if not self._needs_build():
+            return
+        if self._base is not None:
+            # Async mode keeps the sync engine for search
+            self._rebuild_in_background(get_engine())
+            return
+        await self._async_flight.do("build", build)
+
+    def _statement(self):
+        return select(DictionaryEntry.word).execution_options(yield_per=self.fetch_size)
+
+    def _rebuild_in_background(self, bind: "Engine") -> None:
+        if not self._build_lock.acquire(blocking=False):
+            return  # already rebuilding
+
+        def rebuild():
+            try:
+                with Session(bind=bind) as session:
+                    self._build(lambda: session.exec(self._statement()))
+            except Exception:
+                logger.exception("Rebuilding the word index failed")
+                with self._lock:
+                    # Retry after min_rebuild_interval rather than on every query
+                    self._built_at = time.monotonic()
+            finally:
+                self._build_lock.release()
+
+        self._rebuilder = threading.Thread(
+            target=rebuild, name="word-index-rebuild", daemon=True
+        )
+        self._rebuilder.start()
+
+    def _build(self, load) -> None:
+        writes = self._begin_build()
+        try:
+            base = SortedWords(load())
+        except BaseException:
+            self._abort_build()
+            raise
+        self._install(base, writes)
+
+    def _begin_build(self) -> int:
+        with self._lock:
+            self._replay = []
+            # Read the counter first so writes racing the load cause a rebuild
+            return self.generations.writes()
+
+    def _abort_build(self) -> None:
+        with self._lock:
+            self._replay = None
+
+    def _install(self, base: SortedWords, writes: int) -> None:
+        with self._lock:
+            replay, self._replay = self._replay or [], None
+            self._base = base
+            self._added, self._deleted = [], set()
+            self._expected_writes = writes + len(replay)
+            self._built_at = time.monotonic()
+            for added, word in replay:
+                if added:
+                    self._add(word)
+                else:
+                    self._remove(word)
+
+    def add(self, word: str) -> None:
+        """Record a word created by this worker."""
+        with self._lock:
+            self._expected_writes += 1
+            if self._replay is not None:
+                self._replay.append((True, word))
+            if self._base is not None:
+                self._add(word)
+
+    def remove(self, word: str) -> None:
+        """Record a word deleted by this worker."""
+        with self._lock:
+            self._expected_writes += 1
+            if self._replay is not None:
+                self._replay.append((False, word))
+            if self._base is not None:
+                self._remove(word)
+
+    def _add(self, word: str) -> None:
+        if word in self._deleted:
+            self._deleted.discard(word)
+        elif word not in self._base:
+            i = bisect.bisect_left(self._added, word)
+            if i == len(self._added) or self._added[i] != word:
+                self._added.insert(i, word)
+        self._maybe_compact()
+
+    def _remove(self, word: str) -> None:
+        i = bisect.bisect_left(self._added, word)
+        if i < len(self._added) and self._added[i] == word:
+            del self._added[i]
+        elif word in self._base:
+            self._deleted.add(word)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._added) + len(self._deleted) > self.compact_after:
+            self._base = SortedWords(self._iter_from(""))
+            self._added, self._deleted = [], set()
+
+    def _iter_from(self, word: str) -> Iterator[str]:
+        base = (w for w in self._base.iter_from(word) if w not in self._deleted)
+        added = islice(self._added, bisect.bisect_left(self._added, word), None)
+        return heapq.merge(base, added)
+
+    def prefix(self, prefix: str, limit: int) -> list[str]:
+        """Return up to ``limit`` words starting with ``prefix`` in sorted order."""
+        with self._lock:
+            matches = []
+            for word in self._iter_from(prefix):
+                if not word.startswith(prefix) or len(matches) >= limit:
+                    break
+                matches.append(word)
+            return matches
+
+    def __contains__(self, word: str) -> bool:
+        with self._lock:
+            if word in self._deleted:
+                return False
+            i = bisect.bisect_left(self._added, word)
+            if i < len(self._added) and self._added[i] == word:
+                return True
+            return word in self._base
+
+    def suggest(self, word: str, limit: int) -> list[str]:
+        """
+        "Did you mean" candidates for a word that was not found: every indexed
+        word one edit away (deletion, transposition, substitution, insertion),
+        then completions of ever shorter prefixes of ``word``. Edits are checked
+        by binary search, so this costs a few thousand probes instead of an
+        edit-distance computation against every word.
+        """
+        suggestions = sorted(w for w in _edits1(word) if w in self)[:limit]
+        for end in range(len(word), 0, -1):
+            if len(suggestions) >= limit:
+                break
+            for match in self.prefix(word[:end], limit):
+                if match not in suggestions and match != word:
+                    suggestions.append(match)
+                    if len(suggestions) >= limit:
+                        break
+            if suggestions:
+                break
+        return suggestions
+
+
+def _edits1(word: str) -> set[str]:
+    letters = set(string.ascii_lowercase) | set(word.lower())
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = [a + b[1:] for a, b in splits if b]
+    transposes = [a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1]
+    replaces = [a + c + b[1:] for a, b in splits if b for c in letters]
+    inserts = [a + c + b for a, b in splits for c in letters]
+    return set(deletes + transposes + replaces + inserts) - {word}
+
+
+def not_found_detail(db: Session, word: str, suggest: bool = False) -> str:
+    """
+    The 404 detail for ``word``, with "did you mean" suggestions when the
+    client asked for them. They cost milliseconds per 404, so plain lookups
+    (and cached 404s) don't pay for them.
+    """
+    if suggest and settings.SEARCH_SUGGESTIONS > 0:
+        word_index.ensure_built(db)
+    return _detail(word, suggest)
+
+
+async def not_found_detail_async(
+    db: "AsyncSession", word: str, suggest: bool = False
+) -> str:
+    """``not_found_detail`` for the async handlers."""
+    if suggest and settings.SEARCH_SUGGESTIONS > 0:
+        await word_index.ensure_built_async(db)
+    return _detail(word, suggest)
+
+
+def _detail(word: str, suggest: bool) -> str:
+    detail = f"Can't find entry for {word}"
+    if suggest and settings.SEARCH_SUGGESTIONS > 0:
+        suggestions = word_index.suggest(word, settings.SEARCH_SUGGESTIONS)
+        if suggestions:
+            detail += f". Did you mean: {', '.join(suggestions)}?"
+    return detail
+
+
+word_index = WordIndex(
+    generations=lookup_cache.generations,
+    min_rebuild_interval=settings.SEARCH_INDEX_MIN_REBUILD_INTERVAL,
+    max_age=settings.SEARCH_INDEX_MAX_AGE,
+    fetch_size=settings.SEARCH_INDEX_FETCH_SIZE,
+)
@@ -0,0 +1,82 @@
+"""Fast encoding of entry rows, bypassing per-row model validation."""
+
+from typing import Callable, NamedTuple, Optional
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePack is offered only when installed
+    msgpack = None
+
+from pydantic import TypeAdapter
+
+from src.backend.models import DictionaryEntry
+from src.backend.negotiation import choose
+
+# Columns selected by the fast path: no ORM objects, no identity map. The
+# version only feeds the page's ETag.
+ENTRY_COLUMNS = (
+    DictionaryEntry.id,
+    DictionaryEntry.word,
+    DictionaryEntry.definition,
+    DictionaryEntry.version,
+)
+
+# Built once at import. It uses the same pydantic-core JSON serializer that
+# FastAPI applies to ``response_model``, so the bytes match the regular path.
+_entries_adapter = TypeAdapter(list[dict[str, str]])
+
+
+def encode_entries(rows) -> bytes:
+    """Encode rows of ``ENTRY_COLUMNS`` exactly like ``list[WordResponse]``."""
+    return _entries_adapter.dump_json(
+        [{"word": row.word, "definition": row.definition} for row in rows]
+    )
+
+
+_columns_adapter = TypeAdapter(dict[str, list[str]])
+
+
+def encode_columnar(rows) -> bytes:
+    """Encode rows column-wise: ``{"words": [...], "definitions": [...]}``."""
+    return _columns_adapter.dump_json(
+        {
+            "words": [row.word for row in rows],
+            "definitions": [row.definition for row in rows],
+        }
+    )
+
+
+def encode_msgpack(rows) -> bytes:
+    """Encode rows as a MessagePack array of the same maps as the JSON output."""
+    return msgpack.packb(
+        [{"word": row.word, "definition": row.definition} for row in rows]
+    )
+
+
+class EntryFormat(NamedTuple):
+    media_type: str
+    # Appended to the page ETag: each representation needs its own validator
+    tag: str
+    encode: Callable
+
+
+JSON_FORMAT = EntryFormat("application/json", "", encode_entries)
+COLUMNAR_FORMAT = EntryFormat(
+    "application/vnd.dictionary.columnar+json", "columnar", encode_columnar
+)
+MSGPACK_FORMAT = EntryFormat("application/msgpack", "msgpack", encode_msgpack)
+
+# Offered through Accept, JSON first so that */* keeps getting JSON
+ENTRY_FORMATS = {
+    fmt.media_type: fmt
+    for fmt in (JSON_FORMAT, COLUMNAR_FORMAT, MSGPACK_FORMAT)
+    if fmt is not MSGPACK_FORMAT or msgpack is not None
+}
+
+
+def negotiate_entry_format(accept: Optional[str]) -> EntryFormat:
+    """The format of ``ENTRY_FORMATS`` the client prefers, JSON by default."""
+    if not accept:
+        return JSON_FORMAT
+    media_type = choose(accept, list(ENTRY_FORMATS))
+    return ENTRY_FORMATS[media_type] if media_type else JSON_FORMAT
@@ -0,0 +1,123 @@
+"""Coalesce concurrent identical lookups into one in-flight DB query."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from src.backend.config import settings
+from src.backend.metrics import metrics
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Per-worker duplicate call suppression for the sync (threadpool) handlers.
+
+    The first caller of ``do`` for a key runs ``fn``; callers arriving while
+    it is still running wait for it and get the same result or exception.
+    Nothing is remembered once the call returns, so this only shares work
+    between requests that overlap in time; the lookup cache covers the rest.
+    """
+
+    def __init__(self, name: str = "lookup"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            _count_coalesced(self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+# Result handed to the waiters of a leader that was cancelled
+_ABANDONED = object()
+
+
+class AsyncSingleFlight:
+    """
+    ``SingleFlight`` for coroutines sharing one event loop. A leader that is
+    cancelled (client gone, timeout, shutdown) doesn't pass the cancellation
+    on: its waiters retry, and the first of them runs ``fn`` in its place.
+    """
+
+    def __init__(self, name: str = "lookup"):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            _count_coalesced(self.name)
+            # shield: one waiter being cancelled must not cancel the others
+            result = await asyncio.shield(future)
+            if result is not _ABANDONED:
+                return result
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Only this task was cancelled, not the ones waiting for it
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so an unobserved failure isn't logged as such
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+def _count_coalesced(name: str) -> None:
+    if settings.METRICS_ENABLED:
+        metrics.inc("singleflight_coalesced_total", (("call", name),))
+
+
+lookup_flight = SingleFlight()
+async_lookup_flight = AsyncSingleFlight()
@@ -0,0 +1,255 @@
+"""A memory-compact variant of ``Dictionary`` that can be frozen to an mmap file."""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterator
+
+from src.exercises.dictionary import not_found
+
+# File layout written by ``CompactDictionary.freeze``: this header, then the
+# hashes, key offsets, value offsets, slots, key bytes and value bytes, each
+# section padded to 8 bytes. Arrays are stored in native byte order, which the
+# magic records.
+_MAGIC = b"CDICT1" + (b"LE" if sys.byteorder == "little" else b"BE")
+_HEADER = struct.Struct("<8sQQQQ")  # magic, entries, slots, key bytes, value bytes
+
+_EMPTY = -1
+_MIN_SLOTS = 8
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+class _HashIndex:
+    """
+    Open-addressing lookup shared by the mutable and the frozen variant.
+
+    ``_slots`` holds entry numbers (or -1) at ``crc32(key) & mask`` with linear
+    probing; ``_hashes`` keeps each entry's CRC so most probes are rejected
+    without comparing key bytes. CRC32 rather than ``hash()``, which is
+    salted per process, so the frozen index stays valid in other processes.
+    """
+
+    def _find(self, key: bytes, key_hash: int) -> int:
+        slots, mask = self._slots, len(self._slots) - 1
+        i = key_hash & mask
+        while True:
+            entry = slots[i]
+            if entry == _EMPTY:
+                return _EMPTY
+            if self._hashes[entry] == key_hash and self._key(entry) == key:
+                return entry
+            i = (i + 1) & mask
+
+    def _key(self, entry: int) -> bytes:
+        # A memoryview slice when frozen: compared to bytes without a copy
+        offsets = self._key_offsets
+        return self._keys[offsets[entry] : offsets[entry + 1]]
+
+    def look(self, word: str) -> str:
+        """
+        Look up a word in the dictionary.
+
+        Returns:
+            The definition if found, or Can't find entry for {word}.
+        """
+        key = word.encode("utf-8")
+        entry = self._find(key, zlib.crc32(key))
+        if entry == _EMPTY:
+            return not_found(word)
+        return str(self._value(entry), "utf-8")
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode("utf-8")
+        return self._find(key, zlib.crc32(key)) != _EMPTY
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """Entries in insertion order."""
+        for entry in range(len(self)):
+            yield str(self._key(entry), "utf-8"), str(self._value(entry), "utf-8")
+
+
+class CompactDictionary(_HashIndex):
+    """
+    ``Dictionary`` storing words and definitions in two contiguous UTF-8
+    buffers instead of a ``dict`` of ``str`` objects.
+
+    An entry costs its encoded bytes plus about 30 bytes of offsets, hash and
+    index slots, against well over 100 bytes of object and bucket overhead
+    per entry in a ``dict[str, str]``. Overwriting a word appends the new
+    definition and leaves the old bytes unused until ``freeze``.
+    """
+
+    def __init__(self):
+        self._keys = bytearray()
+        self._values = bytearray()
+        self._key_offsets = array("Q", [0])
+        self._value_starts = array("Q")
+        self._value_lengths = array("I")
+        self._hashes = array("I")
+        self._slots = array("i", [_EMPTY]) * _MIN_SLOTS
+
+    def newentry(self, word: str, definition: str) -> None:
+        """
+        Add a new word and its definition to the dictionary.
+
+        Args:
+            word: The word to add
+            definition: The definition of the word
+        """
+        key = word.encode("utf-8")
+        value = definition.encode("utf-8")
+        key_hash = zlib.crc32(key)
+        entry = self._find(key, key_hash)
+        if entry == _EMPTY:
+            entry = len(self._hashes)
+            self._keys += key
+            self._key_offsets.append(len(self._keys))
+            self._hashes.append(key_hash)
+            self._value_starts.append(0)
+            self._value_lengths.append(0)
+            self._insert_slot(entry, key_hash)
+            # Keep the load factor at most 1/2 so probe chains stay short
+            if 2 * len(self._hashes) > len(self._slots):
+                self._resize(2 * len(self._slots))
+        self._value_starts[entry] = len(self._values)
+        self._value_lengths[entry] = len(value)
+        self._values += value
+
+    def _insert_slot(self, entry: int, key_hash: int) -> None:
+        slots, mask = self._slots, len(self._slots) - 1
+        i = key_hash & mask
+        while slots[i] != _EMPTY:
+            i = (i + 1) & mask
+        slots[i] = entry
+
+    def _resize(self, size: int) -> None:
+        self._slots = array("i", [_EMPTY]) * size
+        for entry, key_hash in enumerate(self._hashes):
+            self._insert_slot(entry, key_hash)
+
+    def _value(self, entry: int) -> bytes:
+        start = self._value_starts[entry]
+        return self._values[start : start + self._value_lengths[entry]]
+
+    def nbytes(self) -> int:
+        """Bytes held by the buffers and arrays, excluding unused capacity."""
+        return (
+            len(self._keys)
+            + len(self._values)
+            + sum(
+                a.itemsize * len(a)
+                for a in (
+                    self._key_offsets,
+                    self._value_starts,
+                    self._value_lengths,
+                    self._hashes,
+                    self._slots,
+                )
+            )
+        )
+
+    def freeze(self, path: str) -> "FrozenDictionary":
+        """
+        Write an immutable copy to ``path`` and open it.
+
+        Definitions are rewritten in entry order, dropping the ones replaced
+        by overwrites. The file is written next to ``path`` and renamed into
+        place, so readers never see a partial file.
+        """
+        values = bytearray()
+        value_offsets = array("Q", [0])
+        for entry in range(len(self)):
+            values += self._value(entry)
+            value_offsets.append(len(values))
+
+        sections = [
+            self._hashes.tobytes(),
+            self._key_offsets.tobytes(),
+            value_offsets.tobytes(),
+            self._slots.tobytes(),
+            bytes(self._keys),
+            bytes(values),
+        ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC, len(self), len(self._slots), len(self._keys), len(values)
+                )
+            )
+            for section in sections:
+                f.write(section)
+                f.write(b"\0" * _pad(len(section)))
+        os.replace(tmp_path, path)
+        return FrozenDictionary(path)
+
+
+class FrozenDictionary(_HashIndex):
+    """
+    Read-only ``CompactDictionary`` served straight from an mmap'ed file.
+
+    Opening it only maps the file and reads the header, whatever its size;
+    pages are faulted in by lookups and shared with every other process
+    mapping the same file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, entries, slots, key_bytes, value_bytes = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a frozen dictionary for this platform")
+
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+
+        def section(size: int, fmt: str = "B") -> memoryview:
+            nonlocal offset
+            part = view[offset : offset + size]
+            offset += size + _pad(size)
+            return part.cast(fmt) if fmt != "B" else part
+
+        self._hashes = section(4 * entries, "I")
+        self._key_offsets = section(8 * (entries + 1), "Q")
+        self._value_offsets = section(8 * (entries + 1), "Q")
+        self._slots = section(4 * slots, "i")
+        self._keys = section(key_bytes)
+        self._values = section(value_bytes)
+        self._views = [
+            self._hashes,
+            self._key_offsets,
+            self._value_offsets,
+            self._slots,
+            self._keys,
+            self._values,
+            view,
+        ]
+
+    def _value(self, entry: int) -> bytes:
+        offsets = self._value_offsets
+        return self._values[offsets[entry] : offsets[entry + 1]]
+
+    def newentry(self, word: str, definition: str) -> None:
+        raise TypeError("A frozen dictionary is read-only")
+
+    def close(self) -> None:
+        # The memoryviews pin the mapping, so release them first
+        for view in self._views:
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
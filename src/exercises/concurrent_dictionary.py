@@ -0,0 +1,95 @@
+"""A thread-safe variant of ``Dictionary`` whose readers never block."""
+
+import threading
+from collections import defaultdict
+from typing import Iterable
+
+from src.exercises.dictionary import not_found
+
+
+class ConcurrentDictionary:
+    """
+    ``Dictionary`` safe to share between threads, including on free-threaded
+    CPython builds.
+
+    Words are spread over ``stripes`` dicts by hash. A dict is never changed
+    once published: a writer takes its stripe's lock, copies the stripe,
+    applies the change and swaps the copy in with one reference assignment.
+    Readers just pick up the current stripe, so they take no lock and can't
+    observe a dict in the middle of an update or a resize; writers to
+    different stripes don't contend.
+
+    A single ``newentry`` copies one stripe, about ``len / stripes`` entries,
+    which suits read-mostly tables. ``newentries`` pays that copy once per
+    stripe for the whole batch.
+    """
+
+    def __init__(self, stripes: int = 1024):
+        if stripes < 1 or stripes & (stripes - 1):
+            raise ValueError("stripes must be a power of two")
+        self._mask = stripes - 1
+        self._stripes: list[dict[str, str]] = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def newentry(self, word: str, definition: str) -> None:
+        """
+        Add a new word and its definition to the dictionary.
+
+        Args:
+            word: The word to add
+            definition: The definition of the word
+        """
+        self._publish(hash(word) & self._mask, ((word, definition),))
+
+    def newentries(self, entries: Iterable[tuple[str, str]]) -> None:
+        """
+        Add many ``(word, definition)`` pairs, later pairs overwriting earlier
+        ones for the same word. Each stripe is copied and swapped once, but
+        the batch as a whole is not atomic: readers may see some stripes
+        updated before others.
+        """
+        by_stripe = defaultdict(list)
+        mask = self._mask
+        for word, definition in entries:
+            by_stripe[hash(word) & mask].append((word, definition))
+        for stripe, pairs in by_stripe.items():
+            self._publish(stripe, pairs)
+
+    def _publish(self, stripe: int, pairs) -> None:
+        with self._locks[stripe]:
+            updated = self._stripes[stripe].copy()
+            updated.update(pairs)
+            self._stripes[stripe] = updated
+
+    def look(self, word: str) -> str:
+        """
+        Look up a word in the dictionary without taking any lock.
+
+        Returns:
+            The definition if found, or Can't find entry for {word}.
+        """
+        definition = self._stripes[hash(word) & self._mask].get(word)
+        return not_found(word) if definition is None else definition
+
+    def look_many(self, words: Iterable[str]) -> list[str]:
+        """``look`` for each word, in order, with the lookups done in one loop."""
+        stripes, mask = self._stripes, self._mask
+        results = []
+        append = results.append
+        for word in words:
+            definition = stripes[hash(word) & mask].get(word)
+            append(not_found(word) if definition is None else definition)
+        return results
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._stripes[hash(word) & self._mask]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def snapshot(self) -> dict[str, str]:
+        """A plain dict of the entries; each stripe is as of when it was read."""
+        merged = {}
+        for stripe in list(self._stripes):
+            merged.update(stripe)
+        return merged
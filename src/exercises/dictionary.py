@@ -1,6 +1,11 @@
 """A simple dictionary class that stores word definitions."""
 
 
+def not_found(word: str) -> str:
+    """The message ``look`` returns for a word with no entry."""
+    return f"Can't find entry for {word}"
+
+
 class Dictionary:
     def __init__(self):
         self.entries = {}
@@ -28,4 +33,4 @@ class Dictionary:
         """
         if word in self.entries:
             return self.entries[word]
-        return f"Can't find entry for {word}"
+        return not_found(word)
@@ -1,3 +1,9 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+
 def nth_char(words: list[str]) -> str:
     """
     Concatenate the nth letter from each word to construct a new word.
@@ -26,14 +32,62 @@ def nth_char(words: list[str]) -> str:
         Test cases contain valid input only (non-empty array,
         and each word has enough letters).
     """
-    if len(words) == 0:
-        return ""
-
-    result = ""
+    # Joined once at the end: ``result += word[n]`` may copy the partial
+    # result for every word, which is quadratic for long lists. A word that
+    # is too short ends the result, as before.
+    chars = []
+    append = chars.append
     for n, word in enumerate(words):
         try:
-            result += word[n]
+            append(word[n])
         except IndexError:
             break
+    return "".join(chars)
+
+
+def iter_nth_char(words: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the characters of ``nth_char(words)`` one at a time, for word
+    streams too long to hold in memory (e.g. lines of a file).
+    """
+    for n, word in enumerate(words):
+        try:
+            yield word[n]
+        except IndexError:
+            return
+
+
+def nth_char_batch(
+    word_lists: Iterable[list[str]],
+    processes: Optional[int] = None,
+    chunksize: int = 1024,
+) -> Iterator[str]:
+    """
+    ``nth_char`` of each list of ``word_lists``, lazily and in order.
+
+    With ``processes`` > 1 the lists are sent in chunks of ``chunksize`` to a
+    pool of worker processes. At most two chunks per process are in flight,
+    so an unbounded iterable of lists is consumed at the pace of the results.
+    Pickling the words costs about as much as the work itself, so this only
+    pays off for long lists.
+    """
+    if not processes or processes <= 1:
+        yield from map(nth_char, word_lists)
+        return
+
+    lists = iter(word_lists)
+    with ProcessPoolExecutor(processes) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * processes:
+                chunk = list(islice(lists, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_nth_char_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
 
-    return result
+def _nth_char_chunk(word_lists: list[list[str]]) -> list[str]:
+    return [nth_char(words) for words in word_lists]
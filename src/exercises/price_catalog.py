@@ -0,0 +1,94 @@
+"""Batch pricing of many baskets against one catalog, matching ``get_total``."""
+
+from itertools import accumulate, chain, repeat
+from typing import Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # optional: totals are then computed one basket at a time
+    np = None
+
+# Twice the unit roundoff of a double, used to bound floating point error
+_EPS = 2.3e-16
+
+
+class PriceCatalog:
+    """
+    A ``costs`` dict interned once into an item id → price array, so baskets
+    can be encoded as integer arrays and priced in bulk.
+
+    Id 0 is reserved for items missing from the catalog and costs 0, like
+    ``costs.get(item, 0)`` in ``get_total``. With NumPy all subtotals come
+    from one ``bincount``, which adds each basket's prices left to right from
+    0 just like ``sum``. Totals whose rounding to cents could be tipped by
+    floating point error are recomputed the way ``get_total`` does it, so
+    every result equals ``get_total(costs, items, tax)``.
+    """
+
+    def __init__(self, costs: dict[str, float]):
+        self.ids = {item: i for i, item in enumerate(costs, start=1)}
+        self._costs = [0, *costs.values()]
+        if np is not None:
+            self.prices = np.array(self._costs, dtype=np.float64)
+            self._abs_prices = np.abs(self.prices)
+
+    def encode(self, baskets: Sequence[Sequence[str]]):
+        """
+        Encode baskets as ``(ids, offsets)``: the item ids of all baskets
+        concatenated, and where each basket starts plus the total length.
+        """
+        offsets = [0, *accumulate(map(len, baskets))]
+        ids = map(self.ids.get, chain.from_iterable(baskets), repeat(0))
+        if np is None:
+            return list(ids), offsets
+        return (
+            np.fromiter(ids, dtype=np.intp, count=offsets[-1]),
+            np.array(offsets, dtype=np.intp),
+        )
+
+    def totals(self, baskets: Sequence[Sequence[str]], tax: Union[float, Sequence]):
+        """``get_total`` of each basket, with one tax rate or one per basket."""
+        return self.totals_encoded(*self.encode(baskets), tax)
+
+    def totals_encoded(self, ids, offsets, tax: Union[float, Sequence]):
+        """
+        Totals of baskets already encoded by ``encode``: a float64 array with
+        NumPy, a list otherwise.
+        """
+        if np is None:
+            taxes = repeat(tax) if isinstance(tax, (int, float)) else tax
+            return [
+                self._total(ids[start:end], rate)
+                for start, end, rate in zip(offsets, offsets[1:], taxes)
+            ]
+
+        offsets = np.asarray(offsets)
+        tax = np.asarray(tax, dtype=np.float64)
+        counts = np.diff(offsets)
+        basket_of = np.repeat(np.arange(len(counts)), counts)
+        subtotal = np.bincount(basket_of, self.prices[ids], minlength=len(counts))
+        total = subtotal + subtotal * tax
+        cents = total * 100
+        rounded = np.rint(cents) / 100
+
+        # rint(cents) rounds the double nearest to total * 100, while round()
+        # rounds the exact decimal value of total, and sum() may add with
+        # compensation (Python 3.12+). Either can only change the result when
+        # cents is within their error of a half cent, so those few baskets,
+        # and anything too large or not finite, are priced by the scalar path.
+        magnitude = np.bincount(basket_of, self._abs_prices[ids], minlength=len(counts))
+        tolerance = _EPS * (100 * (counts + 2) * magnitude * (1 + np.abs(tax)))
+        tolerance += _EPS * np.abs(cents)
+        halfway = np.abs(cents - np.floor(cents) - 0.5) <= tolerance
+        exact = ~np.isfinite(cents) | (np.abs(cents) >= 2**52)
+        for i in np.flatnonzero(halfway | exact):
+            rate = tax if tax.ndim == 0 else tax[i]
+            rounded[i] = self._total(ids[offsets[i] : offsets[i + 1]], float(rate))
+        return rounded
+
+    def _total(self, ids, tax: float) -> float:
+        # Same operations, in the same order, as get_total
+        subtotal = sum(self._costs[i] for i in ids)
+        tax_amount = subtotal * tax
+        total = subtotal + tax_amount
+        return round(total, 2)
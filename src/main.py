@@ -1,33 +1,40 @@
 """FastAPI application entrypoint."""
 
-from fastapi import FastAPI
+import logging
 from contextlib import asynccontextmanager
-from src.backend.config import settings
-from src.backend.database import init_db
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.backend.api.catalogs import router as catalogs_router
 from src.backend.api.routes import router
+from src.backend.compression import CompressionMiddleware
+from src.backend.config import settings
+from src.backend.database import get_engine, init_db
+from src.backend.health import health_probe
+from src.backend.metrics import MetricsMiddleware, metrics
+from src.backend.profiling import FirstRequestTimer, process_age
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events - startup and shutdown."""
     # Startup: Initialize database
-    init_db()
+    await init_db()
+    health_probe.pool = get_engine().pool
+    await health_probe.start()
     yield
-    # Shutdown: cleanup if needed
-
+    # Shutdown: stop probing
+    await health_probe.stop()
 
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    description="A simple dictionary API for storing and retrieving word definitions",
-    lifespan=lifespan,
-)
 
-# Include routers
-app.include_router(router)
+system_router = APIRouter(tags=["health"])
 
 
-@app.get("/", tags=["health"])
+@system_router.get("/")
 def root():
     """Health check endpoint."""
     return {
@@ -37,7 +44,84 @@ def root():
     }
 
 
-@app.get("/health", tags=["health"])
-def health_check():
-    """Detailed health check endpoint."""
-    return {"status": "healthy", "database": "connected"}
+# The health handlers are async so they run on the event loop: sync handlers
+# would queue in the threadpool behind DB calls and time out under load
+@system_router.get("/health")
+async def health_check():
+    """Detailed health check endpoint, from the last background DB probe."""
+    status = health_probe.status()
+    status["status"] = "healthy" if health_probe.ready else "unhealthy"
+    return JSONResponse(status, status_code=200 if health_probe.ready else 503)
+
+
+@system_router.get("/health/live")
+async def liveness():
+    """Liveness: the worker is serving requests. Never touches the DB."""
+    return {"status": "alive"}
+
+
+@system_router.get("/health/ready")
+async def readiness():
+    """Readiness: the cached result of the background DB probe."""
+    return JSONResponse(
+        health_probe.status(), status_code=200 if health_probe.ready else 503
+    )
+
+
+@system_router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus metrics summed over every worker of this pod."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """
+    No pool connection freed up within the pool timeout (DB_POOL_SHED_AFTER
+    when load shedding): tell the client to come back instead of failing.
+    """
+    if settings.METRICS_ENABLED:
+        metrics.inc("db_pool_shed_total")
+    return JSONResponse(
+        {"detail": "Database connection pool exhausted, retry later"},
+        status_code=503,
+        headers={"Retry-After": str(settings.DB_POOL_RETRY_AFTER)},
+    )
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Importing this module does no I/O, so gunicorn can
+    preload it in the master and fork warm workers; engines and the health
+    probe are created per worker in the lifespan.
+    """
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        description="A simple dictionary API for storing and retrieving word definitions",
+        lifespan=lifespan,
+    )
+    # Added first so it runs inside the metrics middleware, which then also
+    # times the compression
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+
+    # Include routers. In async mode the async handlers are registered first so
+    # they take precedence over the sync handlers for the same paths.
+    if settings.DB_ASYNC:
+        from src.backend.api import async_routes
+
+        app.include_router(async_routes.router)
+    app.include_router(router)
+    app.include_router(catalogs_router)
+    app.include_router(system_router)
+
+    if settings.STARTUP_PROFILE:
+        app.add_middleware(FirstRequestTimer)
+        logger.info(f"Startup: app built {process_age():.3f}s after process start")
+    return app
+
+
+app = create_app()
@@ -2,10 +2,12 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
 from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
 
+from src.backend.cache import lookup_cache
 from src.backend.database import get_session
+from src.backend.search import word_index
 from src.main import app
 
 # Create in-memory SQLite database for testing
@@ -23,6 +25,8 @@ TestingSessionLocal = Session(autocommit=False, autoflush=False, bind=engine)
 def db_session():
     """Create a fresh database session for each test."""
     SQLModel.metadata.create_all(bind=engine)
+    lookup_cache.clear()
+    word_index.reset()
     session = TestingSessionLocal()
     try:
         yield session
@@ -1,9 +1,20 @@
+import asyncio
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
 
-from src.main import app
+from src.backend.cache import lookup_cache
+from src.backend.catalogs import catalog_cache
+from src.backend.config import settings
 from src.backend.database import get_session
+from src.backend.search import word_index
+from src.exercises.spending import get_total
+from src.main import app
 
 # 1. Setup an in-memory database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -27,10 +38,37 @@ client = TestClient(app)
 def setup_db():
     """Create tables before each test and drop them after."""
     SQLModel.metadata.create_all(bind=engine)
+    lookup_cache.clear()
+    catalog_cache.clear()
+    word_index.reset()
     yield
     SQLModel.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def seed():
+    """
+    Create entries from ``{word: definition}``, one POST /api/v1/newentry
+    each, or in one POST /api/v1/bulk when ``bulk`` is set.
+    """
+
+    def create(entries: dict[str, str], bulk: bool = False) -> None:
+        if bulk:
+            body = "\n".join(
+                json.dumps({"word": word, "definition": definition})
+                for word, definition in entries.items()
+            )
+            assert client.post("/api/v1/bulk", content=body).status_code == 200
+            return
+        for word, definition in entries.items():
+            response = client.post(
+                "/api/v1/newentry", json={"word": word, "definition": definition}
+            )
+            assert response.status_code == 201
+
+    return create
+
+
 class TestDictionaryAPI:
     """Test suite for Dictionary API endpoints."""
 
@@ -43,6 +81,13 @@ class TestDictionaryAPI:
         assert response.status_code == 201
         assert response.json()["word"] == "python"
 
+    def test_create_rejects_overlong_word(self):
+        """Words longer than the column must not be truncated into the DB."""
+        response = client.post(
+            "/api/v1/newentry", json={"word": "x" * 256, "definition": "long"}
+        )
+        assert response.status_code == 422
+
     def test_look_existing_word(self):
         """Test the GET /api/v1/look/{word} endpoint."""
         # First, seed the data
@@ -86,9 +131,675 @@ class TestDictionaryAPI:
         # Verify it's actually gone
         get_response = client.get("/api/v1/look/gone")
         assert get_response.status_code == 404
-    
+
     def test_delete_entry_not_found(self):
-        """Test the DELETE /api/v1/entries/{word} endpoint for not found entries."""        
+        """Test the DELETE /api/v1/entries/{word} endpoint for not found entries."""
         response = client.delete("/api/v1/entries/test")
         assert response.status_code == 404
         assert "Can't find entry" in response.json()["detail"]
+
+
+class TestLookupCache:
+    """Test the read-through cache in front of GET /api/v1/look/{word}."""
+
+    def test_repeat_lookup_is_a_cache_hit(self):
+        """The second lookup of a word should not go back to the DB."""
+        client.post("/api/v1/newentry", json={"word": "hot", "definition": "warm"})
+        client.get("/api/v1/look/hot")
+        response = client.get("/api/v1/look/hot")
+        assert response.json() == {"word": "hot", "definition": "warm"}
+
+        stats = client.get("/api/v1/cache/stats").json()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert set(stats["single_flight"]) == {"calls", "coalesced"}
+
+    def test_create_invalidates_negative_entry(self):
+        """A cached 404 must not survive the word being created."""
+        assert client.get("/api/v1/look/late").status_code == 404
+        client.post("/api/v1/newentry", json={"word": "late", "definition": "tardy"})
+
+        response = client.get("/api/v1/look/late")
+        assert response.status_code == 200
+        assert response.json()["definition"] == "tardy"
+
+    def test_delete_invalidates_cached_entry(self):
+        """A deleted word must not be served from the cache."""
+        client.post("/api/v1/newentry", json={"word": "temp", "definition": "x"})
+        assert client.get("/api/v1/look/temp").status_code == 200
+        client.delete("/api/v1/entries/temp")
+        assert client.get("/api/v1/look/temp").status_code == 404
+
+
+class TestBulkIngest:
+    """Test the POST /api/v1/bulk streaming ingest endpoint."""
+
+    def test_ndjson_ingest(self):
+        """NDJSON lines should all be written."""
+        body = "\n".join(f'{{"word": "w{i}", "definition": "d{i}"}}' for i in range(25))
+        response = client.post(
+            "/api/v1/bulk",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["received"] == 25
+        assert result["written"] == 25
+        assert result["rejected"] == 0
+        assert client.get("/api/v1/look/w24").json()["definition"] == "d24"
+
+    def test_csv_ingest_with_header(self):
+        """A CSV header row should be skipped and quoted commas kept."""
+        body = 'word,definition\napple,"A fruit, red"\npear,A fruit\n'
+        response = client.post(
+            "/api/v1/bulk", content=body, headers={"Content-Type": "text/csv"}
+        )
+        assert response.json()["written"] == 2
+        assert client.get("/api/v1/look/apple").json()["definition"] == "A fruit, red"
+
+    def test_malformed_lines_are_rejected(self):
+        """Lines that can't be parsed should be counted as rejected."""
+        body = '{"word": "ok", "definition": "fine"}\nnot json\n{"word": "x"}\n'
+        result = client.post("/api/v1/bulk", content=body).json()
+        assert result["written"] == 1
+        assert result["rejected"] == 2
+
+    def test_skip_existing_words(self):
+        """With on_conflict=skip, existing words keep their definition."""
+        client.post("/api/v1/newentry", json={"word": "kept", "definition": "old"})
+        body = '{"word": "kept", "definition": "new"}\n{"word": "added", "definition": "x"}'
+        result = client.post("/api/v1/bulk?on_conflict=skip", content=body).json()
+        assert result["written"] == 1
+        assert result["rejected"] == 1
+        assert client.get("/api/v1/look/kept").json()["definition"] == "old"
+
+    def test_overwrite_existing_words(self):
+        """With on_conflict=overwrite, existing words get the new definition."""
+        client.post("/api/v1/newentry", json={"word": "kept", "definition": "old"})
+        assert client.get("/api/v1/look/kept").json()["definition"] == "old"
+        body = '{"word": "kept", "definition": "new"}'
+        result = client.post("/api/v1/bulk?on_conflict=overwrite", content=body).json()
+        assert result["written"] == 1
+        assert client.get("/api/v1/look/kept").json()["definition"] == "new"
+
+    def test_fail_on_existing_word(self):
+        """With on_conflict=fail, an existing word should abort with 400."""
+        client.post("/api/v1/newentry", json={"word": "kept", "definition": "old"})
+        body = '{"word": "other", "definition": "x"}\n{"word": "kept", "definition": "new"}'
+        response = client.post("/api/v1/bulk?on_conflict=fail", content=body)
+        assert response.status_code == 400
+        assert "'kept' already exists" in response.json()["detail"]
+        assert client.get("/api/v1/look/other").status_code == 404
+
+
+class TestSingleStatementWrites:
+    """Test the single-statement create path and the PUT upsert endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def single_statement_writes(self, monkeypatch):
+        monkeypatch.setattr(settings, "SINGLE_STATEMENT_WRITES", True)
+
+    def test_create_entry(self):
+        """A new word should still be created with a 201."""
+        response = client.post(
+            "/api/v1/newentry", json={"word": "python", "definition": "A language"}
+        )
+        assert response.status_code == 201
+        assert response.json() == {"word": "python", "definition": "A language"}
+        assert client.get("/api/v1/look/python").status_code == 200
+
+    def test_duplicate_entry(self):
+        """A conflict on the unique index should still map to a 400."""
+        data = {"word": "unique", "definition": "test"}
+        client.post("/api/v1/newentry", json=data)
+        response = client.post("/api/v1/newentry", json={**data, "definition": "new"})
+        assert response.status_code == 400
+        assert "already exists" in response.json()["detail"]
+        assert client.get("/api/v1/look/unique").json()["definition"] == "test"
+
+    def test_put_creates_entry(self):
+        """PUT on an unknown word should create it."""
+        response = client.put("/api/v1/entries/fresh", json={"definition": "new"})
+        assert response.status_code == 200
+        assert response.json() == {"word": "fresh", "definition": "new"}
+        assert client.get("/api/v1/look/fresh").json()["definition"] == "new"
+
+    def test_put_replaces_cached_definition(self):
+        """PUT on an existing word should replace it and invalidate the cache."""
+        client.post("/api/v1/newentry", json={"word": "word", "definition": "old"})
+        assert client.get("/api/v1/look/word").json()["definition"] == "old"
+
+        client.put("/api/v1/entries/word", json={"definition": "new"})
+        assert client.get("/api/v1/look/word").json()["definition"] == "new"
+
+
+class TestKeysetPagination:
+    """Test cursor-based pagination of GET /api/v1/entries."""
+
+    def test_walk_all_pages_with_cursor(self):
+        """Following X-Next-Cursor should visit every entry exactly once."""
+        for i in range(7):
+            client.post("/api/v1/newentry", json={"word": f"w{i}", "definition": "d"})
+
+        words, cursor = [], None
+        while True:
+            params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+            response = client.get("/api/v1/entries", params=params)
+            words += [entry["word"] for entry in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert words == [f"w{i}" for i in range(7)]
+
+    def test_skip_still_supported(self):
+        """The old skip/limit parameters should keep working."""
+        client.post("/api/v1/newentry", json={"word": "a", "definition": "1"})
+        client.post("/api/v1/newentry", json={"word": "b", "definition": "2"})
+
+        response = client.get("/api/v1/entries?skip=1&limit=1")
+        assert response.json() == [{"word": "b", "definition": "2"}]
+
+    def test_invalid_cursor(self):
+        """A cursor we did not issue should be rejected with 400."""
+        response = client.get("/api/v1/entries?cursor=garbage")
+        assert response.status_code == 400
+
+
+class TestExport:
+    """Test the GET /api/v1/export streaming endpoint."""
+
+    def test_ndjson_export(self, seed):
+        """Every entry should be streamed as one JSON object per line."""
+        seed({f"w{i}": f"d, {i}" for i in range(2500)}, bulk=True)
+        response = client.get("/api/v1/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        lines = response.text.splitlines()
+        assert len(lines) == 2500
+        assert json.loads(lines[0]) == {"word": "w0", "definition": "d, 0"}
+        assert json.loads(lines[-1]) == {"word": "w2499", "definition": "d, 2499"}
+
+    def test_csv_export(self, seed):
+        """CSV export should have a header row and quote embedded commas."""
+        seed({f"w{i}": f"d, {i}" for i in range(2500)}, bulk=True)
+        response = client.get("/api/v1/export?format=csv")
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["word", "definition"]
+        assert rows[1] == ["w0", "d, 0"]
+        assert len(rows) == 2501
+
+    def test_empty_export(self):
+        """Exporting an empty table should return an empty NDJSON body."""
+        assert client.get("/api/v1/export").text == ""
+
+
+class TestBatchLookup:
+    """Test the POST /api/v1/look batch lookup endpoint."""
+
+    def test_found_and_missing_words(self):
+        """Known words should map to definitions, unknown ones be listed."""
+        client.post("/api/v1/newentry", json={"word": "a", "definition": "1"})
+        client.post("/api/v1/newentry", json={"word": "b", "definition": "2"})
+
+        response = client.post("/api/v1/look", json={"words": ["b", "x", "a", "b"]})
+        assert response.status_code == 200
+        assert response.json() == {"entries": {"b": "2", "a": "1"}, "missing": ["x"]}
+
+    def test_more_words_than_one_chunk(self, monkeypatch):
+        """Words spread over several IN chunks should all be resolved."""
+        monkeypatch.setattr(settings, "BATCH_LOOKUP_CHUNK_SIZE", 7)
+        body = "\n".join(f'{{"word": "w{i}", "definition": "d{i}"}}' for i in range(50))
+        client.post("/api/v1/bulk", content=body)
+
+        words = [f"w{i}" for i in range(60)]
+        result = client.post("/api/v1/look", json={"words": words}).json()
+        assert len(result["entries"]) == 50
+        assert result["missing"] == [f"w{i}" for i in range(50, 60)]
+
+    def test_uses_lookup_cache(self):
+        """A negatively cached word should be reported missing."""
+        client.get("/api/v1/look/ghost")
+        result = client.post("/api/v1/look", json={"words": ["ghost"]}).json()
+        assert result == {"entries": {}, "missing": ["ghost"]}
+        assert client.get("/api/v1/cache/stats").json()["hits"] == 1
+
+    def test_too_many_words(self, monkeypatch):
+        """Requests over the word limit should be rejected."""
+        monkeypatch.setattr(settings, "BATCH_LOOKUP_MAX_WORDS", 2)
+        response = client.post("/api/v1/look", json={"words": ["a", "b", "c"]})
+        assert response.status_code == 400
+
+
+class TestSearch:
+    """Test prefix search and "did you mean" suggestions."""
+
+    def test_prefix_search(self, seed):
+        """Words starting with the prefix should be returned sorted."""
+        seed(dict.fromkeys(["python", "pytest", "java", "pyramid"], "d"))
+        response = client.get("/api/v1/search?prefix=py")
+        assert response.json() == {
+            "prefix": "py",
+            "words": ["pyramid", "pytest", "python"],
+        }
+
+    def test_prefix_search_limit(self, seed):
+        """The limit parameter should cap the number of words."""
+        seed(dict.fromkeys(["a1", "a2", "a3"], "d"))
+        response = client.get("/api/v1/search?prefix=a&limit=2")
+        assert response.json()["words"] == ["a1", "a2"]
+
+    def test_index_follows_writes(self, seed):
+        """Created and deleted words should show up without a rebuild."""
+        seed({"python": "d"})
+        client.get("/api/v1/search?prefix=py")
+        seed({"pytest": "d"})
+        client.delete("/api/v1/entries/python")
+        assert client.get("/api/v1/search?prefix=py").json()["words"] == ["pytest"]
+
+    def test_did_you_mean(self, seed):
+        """A 404 should suggest words one edit away when asked to."""
+        seed(dict.fromkeys(["python", "java"], "d"))
+        response = client.get("/api/v1/look/pyhton?suggest=true")
+        assert response.status_code == 404
+        assert response.json()["detail"] == (
+            "Can't find entry for pyhton. Did you mean: python?"
+        )
+
+    def test_no_suggestions_by_default(self, seed):
+        """A plain 404 should neither suggest nor build the index."""
+        seed({"python": "d"})
+        response = client.get("/api/v1/look/pyhton")
+        assert response.json()["detail"] == "Can't find entry for pyhton"
+        assert not word_index.built
+
+    def test_no_suggestions(self, seed, monkeypatch):
+        """Suggestions can be turned off."""
+        monkeypatch.setattr(settings, "SEARCH_SUGGESTIONS", 0)
+        seed({"python": "d"})
+        response = client.get("/api/v1/look/pyhton?suggest=true")
+        assert response.json()["detail"] == "Can't find entry for pyhton"
+
+
+class TestFastJsonResponses:
+    """Test the column-tuple fast path of GET /api/v1/entries."""
+
+    DEFINITIONS = [
+        "plain",
+        'quote " and \\\\ backslash',
+        "naïve café ✓ 🐍",
+        "tab\tnew\nline\x01",
+    ]
+
+    def test_byte_identical_output(self, seed, monkeypatch):
+        """The fast path should return exactly the same bytes and headers."""
+        seed({f"w{i}": d for i, d in enumerate(self.DEFINITIONS)})
+        regular = client.get("/api/v1/entries?limit=3")
+
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = client.get("/api/v1/entries?limit=3")
+
+        assert fast.content == regular.content
+        assert fast.headers["content-type"] == regular.headers["content-type"]
+        assert fast.headers["X-Next-Cursor"] == regular.headers["X-Next-Cursor"]
+
+    def test_cursor_walk(self, seed, monkeypatch):
+        """Keyset pagination should work on the fast path too."""
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        seed({f"w{i}": d for i, d in enumerate(self.DEFINITIONS)})
+        first = client.get("/api/v1/entries?limit=2")
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/api/v1/entries?limit=2&cursor={cursor}")
+
+        words = [e["word"] for e in first.json() + second.json()]
+        assert words == ["w0", "w1", "w2", "w3"]
+
+
+class TestConditionalRequests:
+    """Test ETags, 304s and Cache-Control of the dictionary reads."""
+
+    def test_lookup_revalidates_to_304(self, seed):
+        """A matching If-None-Match should get an empty 304."""
+        seed({"w0": "d"})
+        first = client.get("/api/v1/look/w0")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == (
+            f"public, max-age={settings.LOOKUP_MAX_AGE}"
+        )
+        assert "Last-Modified" in first.headers
+
+        again = client.get("/api/v1/look/w0", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["ETag"] == etag
+
+        weak = client.get("/api/v1/look/w0", headers={"If-None-Match": f"W/{etag}"})
+        assert weak.status_code == 304
+
+    def test_lookup_if_modified_since(self, seed):
+        """Without an ETag the Last-Modified date should be honoured."""
+        seed({"w0": "d"})
+        modified = client.get("/api/v1/look/w0").headers["Last-Modified"]
+        response = client.get(
+            "/api/v1/look/w0", headers={"If-Modified-Since": modified}
+        )
+        assert response.status_code == 304
+        old = "Mon, 01 Jan 2001 00:00:00 GMT"
+        response = client.get("/api/v1/look/w0", headers={"If-Modified-Since": old})
+        assert response.status_code == 200
+
+    def test_overwrite_changes_etag(self, seed):
+        """Replacing a definition should bump the version and so the ETag."""
+        seed({"w0": "d"})
+        etag = client.get("/api/v1/look/w0").headers["ETag"]
+        client.put("/api/v1/entries/w0", json={"definition": "new"})
+
+        response = client.get("/api/v1/look/w0", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["definition"] == "new"
+        assert response.headers["ETag"] != etag
+
+    def test_list_revalidates_to_304(self, seed, monkeypatch):
+        """A page should 304 until one of its entries changes."""
+        seed({f"w{i}": "d" for i in range(3)})
+        first = client.get("/api/v1/entries?limit=2")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+
+        again = client.get("/api/v1/entries?limit=2", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = client.get("/api/v1/entries?limit=2")
+        assert fast.headers["ETag"] == etag
+
+        client.delete("/api/v1/entries/w1")
+        changed = client.get("/api/v1/entries?limit=2", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert [e["word"] for e in changed.json()] == ["w0", "w2"]
+
+
+class TestContentNegotiation:
+    """Test the Accept formats and compression of GET /api/v1/entries."""
+
+    def test_columnar_format(self, seed):
+        seed({f"w{i}": f"d{i}" for i in range(3)})
+        response = client.get(
+            "/api/v1/entries?limit=2",
+            headers={"Accept": "application/vnd.dictionary.columnar+json"},
+        )
+        assert response.headers["content-type"].startswith(
+            "application/vnd.dictionary.columnar+json"
+        )
+        assert response.json() == {"words": ["w0", "w1"], "definitions": ["d0", "d1"]}
+        assert "X-Next-Cursor" in response.headers
+        assert response.headers["Vary"] == "Accept, Accept-Encoding"
+
+    def test_json_by_default(self, seed):
+        """Browsers' and curl's Accept headers should keep getting JSON."""
+        seed({f"w{i}": f"d{i}" for i in range(3)})
+        for accept in ("*/*", "text/html, */*;q=0.8", "application/xml"):
+            response = client.get("/api/v1/entries", headers={"Accept": accept})
+            assert response.headers["content-type"] == "application/json"
+
+    def test_formats_have_distinct_etags(self, seed):
+        """A cached JSON page must not validate the columnar one."""
+        seed({f"w{i}": f"d{i}" for i in range(3)})
+        columnar = {"Accept": "application/vnd.dictionary.columnar+json"}
+        json_etag = client.get("/api/v1/entries").headers["ETag"]
+        response = client.get(
+            "/api/v1/entries", headers={**columnar, "If-None-Match": json_etag}
+        )
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        response = client.get(
+            "/api/v1/entries", headers={**columnar, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_msgpack_format(self, seed):
+        msgpack = pytest.importorskip("msgpack")
+        seed({f"w{i}": f"d{i}" for i in range(3)})
+        response = client.get(
+            "/api/v1/entries", headers={"Accept": "application/msgpack"}
+        )
+        assert msgpack.unpackb(response.content) == client.get("/api/v1/entries").json()
+
+    def test_large_page_is_compressed(self, seed):
+        """A page above COMPRESSION_MIN_SIZE should be gzipped, and still 304."""
+        seed({f"w{i}": f"d{i}" for i in range(100)})
+        headers = {"Accept-Encoding": "gzip"}
+        response = client.get("/api/v1/entries", headers=headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()) == 100
+
+        etag = response.headers["ETag"]
+        assert etag.startswith("W/")
+        response = client.get(
+            "/api/v1/entries", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+
+class TestCatalogs:
+    """Test catalog upload and batch basket totals."""
+
+    COSTS = {"socks": 5, "shoes": 60, "sweater": 30}
+
+    def test_upload_bumps_version(self):
+        response = client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        assert response.status_code == 200
+        assert response.json() == {"id": "shop", "version": 1, "items": 3}
+        response = client.put("/api/v1/catalogs/shop", json={"costs": {"a": 1}})
+        assert response.json() == {"id": "shop", "version": 2, "items": 1}
+
+    def test_totals_match_get_total(self):
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        baskets = [["socks", "shoes"], ["sweater", "sweater"], [], ["unknown"]]
+        response = client.post(
+            "/api/v1/catalogs/shop/total", json={"baskets": baskets, "tax": 0.09}
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "id": "shop",
+            "version": 1,
+            "totals": [get_total(self.COSTS, basket, 0.09) for basket in baskets],
+        }
+
+    def test_catalog_indexed_once_until_reupload(self):
+        """Totals should reuse the cached catalog, and see a new upload at once."""
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        body = {"baskets": [["socks"]], "tax": [0.0]}
+        client.post("/api/v1/catalogs/shop/total", json=body)
+        hits = catalog_cache.hits
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.json()["totals"] == [5]
+        assert catalog_cache.hits == hits + 1
+
+        client.put("/api/v1/catalogs/shop", json={"costs": {"socks": 7}})
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.json()["version"] == 2
+        assert response.json()["totals"] == [7]
+
+    def test_version_pinning(self):
+        """A request for another version than the stored one should get 409."""
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        body = {"baskets": [["socks"]], "tax": 0.1, "version": 1}
+        assert client.post("/api/v1/catalogs/shop/total", json=body).status_code == 200
+        body["version"] = 2
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.status_code == 409
+
+    def test_upload_does_not_rebuild_word_index(self):
+        """Catalog uploads shouldn't look like dictionary writes to the index."""
+        writes = lookup_cache.generations.writes()
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        client.put("/api/v1/catalogs/shop", json={"costs": {"a": 1}})
+        assert lookup_cache.generations.writes() == writes
+
+    def test_version_pinning_reloads_stale_cache(self):
+        """An upload through another pod should be picked up when asked for."""
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        body = {"baskets": [["socks"]], "tax": 0.0}
+        client.post("/api/v1/catalogs/shop/total", json=body)
+        # Another pod's upload: the DB changes, this pod's generations don't
+        with Session(engine) as session:
+            session.execute(
+                text("UPDATE catalog SET version = 2, costs = '{\"socks\": 8}'")
+            )
+            session.commit()
+
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.json()["version"] == 1
+        response = client.post(
+            "/api/v1/catalogs/shop/total", json={**body, "version": 2}
+        )
+        assert response.json() == {"id": "shop", "version": 2, "totals": [8]}
+
+    def test_errors(self, monkeypatch):
+        body = {"baskets": [["socks"]], "tax": 0.1}
+        response = client.post("/api/v1/catalogs/none/total", json=body)
+        assert response.status_code == 404
+
+        client.put("/api/v1/catalogs/shop", json={"costs": self.COSTS})
+        body["tax"] = [0.1, 0.2]
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.status_code == 400
+
+        monkeypatch.setattr(settings, "CATALOG_MAX_BASKETS", 1)
+        body = {"baskets": [["socks"], ["shoes"]], "tax": 0.1}
+        response = client.post("/api/v1/catalogs/shop/total", json=body)
+        assert response.status_code == 400
+
+
+class TestMetricsEndpoint:
+    """Test the GET /metrics endpoint."""
+
+    def _requests(self, route: str, status: str) -> float:
+        text = client.get("/metrics").text
+        sample = (
+            f'http_requests_total{{method="GET",route="{route}",status="{status}"}} '
+        )
+        for line in text.splitlines():
+            if line.startswith(sample):
+                return float(line[len(sample) :])
+        return 0.0
+
+    def test_counts_requests_by_route_template(self):
+        """Lookups should be counted under the route template, not the word."""
+        before = self._requests("/api/v1/look/{word}", "404")
+        client.get("/api/v1/look/nothere")
+        client.get("/api/v1/look/alsonothere")
+        assert self._requests("/api/v1/look/{word}", "404") == before + 2
+
+    def test_prometheus_text_format(self):
+        """The endpoint should serve the Prometheus text exposition format."""
+        client.get("/api/v1/entries")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'route="/api/v1/entries",le="+Inf"' in response.text
+
+
+class TestHealthEndpoints:
+    """Test the liveness and readiness endpoints."""
+
+    @pytest.fixture
+    def probe(self, monkeypatch):
+        from src.backend.health import health_probe
+
+        monkeypatch.setattr(health_probe, "engine", engine)
+        monkeypatch.setattr(health_probe, "checked_at", None)
+        monkeypatch.setattr(health_probe, "ever_ok", False)
+        monkeypatch.setattr(health_probe, "consecutive_failures", 0)
+        return health_probe
+
+    def test_liveness_does_not_need_db(self, probe):
+        """Liveness should answer even before the DB was ever probed."""
+        assert client.get("/health/live").status_code == 200
+        assert client.get("/health/ready").status_code == 503
+
+    def test_readiness_from_cached_probe(self, probe):
+        """Readiness should reflect the last probe result without probing."""
+        asyncio.run(probe.check())
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["database"] == "connected"
+
+        probe.consecutive_failures = probe.failure_threshold
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.json()["status"] == "unhealthy"
+
+    def test_probes_skip_the_threadpool(self):
+        """Probe handlers must not queue behind DB calls in the threadpool."""
+        from src.main import health_check, liveness, readiness
+
+        for endpoint in (health_check, liveness, readiness):
+            assert asyncio.iscoroutinefunction(endpoint)
+
+
+class TestLoadShedding:
+    """Test pool sizing and the 503 answer to an exhausted pool."""
+
+    def test_pool_limits_fit_the_budget(self):
+        """All workers of all pods together should stay within the budget."""
+        from src.backend.database import pool_limits
+
+        pool_size, max_overflow = pool_limits(100, workers=8, pods=2)
+        assert (pool_size, max_overflow) == (3, 2)
+        # One connection per worker is left for the health probe
+        assert (pool_size + max_overflow + 1) * 8 * 2 <= 100
+        assert sum(pool_limits(100, 8, 2, engines_per_worker=2)) == 2
+
+    def test_pool_limits_refuse_a_too_small_budget(self):
+        """A budget that can't fit every worker should fail, not be exceeded."""
+        from src.backend.database import pool_limits
+
+        with pytest.raises(ValueError, match="need at least 64"):
+            pool_limits(10, workers=8, pods=4)
+        with pytest.raises(ValueError):
+            pool_limits(40, workers=8, pods=2, engines_per_worker=2)
+        assert pool_limits(32, workers=8, pods=2) == (1, 0)
+
+    def test_too_small_budget_stops_startup(self, monkeypatch, caplog):
+        """Engines shouldn't be created unless both pool sizes are set explicitly."""
+        from src.backend.database import _pool_options
+
+        monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 10)
+        monkeypatch.setattr(settings, "WEB_CONCURRENCY", 8)
+        monkeypatch.setattr(settings, "POD_REPLICAS", 4)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", None)
+        with pytest.raises(ValueError):
+            _pool_options()
+        assert "raise DB_CONNECTION_BUDGET" in caplog.text
+
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+        assert _pool_options()["pool_size"] == 1
+
+    def test_exhausted_pool_returns_503(self, tmp_path, monkeypatch):
+        """A request that can't get a connection in time should be shed."""
+        busy = create_engine(
+            f"sqlite:///{tmp_path / 'busy.db'}",
+            connect_args={"check_same_thread": False},
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+
+        def busy_session():
+            with Session(busy) as session:
+                yield session
+
+        monkeypatch.setitem(app.dependency_overrides, get_session, busy_session)
+        with busy.connect():
+            response = client.get("/api/v1/entries")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(settings.DB_POOL_RETRY_AFTER)
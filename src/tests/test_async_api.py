@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.backend.api import async_routes
+from src.backend.cache import lookup_cache
+from src.backend.config import settings
+from src.backend.database import get_async_session
+from src.backend.search import word_index
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Serve the async router against a SQLite file through aiosqlite."""
+    db_file = tmp_path / "async.db"
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{db_file}"))
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_file}", poolclass=NullPool
+    )
+    lookup_cache.clear()
+    word_index.reset()
+
+    async def override_get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_routes.router)
+    app.dependency_overrides[get_async_session] = override_get_async_session
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class TestAsyncDictionaryAPI:
+    """Test suite for the async dictionary endpoints."""
+
+    def test_create_and_look(self, client):
+        """A created word should be returned by the lookup endpoint."""
+        response = client.post(
+            "/api/v1/newentry", json={"word": "python", "definition": "A language"}
+        )
+        assert response.status_code == 201
+
+        response = client.get("/api/v1/look/python")
+        assert response.status_code == 200
+        assert response.json() == {"word": "python", "definition": "A language"}
+
+    def test_duplicate_entry(self, client):
+        """Adding the same word twice should return a 400 error."""
+        data = {"word": "unique", "definition": "test"}
+        client.post("/api/v1/newentry", json=data)
+        assert client.post("/api/v1/newentry", json=data).status_code == 400
+
+    def test_list_entries(self, client):
+        """Pagination parameters should be honoured."""
+        client.post("/api/v1/newentry", json={"word": "a", "definition": "1"})
+        client.post("/api/v1/newentry", json={"word": "b", "definition": "2"})
+
+        response = client.get("/api/v1/entries?skip=1&limit=5")
+        assert response.json() == [{"word": "b", "definition": "2"}]
+
+    def test_delete_entry(self, client):
+        """A deleted word should no longer be found."""
+        client.post("/api/v1/newentry", json={"word": "gone", "definition": "bye"})
+        client.get("/api/v1/look/gone")
+        assert client.delete("/api/v1/entries/gone").status_code == 200
+        assert client.get("/api/v1/look/gone").status_code == 404
+
+    def test_delete_entry_not_found(self, client):
+        """Deleting an unknown word should return 404."""
+        response = client.delete("/api/v1/entries/test")
+        assert response.status_code == 404
+        assert "Can't find entry" in response.json()["detail"]
+
+    def test_put_upserts_entry(self, client):
+        """PUT should create the word and then replace its definition."""
+        client.put("/api/v1/entries/word", json={"definition": "old"})
+        client.put("/api/v1/entries/word", json={"definition": "new"})
+        assert client.get("/api/v1/look/word").json()["definition"] == "new"
+
+    def test_single_statement_create(self, client, monkeypatch):
+        """The single-statement create path should map conflicts to 400."""
+        monkeypatch.setattr(settings, "SINGLE_STATEMENT_WRITES", True)
+        data = {"word": "unique", "definition": "test"}
+        assert client.post("/api/v1/newentry", json=data).status_code == 201
+        assert client.post("/api/v1/newentry", json=data).status_code == 400
+
+    def test_fast_json_matches_regular_output(self, client, monkeypatch):
+        """The async fast path should return the same bytes."""
+        client.post("/api/v1/newentry", json={"word": "a", "definition": "ünï"})
+        regular = client.get("/api/v1/entries").content
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        assert client.get("/api/v1/entries").content == regular
+
+    def test_did_you_mean(self, client):
+        """A 404 should only carry suggestions when asked for them."""
+        client.post("/api/v1/newentry", json={"word": "python", "definition": "d"})
+        response = client.get("/api/v1/look/pyhton")
+        assert response.json()["detail"] == "Can't find entry for pyhton"
+        response = client.get("/api/v1/look/pyhton?suggest=true")
+        assert response.json()["detail"] == (
+            "Can't find entry for pyhton. Did you mean: python?"
+        )
@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.backend.cache import MISS, GenerationTable, LookupCache
+from src.backend.models import DictionaryEntry
+
+
+def _delete_in_other_worker(db_url: str, path: str, word: str) -> None:
+    """Delete a word the way a separate gunicorn worker would."""
+    engine = create_engine(db_url)
+    with Session(engine) as session:
+        entry = session.exec(
+            select(DictionaryEntry).where(DictionaryEntry.word == word)
+        ).one()
+        session.delete(entry)
+        session.commit()
+    LookupCache(10, 60, 5, GenerationTable(64, path)).invalidate(word)
+
+
+class TestLookupCache:
+    """Test the bounded LRU/TTL lookup cache."""
+
+    def test_get_unknown_word_is_a_miss(self):
+        """Words never stored should return the MISS sentinel."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        assert cache.get("apple") is MISS
+        assert cache.stats()["misses"] == 1
+
+    def test_put_then_get(self):
+        """A stored definition should be returned and counted as a hit."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        cache.put("apple", "A fruit", cache.generation("apple"))
+        assert cache.get("apple") == "A fruit"
+        assert cache.stats()["hits"] == 1
+
+    def test_negative_entry(self):
+        """A cached 404 should be returned as None, not MISS."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        cache.put("ghost", None, cache.generation("ghost"))
+        assert cache.get("ghost") is None
+
+    def test_expired_entry_is_a_miss(self):
+        """Entries past their TTL should be dropped."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=0.0001)
+        cache.put("ghost", None, cache.generation("ghost"))
+        cache._data["ghost"] = (None, 0.0, cache.generation("ghost"))
+        assert cache.get("ghost") is MISS
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        """The least recently used word should be evicted first."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        cache.put("a", "1", cache.generation("a"))
+        cache.put("b", "2", cache.generation("b"))
+        cache.get("a")
+        cache.put("c", "3", cache.generation("c"))
+        assert cache.get("b") is MISS
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate(self):
+        """Invalidated words should no longer be served."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        cache.put("a", "1", cache.generation("a"))
+        cache.invalidate("a")
+        assert cache.get("a") is MISS
+
+    def test_fill_racing_a_write_is_discarded(self):
+        """A put with a generation taken before a write should be ignored."""
+        cache = LookupCache(maxsize=2, ttl=60, negative_ttl=5)
+        generation = cache.generation("a")
+        cache.invalidate("a")
+        cache.put("a", "stale", generation)
+        assert cache.get("a") is MISS
+
+    def test_disabled_cache(self):
+        """A cache with maxsize 0 should never store anything."""
+        cache = LookupCache(maxsize=0, ttl=60, negative_ttl=5)
+        cache.put("a", "1", cache.generation("a"))
+        assert cache.get("a") is MISS
+
+
+class TestGenerationTable:
+    """Test the invalidation counters shared between worker processes."""
+
+    def test_bump_changes_only_that_word(self):
+        """Bumping a word should not change an unrelated bucket."""
+        table = GenerationTable(slots=1 << 16)
+        before = table.read("b")
+        table.bump("a")
+        assert table.read("b") == before
+
+    def test_clear_bumps_epoch(self):
+        """A global bump should change the generation of every word."""
+        table = GenerationTable(slots=64)
+        before = table.read("a")
+        table.bump()
+        assert table.read("a") != before
+
+    def test_mmap_tables_see_each_other(self, tmp_path):
+        """Two tables mapping the same file should share counters."""
+        path = str(tmp_path / "generations.bin")
+        first = GenerationTable(slots=64, path=path)
+        second = GenerationTable(slots=64, path=path)
+        assert first.shared and second.shared
+
+        first.bump("apple")
+        assert second.read("apple") == first.read("apple")
+
+    def test_invalidation_from_another_worker_process(self, tmp_path):
+        """A delete in another process should evict the word from our cache."""
+        db_url = f"sqlite:///{tmp_path / 'dictionary.db'}"
+        path = str(tmp_path / "generations.bin")
+        engine = create_engine(db_url)
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(DictionaryEntry(word="apple", definition="A fruit"))
+            session.commit()
+
+        cache = LookupCache(10, 60, 5, GenerationTable(64, path))
+        cache.put("apple", "A fruit", cache.generation("apple"))
+        assert cache.get("apple") == "A fruit"
+
+        worker = multiprocessing.get_context("spawn").Process(
+            target=_delete_in_other_worker, args=(db_url, path, "apple")
+        )
+        worker.start()
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+        assert cache.get("apple") is MISS
+
+    def test_bumps_stay_exclusive_after_fork(self, tmp_path):
+        """Forked workers sharing a table should not lose each other's bumps."""
+        table = GenerationTable(slots=64, path=str(tmp_path / "generations.bin"))
+        pid = os.fork()
+        for _ in range(2000):
+            table.bump("apple")
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert table.writes() == 4000
@@ -0,0 +1,90 @@
+import multiprocessing
+
+import pytest
+
+from src.exercises.compact_dictionary import CompactDictionary, FrozenDictionary
+
+
+def _look_in_other_process(path: str, word: str) -> str:
+    with FrozenDictionary(path) as frozen:
+        return frozen.look(word)
+
+
+class TestCompactDictionary:
+    """Test the buffer-backed dictionary against the Dictionary behaviour."""
+
+    def test_look_existing_and_missing(self):
+        d = CompactDictionary()
+        d.newentry("Apple", "A fruit that grows on trees")
+        assert d.look("Apple") == "A fruit that grows on trees"
+        assert d.look("apple") == "Can't find entry for apple"
+        assert len(d) == 1
+
+    def test_overwrite_existing_entry(self):
+        """Adding the same word again should overwrite the old definition."""
+        d = CompactDictionary()
+        d.newentry("Apple", "First definition")
+        d.newentry("Apple", "Second definition")
+        assert d.look("Apple") == "Second definition"
+        assert len(d) == 1
+
+    def test_empty_and_non_ascii(self):
+        d = CompactDictionary()
+        d.newentry("", "empty word")
+        d.newentry("café", "")
+        d.newentry("🐍", "snake ✓")
+        assert d.look("") == "empty word"
+        assert d.look("café") == ""
+        assert d.look("🐍") == "snake ✓"
+
+    def test_many_entries_survive_resizes(self):
+        """Every word should still be found after the index grew many times."""
+        d = CompactDictionary()
+        for i in range(5000):
+            d.newentry(f"word{i}", f"definition {i}")
+        assert len(d) == 5000
+        assert all(d.look(f"word{i}") == f"definition {i}" for i in range(5000))
+        assert "word5000" not in d
+        assert list(d.items())[:2] == [
+            ("word0", "definition 0"),
+            ("word1", "definition 1"),
+        ]
+
+
+class TestFrozenDictionary:
+    """Test freezing into an mmap'ed file."""
+
+    @pytest.fixture
+    def frozen(self, tmp_path):
+        d = CompactDictionary()
+        for i in range(1000):
+            d.newentry(f"word{i}", f"definition {i} ✓")
+        d.newentry("word7", "replaced")
+        frozen = d.freeze(str(tmp_path / "words.cdict"))
+        yield frozen
+        frozen.close()
+
+    def test_lookups_match(self, frozen):
+        assert len(frozen) == 1000
+        assert frozen.look("word999") == "definition 999 ✓"
+        assert frozen.look("word7") == "replaced"
+        assert frozen.look("nope") == "Can't find entry for nope"
+
+    def test_is_read_only(self, frozen):
+        with pytest.raises(TypeError):
+            frozen.newentry("new", "word")
+
+    def test_opened_by_another_process(self, frozen, tmp_path):
+        """The index must not depend on the per-process hash() salt."""
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(1) as pool:
+            result = pool.apply(
+                _look_in_other_process, (str(tmp_path / "words.cdict"), "word42")
+            )
+        assert result == "definition 42 ✓"
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            FrozenDictionary(str(path))
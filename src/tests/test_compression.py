@@ -0,0 +1,127 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from src.backend.compression import CompressionMiddleware
+from src.backend.config import settings
+from src.backend.negotiation import choose, parse_accept
+
+LARGE = b'{"word": "w", "definition": "d"}' * 100
+
+
+def _large(request):
+    return Response(LARGE, media_type="application/json", headers={"ETag": '"e1"'})
+
+
+def _small(request):
+    return Response(b"{}", media_type="application/json")
+
+
+def _image(request):
+    return Response(LARGE, media_type="image/png")
+
+
+def _stream(request):
+    def chunks():
+        for _ in range(5):
+            yield LARGE
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+app = Starlette(
+    routes=[
+        Route("/large", _large),
+        Route("/small", _small),
+        Route("/image", _image),
+        Route("/stream", _stream),
+    ]
+)
+app.add_middleware(CompressionMiddleware)
+client = TestClient(app)
+
+
+class TestNegotiation:
+    """Test the Accept/Accept-Encoding parsing."""
+
+    def test_parse_q_values(self):
+        assert parse_accept("gzip;q=0.5, br , zstd;q=x") == [
+            ("gzip", 0.5),
+            ("br", 1.0),
+            ("zstd", 0.0),
+        ]
+
+    def test_client_preference_wins(self):
+        """The highest q wins; ties go to the first offered value."""
+        assert choose("gzip;q=0.5, zstd", ["gzip", "zstd"]) == "zstd"
+        assert choose("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+
+    def test_most_specific_match_decides(self):
+        """A wildcard should not override an explicit entry."""
+        assert choose("*;q=0, gzip", ["zstd", "gzip"]) == "gzip"
+        assert choose("*/*, application/json;q=0", ["application/json", "a/b"]) == (
+            "a/b"
+        )
+        assert choose("application/*", ["text/csv", "application/json"]) == (
+            "application/json"
+        )
+
+    def test_nothing_acceptable(self):
+        assert choose("br", ["zstd", "gzip"]) is None
+        assert choose(None, ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    """Test which responses get compressed and how."""
+
+    def test_large_response_is_gzipped(self):
+        """Above the threshold the body is compressed and the ETag weakened."""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["ETag"] == 'W/"e1"'
+        assert int(response.headers["Content-Length"]) < len(LARGE) / 10
+        assert response.content == LARGE
+
+    def test_small_response_is_untouched(self):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert response.content == b"{}"
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    def test_incompressible_type_is_untouched(self):
+        response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+        assert "Vary" not in response.headers
+
+    def test_identity_without_accept_encoding(self):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["ETag"] == '"e1"'
+        # A shared cache must not hand this copy to a gzip-capable client
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "COMPRESSION_ENABLED", False)
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_stream_is_compressed_incrementally(self):
+        """Streamed bodies should decode to the concatenated chunks."""
+        with client.stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(raw) == LARGE * 5
+
+    def test_zstd_preferred_when_installed(self):
+        pytest.importorskip("zstandard")
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, zstd"})
+        assert response.headers["Content-Encoding"] == "zstd"
+        # httpx decodes zstd with the same package
+        assert response.content == LARGE
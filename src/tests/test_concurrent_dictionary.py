@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from src.exercises.concurrent_dictionary import ConcurrentDictionary
+
+
+class TestConcurrentDictionary:
+    """Test the single-threaded Dictionary behaviour and the batch methods."""
+
+    def test_look_existing_and_missing(self):
+        d = ConcurrentDictionary()
+        d.newentry("Apple", "A fruit that grows on trees")
+        assert d.look("Apple") == "A fruit that grows on trees"
+        assert d.look("apple") == "Can't find entry for apple"
+        assert len(d) == 1
+
+    def test_overwrite_existing_entry(self):
+        d = ConcurrentDictionary()
+        d.newentry("Apple", "First definition")
+        d.newentry("Apple", "Second definition")
+        assert d.look("Apple") == "Second definition"
+        assert len(d) == 1
+
+    def test_newentries_and_look_many(self):
+        """Batches should behave like repeated newentry and look calls."""
+        d = ConcurrentDictionary(stripes=4)
+        d.newentries((f"w{i}", f"d{i}") for i in range(100))
+        d.newentries([("w1", "first"), ("w1", "last")])
+        assert len(d) == 100
+        assert d.look_many(["w0", "w1", "nope"]) == [
+            "d0",
+            "last",
+            "Can't find entry for nope",
+        ]
+        assert d.snapshot() == {**{f"w{i}": f"d{i}" for i in range(100)}, "w1": "last"}
+
+    def test_stripes_must_be_a_power_of_two(self):
+        with pytest.raises(ValueError):
+            ConcurrentDictionary(stripes=3)
+
+
+class TestConcurrentAccess:
+    """Test that concurrent writers lose nothing and readers see no gaps."""
+
+    def test_concurrent_writers_lose_no_updates(self):
+        """Writers hitting the same stripes must not drop each other's copies."""
+        d = ConcurrentDictionary(stripes=2)
+        start = threading.Barrier(8)
+
+        def write(thread):
+            start.wait()
+            for i in range(500):
+                d.newentry(f"t{thread}-{i}", "x")
+            d.newentries((f"b{thread}-{i}", "y") for i in range(500))
+
+        threads = [threading.Thread(target=write, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(d) == 8 * 1000
+
+    def test_readers_always_see_existing_words(self):
+        """Words present before the writes should never look missing."""
+        d = ConcurrentDictionary(stripes=4)
+        d.newentries((f"old{i}", "kept") for i in range(200))
+        stop = threading.Event()
+        misses = []
+
+        def read():
+            while not stop.is_set():
+                results = d.look_many(f"old{i}" for i in range(200))
+                misses.extend(r for r in results if r != "kept")
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(2000):
+            d.newentry(f"new{i}", "added")
+        stop.set()
+        for reader in readers:
+            reader.join()
+        assert misses == []
@@ -0,0 +1,84 @@
+import asyncio
+
+from sqlmodel import create_engine
+
+from src.backend.health import HealthProbe
+
+
+def _probe(tmp_path, url=None, **kwargs) -> HealthProbe:
+    engine = create_engine(url or f"sqlite:///{tmp_path / 'health.db'}")
+    return HealthProbe(
+        interval=0.01, timeout=2, failure_threshold=2, engine=engine, **kwargs
+    )
+
+
+class TestHealthProbe:
+    """Test the cached background DB probe."""
+
+    def test_not_ready_before_first_probe(self, tmp_path):
+        """Without any probe result the pod must not be reported ready."""
+        probe = _probe(tmp_path)
+        assert not probe.ready
+        assert probe.status()["database"] == "unknown"
+
+    def test_successful_probe(self, tmp_path):
+        """A reachable DB should make the probe ready and record its latency."""
+        probe = _probe(tmp_path)
+        asyncio.run(probe.check())
+        assert probe.ready
+        status = probe.status()
+        assert status["database"] == "connected"
+        assert status["probe_latency_ms"] >= 0
+
+    def test_failures_flip_readiness_after_threshold(self, tmp_path):
+        """Readiness should only be lost after consecutive failures."""
+        probe = _probe(tmp_path, url=f"sqlite:///{tmp_path / 'missing' / 'x.db'}")
+        probe.ever_ok = True
+        asyncio.run(probe.check())
+        assert probe.ready
+        assert probe.status()["database"] == "disconnected"
+        asyncio.run(probe.check())
+        assert not probe.ready
+        assert "OperationalError" in probe.status()["last_error"]
+
+    def test_not_ready_until_first_success(self, tmp_path):
+        """A pod whose DB was never reachable should not become ready."""
+        probe = _probe(tmp_path, url=f"sqlite:///{tmp_path / 'missing' / 'x.db'}")
+        asyncio.run(probe.check())
+        assert not probe.ready
+
+    def test_pool_exhaustion_is_reported_but_ready(self, tmp_path):
+        """A busy request pool is load, not an unreachable DB."""
+        busy = create_engine(
+            f"sqlite:///{tmp_path / 'busy.db'}", pool_size=1, max_overflow=0
+        )
+        probe = _probe(tmp_path, pool=busy.pool)
+        with busy.connect():
+            asyncio.run(probe.check())
+            asyncio.run(probe.check())
+            assert probe.status()["pool_exhausted"]
+            assert probe.ready
+
+        asyncio.run(probe.check())
+        assert not probe.status()["pool_exhausted"]
+
+    def test_stale_result_is_not_ready(self, tmp_path):
+        """A probe that stopped reporting should not keep the pod ready."""
+        probe = _probe(tmp_path)
+        asyncio.run(probe.check())
+        probe.checked_at -= 60
+        assert not probe.ready
+
+    def test_background_task_keeps_probing(self, tmp_path):
+        """start() should probe immediately and then on every interval."""
+        probe = _probe(tmp_path)
+
+        async def run():
+            await probe.start()
+            first = probe.checked_at
+            await asyncio.sleep(0.2)
+            assert probe.checked_at > first
+            await probe.stop()
+
+        asyncio.run(run())
+        assert probe.ready
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.dialects import mysql, sqlite
+
+from src.backend.ingest import (
+    ConflictPolicy,
+    insert_statement,
+    parse_csv_line,
+    parse_ndjson_line,
+)
+
+ROWS = [{"word": "a", "definition": "1"}, {"word": "b", "definition": "2"}]
+
+
+def _sql(dialect_name, policy, dialect):
+    return str(insert_statement(dialect_name, ROWS, policy).compile(dialect=dialect))
+
+
+class TestInsertStatement:
+    """Test the dialect-specific multi-row INSERT statements."""
+
+    def test_mysql_skip_uses_insert_ignore(self):
+        """MariaDB should skip conflicts with INSERT IGNORE, keeping rowcount exact."""
+        assert _sql("mysql", ConflictPolicy.SKIP, mysql.dialect()).startswith(
+            "INSERT IGNORE"
+        )
+
+    def test_mysql_overwrite_uses_on_duplicate_key(self):
+        """MariaDB should overwrite with ON DUPLICATE KEY UPDATE."""
+        sql = _sql("mysql", ConflictPolicy.OVERWRITE, mysql.dialect())
+        assert "ON DUPLICATE KEY UPDATE definition" in sql
+
+    def test_sqlite_skip_uses_on_conflict(self):
+        """SQLite should skip conflicts with ON CONFLICT DO NOTHING."""
+        sql = _sql("sqlite", ConflictPolicy.SKIP, sqlite.dialect())
+        assert "ON CONFLICT (word) DO NOTHING" in sql
+
+    def test_multi_row_values(self):
+        """All rows should go into a single INSERT statement."""
+        sql = _sql("sqlite", ConflictPolicy.FAIL, sqlite.dialect())
+        assert sql.count("INSERT") == 1
+        assert sql.count("(?, ?, ?, ?)") == 2
+
+    def test_unsupported_dialect(self):
+        """Only FAIL can be expressed without dialect-specific syntax."""
+        with pytest.raises(ValueError):
+            insert_statement("oracle", ROWS, ConflictPolicy.SKIP)
+
+
+class TestParsers:
+    """Test the NDJSON and CSV line parsers."""
+
+    def test_ndjson(self):
+        assert parse_ndjson_line('{"word": "a", "definition": "1"}') == ROWS[0]
+
+    def test_ndjson_rejects_missing_definition(self):
+        with pytest.raises(ValueError):
+            parse_ndjson_line('{"word": "a"}')
+
+    def test_rejects_overlong_values(self):
+        with pytest.raises(ValueError):
+            parse_csv_line("a," + "x" * 256)
+
+    def test_csv(self):
+        assert parse_csv_line('a,"1"') == ROWS[0]
+
+    def test_csv_rejects_extra_columns(self):
+        with pytest.raises(ValueError):
+            parse_csv_line("a,1,2")
@@ -0,0 +1,38 @@
+import asyncio
+
+from benchmarks import loadtest
+from src.backend.cache import lookup_cache
+from src.main import app
+
+
+def _run(tmp_path, *argv) -> dict:
+    args = loadtest.parse_args(
+        ["--seed", "50", "--concurrency", "8", "--sqlite", str(tmp_path / "load.db")]
+        + list(argv)
+    )
+    return asyncio.run(loadtest.main_async(args))
+
+
+class TestLoadTest:
+    """Smoke test the load test harness against the in-process app."""
+
+    def test_write_heavy_mix(self, tmp_path, monkeypatch):
+        """Concurrent creates and deletes should run without any errors."""
+        monkeypatch.setattr(app, "dependency_overrides", {})
+        result = _run(
+            tmp_path, "--requests", "200", "--mix", "look=50,create=25,delete=25"
+        )
+        assert result["total"]["requests"] == 200
+        assert result["total"]["errors"] == 0
+        assert set(result["operations"]) == {"look", "create", "delete"}
+
+    def test_app_errors_are_counted(self, tmp_path, monkeypatch):
+        """An exception in the app should count as an error, not end the run."""
+        monkeypatch.setattr(app, "dependency_overrides", {})
+
+        def broken(word):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(lookup_cache, "get", broken)
+        result = _run(tmp_path, "--requests", "20", "--mix", "look=1")
+        assert result["operations"]["look"]["errors"] == 20
@@ -0,0 +1,140 @@
+import multiprocessing
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine
+
+from src.backend.metrics import Metrics, TimedQueuePool, instrument_engine
+
+
+def _record_in_other_worker(directory: str) -> None:
+    """Record metrics the way a separate gunicorn worker would."""
+    metrics = Metrics(directory)
+    metrics.inc("http_requests_total", (("route", "/a"),), 2)
+    metrics.observe("http_request_duration_seconds", (("route", "/a"),), 0.02)
+    metrics.set("db_pool_checked_out", (), 3)
+
+
+def _sample(metrics: Metrics, name: str, labels: tuple = ()) -> float:
+    return metrics.collect().get((name, tuple(sorted(labels))), 0.0)
+
+
+class TestMetrics:
+    """Test per-worker metric files and their aggregation."""
+
+    def test_counters_sum_across_workers(self, tmp_path):
+        """Counters from every worker file should be added up."""
+        first = Metrics(str(tmp_path), pid=1)
+        second = Metrics(str(tmp_path), pid=2)
+        first.inc("http_requests_total", (("route", "/a"),))
+        second.inc("http_requests_total", (("route", "/a"),), 4)
+        second.inc("http_requests_total", (("route", "/b"),))
+
+        assert _sample(first, "http_requests_total", (("route", "/a"),)) == 5
+        assert _sample(first, "http_requests_total", (("route", "/b"),)) == 1
+
+    def test_gauges_of_dead_workers_are_dropped(self, tmp_path):
+        """A recycled worker's gauges should vanish but its counters stay."""
+        dead = multiprocessing.get_context("spawn").Process(target=len, args=((),))
+        dead.start()
+        dead.join(timeout=30)
+
+        gone = Metrics(str(tmp_path), pid=dead.pid)
+        gone.set("db_pool_checked_out", (), 7)
+        gone.inc("http_requests_total")
+        live = Metrics(str(tmp_path))
+        live.set("db_pool_checked_out", (), 2)
+
+        assert _sample(live, "db_pool_checked_out") == 2
+        assert _sample(live, "http_requests_total") == 1
+
+    def test_histogram_renders_cumulative_buckets(self, tmp_path):
+        """Observations should render as cumulative le buckets with sum and count."""
+        metrics = Metrics(str(tmp_path))
+        labels = (("method", "GET"), ("route", "/x"))
+        metrics.observe("http_request_duration_seconds", labels, 0.003)
+        metrics.observe("http_request_duration_seconds", labels, 0.2)
+        metrics.observe("http_request_duration_seconds", labels, 60)
+
+        text = metrics.render()
+        assert "# TYPE http_request_duration_seconds histogram" in text
+        prefix = 'http_request_duration_seconds_bucket{method="GET",route="/x",'
+        assert prefix + 'le="0.001"} 0' in text
+        assert prefix + 'le="0.005"} 1' in text
+        assert prefix + 'le="0.25"} 2' in text
+        assert prefix + 'le="+Inf"} 3' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/x"} 3' in text
+
+    def test_file_grows_past_initial_size(self, tmp_path):
+        """Many label sets should not overflow the mmap'ed file."""
+        metrics = Metrics(str(tmp_path))
+        for i in range(5000):
+            metrics.inc("http_requests_total", (("route", f"/route/{i}"),))
+        assert _sample(metrics, "http_requests_total", (("route", "/route/4999"),)) == 1
+
+    def test_aggregates_another_worker_process(self, tmp_path):
+        """Samples written by another process should show up in our render."""
+        metrics = Metrics(str(tmp_path))
+        metrics.inc("http_requests_total", (("route", "/a"),))
+
+        worker = multiprocessing.get_context("spawn").Process(
+            target=_record_in_other_worker, args=(str(tmp_path),)
+        )
+        worker.start()
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+        assert _sample(metrics, "http_requests_total", (("route", "/a"),)) == 3
+        assert (
+            _sample(metrics, "http_request_duration_seconds_count", (("route", "/a"),))
+            == 1
+        )
+        # The worker has exited, so its pool gauge no longer counts
+        assert _sample(metrics, "db_pool_checked_out") == 0
+
+    def test_instrumented_engine_records_queries_and_pool(self, tmp_path, monkeypatch):
+        """Statement timings and pool gauges should be published for an engine."""
+        metrics = Metrics(str(tmp_path / "metrics"))
+        monkeypatch.setattr("src.backend.metrics.metrics", metrics)
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'metrics.db'}",
+            poolclass=TimedQueuePool,
+            pool_logging_name="primary",
+        )
+        pool = (("pool", "primary"),)
+        instrument_engine(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert _sample(metrics, "db_pool_checked_out", pool) == 1
+
+        assert _sample(metrics, "db_pool_checked_out", pool) == 0
+        assert (
+            _sample(
+                metrics, "db_query_duration_seconds_count", (("statement", "SELECT"),)
+            )
+            == 1
+        )
+        assert _sample(metrics, "db_pool_wait_seconds_count", pool) == 1
+
+    def test_failed_statements_leave_no_timing_state(self, tmp_path, monkeypatch):
+        """A statement that raises should not leave its start time on the connection."""
+        metrics = Metrics(str(tmp_path / "metrics"))
+        monkeypatch.setattr("src.backend.metrics.metrics", metrics)
+        engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+        instrument_engine(engine)
+
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+            assert "query_start" not in conn.info
+
+        assert (
+            _sample(
+                metrics, "db_query_duration_seconds_count", (("statement", "SELECT"),)
+            )
+            == 1
+        )
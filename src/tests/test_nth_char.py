@@ -1,5 +1,30 @@
+import random
+
 import pytest
-from src.exercises.nth_char import nth_char
+
+from src.exercises.nth_char import iter_nth_char, nth_char, nth_char_batch
+
+
+def _concat_nth_char(words):
+    """The original concatenating implementation, as the reference."""
+    result = ""
+    for n, word in enumerate(words):
+        try:
+            result += word[n]
+        except IndexError:
+            break
+    return result
+
+
+def _random_lists(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        [
+            "".join(rng.choice("aé🐍bc") for _ in range(rng.randrange(n + 3)))
+            for n in range(rng.randrange(12))
+        ]
+        for _ in range(count)
+    ]
 
 
 class TestBasicFunctionality:
@@ -153,3 +178,35 @@ class TestVerifyIndexing:
         # n=2: [2] = "2"
         # n=3: [3] = "3"
         assert result == "0123"
+
+
+class TestBatchAndStreaming:
+    """Test the batch, generator and process-pool variants."""
+
+    def test_matches_original_implementation(self):
+        """Early stops on short words should be preserved exactly."""
+        for words in _random_lists(500):
+            assert nth_char(words) == _concat_nth_char(words)
+            assert "".join(iter_nth_char(iter(words))) == _concat_nth_char(words)
+
+    def test_stream_stops_at_short_word(self):
+        """The generator should not read past the word that ends the result."""
+        consumed = []
+
+        def words():
+            for word in ["ab", "cd", "e", "never"]:
+                consumed.append(word)
+                yield word
+
+        assert "".join(iter_nth_char(words())) == "ad"
+        assert consumed == ["ab", "cd", "e"]
+
+    def test_batch_in_order(self):
+        lists = _random_lists(100)
+        assert list(nth_char_batch(lists)) == [_concat_nth_char(w) for w in lists]
+
+    def test_batch_with_process_pool(self):
+        """Results from worker processes should come back in input order."""
+        lists = _random_lists(300, seed=1)
+        results = nth_char_batch(iter(lists), processes=2, chunksize=16)
+        assert list(results) == [_concat_nth_char(w) for w in lists]
@@ -0,0 +1,21 @@
+import pytest
+
+from src.backend.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Test the opaque cursor encoding."""
+
+    def test_round_trip(self):
+        """A decoded cursor should give back the id it was built from."""
+        assert decode_cursor(encode_cursor(12345)) == 12345
+
+    def test_cursor_is_opaque(self):
+        """The cursor should not expose the raw id."""
+        assert encode_cursor(42) != "42"
+
+    @pytest.mark.parametrize("cursor", ["garbage", "!!", encode_cursor(1)[:-2]])
+    def test_invalid_cursor(self, cursor):
+        """Cursors we did not issue should raise InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
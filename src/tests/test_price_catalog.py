@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from src.exercises import price_catalog
+from src.exercises.price_catalog import PriceCatalog
+from src.exercises.spending import get_total
+
+
+def _random_case(seed: int, baskets: int = 2000):
+    rng = random.Random(seed)
+    costs = {
+        f"item{i}": rng.choice(
+            [
+                round(rng.uniform(0, 100), 2),
+                rng.randrange(50),
+                0.005 * rng.randrange(1000),
+                round(rng.uniform(0, 1), 3),
+            ]
+        )
+        for i in range(100)
+    }
+    # Item ids past 99 are not in the catalog
+    carts = [
+        [f"item{rng.randrange(110)}" for _ in range(rng.randrange(10))]
+        for _ in range(baskets)
+    ]
+    return costs, carts
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with NumPy and with the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(price_catalog, "np", None)
+    return request.param
+
+
+class TestPriceCatalog:
+    """Test that batch totals equal get_total exactly."""
+
+    @pytest.mark.parametrize("tax", [0.0, 0.09, 0.0825, 0.5])
+    def test_matches_get_total(self, backend, tax):
+        costs, carts = _random_case(seed=int(tax * 10_000))
+        totals = PriceCatalog(costs).totals(carts, tax)
+        assert list(totals) == [get_total(costs, cart, tax) for cart in carts]
+
+    def test_half_cent_prices(self, backend):
+        """round() works on the exact value, which rint(x * 100) gets wrong here."""
+        costs = {"a": 0.005, "b": 0.015, "c": 0.025, "d": 0.075}
+        carts = [["a"], ["b"], ["c"], ["d"], ["a", "b", "c", "d"]]
+        totals = PriceCatalog(costs).totals(carts, 0)
+        assert list(totals) == [get_total(costs, cart, 0) for cart in carts]
+        assert list(totals)[:4] == [0.01, 0.01, 0.03, 0.07]
+
+    def test_per_basket_tax(self, backend):
+        costs = {"socks": 5, "shoes": 60, "sweater": 30}
+        carts = [["socks", "shoes"], ["sweater"], [], ["unknown"]]
+        taxes = [0.09, 0.2, 0.1, 0.1]
+        assert list(PriceCatalog(costs).totals(carts, taxes)) == [70.85, 36.0, 0, 0]
+
+    def test_encoded_baskets_can_be_priced_again(self, backend):
+        """Encoding once and pricing with other taxes should give the same totals."""
+        costs, carts = _random_case(seed=7, baskets=200)
+        catalog = PriceCatalog(costs)
+        ids, offsets = catalog.encode(carts)
+        for tax in (0.05, 0.07):
+            assert list(catalog.totals_encoded(ids, offsets, tax)) == [
+                get_total(costs, cart, tax) for cart in carts
+            ]
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+from src.backend.profiling import by_package, parse_importtime, process_age
+from src.main import create_app
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   sqlalchemy.sql
+import time:        50 |        150 | sqlalchemy
+import time:        30 |         30 | fastapi
+"""
+
+
+class TestStartupProfiling:
+    """Test the startup profiling helpers and the app factory."""
+
+    def test_parse_importtime(self):
+        """Every module line should be parsed, the header skipped."""
+        costs = parse_importtime(IMPORTTIME)
+        assert [c.module for c in costs] == ["sqlalchemy.sql", "sqlalchemy", "fastapi"]
+        assert costs[1].cumulative_us == 150
+
+    def test_by_package(self):
+        """Self times should be summed per top-level package, costliest first."""
+        totals = by_package(parse_importtime(IMPORTTIME))
+        assert totals == {"sqlalchemy": 150, "fastapi": 30}
+
+    def test_process_age(self):
+        assert 0 < process_age() < 24 * 3600
+
+    def test_factory_builds_independent_apps(self):
+        """Each call should return a new, fully routed app."""
+        first, second = create_app(), create_app()
+        assert first is not second
+        paths = set(first.openapi()["paths"])
+        assert {"/health/live", "/metrics", "/api/v1/look/{word}"} <= paths
+
+    def test_import_creates_no_engine(self):
+        """Importing the app must not create an engine (preload safety)."""
+        code = (
+            "import src.main, src.backend.database as d, sys; "
+            "sys.exit(d._engine is not None or 'sqlalchemy.ext.asyncio' in sys.modules)"
+        )
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.backend import database
+from src.backend.cache import lookup_cache
+from src.backend.config import settings
+from src.backend.database import ReplicaSet, get_session
+from src.backend.models import DictionaryEntry
+from src.backend.search import word_index
+from src.main import app
+
+
+def _sqlite(path, rows) -> str:
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(DictionaryEntry(word=w, definition=d) for w, d in rows)
+        session.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """A primary and two replica SQLite files that deliberately disagree."""
+    primary = create_engine(
+        _sqlite(tmp_path / "primary.db", [("word", "primary")]),
+        connect_args={"check_same_thread": False},
+    )
+    urls = [
+        _sqlite(tmp_path / f"replica{i}.db", [("word", f"replica{i}")])
+        for i in range(2)
+    ]
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", urls)
+    monkeypatch.setattr(settings, "DB_REPLICA_STRATEGY", "round_robin")
+    monkeypatch.setattr(database, "_replicas", None)
+    lookup_cache.clear()
+    word_index.reset()
+
+    def override_get_session():
+        with Session(primary) as session:
+            yield session
+
+    previous = app.dependency_overrides.get(get_session)
+    app.dependency_overrides[get_session] = override_get_session
+    yield TestClient(app)
+    if previous is None:
+        del app.dependency_overrides[get_session]
+    else:
+        app.dependency_overrides[get_session] = previous
+    database._replicas.dispose()
+
+
+def _definition(client) -> str:
+    return client.get("/api/v1/entries").json()[0]["definition"]
+
+
+class TestReplicaRouting:
+    """Test that reads go to replicas and writes to the primary."""
+
+    def test_reads_round_robin_over_replicas(self, replicated):
+        """Consecutive reads should alternate between the replicas."""
+        seen = [_definition(replicated) for _ in range(4)]
+        assert seen == ["replica0", "replica1", "replica0", "replica1"]
+
+    def test_writes_go_to_primary(self, replicated, monkeypatch):
+        """Creating an entry should only touch the primary."""
+        monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+        response = replicated.post(
+            "/api/v1/newentry", json={"word": "new", "definition": "d"}
+        )
+        assert response.status_code == 201
+        assert "db_read_primary_until" not in response.cookies
+        # The replicas never saw it: no replication between the SQLite files
+        assert replicated.get("/api/v1/look/new").status_code == 404
+
+    def test_read_your_writes(self, replicated):
+        """After a write the same client should read from the primary."""
+        replicated.post("/api/v1/newentry", json={"word": "new", "definition": "d"})
+        assert _definition(replicated) == "primary"
+        assert replicated.get("/api/v1/look/new").json()["definition"] == "d"
+
+        replicated.cookies.clear()
+        assert _definition(replicated).startswith("replica")
+
+    def test_read_your_writes_through_lookup_cache(self, replicated):
+        """
+        Another client caching the replica's row after a write shouldn't hide
+        the write from the writer, and that entry should only live briefly.
+        """
+        writer = replicated
+        assert (
+            writer.put("/api/v1/entries/word", json={"definition": "new"}).status_code
+            == 200
+        )
+
+        other = TestClient(app)
+        assert other.get("/api/v1/look/word").json()["definition"] == "replica0"
+        assert other.get("/api/v1/look/word").json()["definition"] == "replica0"
+        _, expires, _ = lookup_cache._data["word"]
+        assert expires <= time.monotonic() + settings.READ_YOUR_WRITES_SECONDS
+
+        assert writer.get("/api/v1/look/word").json()["definition"] == "new"
+        # The writer's read came from the primary, so it may be cached for others
+        assert other.get("/api/v1/look/word").json()["definition"] == "new"
+
+
+class TestReplicaSet:
+    """Test the replica picking strategies."""
+
+    def test_least_loaded_prefers_idle_replica(self, tmp_path):
+        """A replica with a checked-out connection should be avoided."""
+        urls = [_sqlite(tmp_path / f"r{i}.db", []) for i in range(2)]
+        replicas = ReplicaSet(urls, strategy="least_loaded")
+        busy, idle = replicas.engines
+        with busy.connect():
+            assert {replicas.pick() for _ in range(4)} == {idle}
+        assert {replicas.pick() for _ in range(4)} == {busy, idle}
+        replicas.dispose()
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import create_engine
+
+from src.backend import schema
+from src.backend.schema import backoff_delay, ensure_schema, wait_for_db
+
+
+class TestBackoff:
+    """Test the jittered exponential backoff used at startup."""
+
+    def test_delay_doubles_and_is_capped(self):
+        """Without jitter the delay should double per attempt up to the cap."""
+        delays = [backoff_delay(a, 0.5, 3.0, rng=lambda: 1.0) for a in range(5)]
+        assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    def test_jitter_stays_within_half_the_delay(self):
+        """Equal jitter should never go below half the nominal delay."""
+        assert backoff_delay(2, 0.5, 10, rng=lambda: 0.0) == 1.0
+
+    def test_retries_until_db_answers(self, monkeypatch):
+        """Connection errors should be retried without blocking the loop."""
+        calls = []
+
+        def flaky_ping(engine):
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError("SELECT 1", {}, Exception("refused"))
+
+        monkeypatch.setattr(schema, "_ping", flaky_ping)
+        attempts = asyncio.run(wait_for_db(None, 5, 0.001, 0.01))
+        assert attempts == 3
+
+    def test_gives_up_after_max_attempts(self, monkeypatch):
+        """The last connection error should be raised."""
+
+        def down(engine):
+            raise OperationalError("SELECT 1", {}, Exception("refused"))
+
+        monkeypatch.setattr(schema, "_ping", down)
+        with pytest.raises(OperationalError):
+            asyncio.run(wait_for_db(None, 3, 0.001, 0.01))
+
+
+class TestEnsureSchema:
+    """Test the once-per-pod schema step."""
+
+    def test_only_first_worker_creates_schema(self, tmp_path):
+        """Later workers should find the marker and skip create_all."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+        state_dir = str(tmp_path / "state")
+
+        assert ensure_schema(engine, state_dir) is True
+        assert "dictionaryentry" in inspect(engine).get_table_names()
+        assert ensure_schema(engine, state_dir) is False
+
+    def test_other_database_is_created_again(self, tmp_path):
+        """The marker is bound to the database it was written for."""
+        state_dir = str(tmp_path / "state")
+        ensure_schema(create_engine(f"sqlite:///{tmp_path / 'a.db'}"), state_dir)
+        other = create_engine(f"sqlite:///{tmp_path / 'b.db'}")
+        assert ensure_schema(other, state_dir) is True
+
+    def test_missing_columns_are_added(self, tmp_path):
+        """A table from before versioning should gain version and updated_at."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE dictionaryentry (id INTEGER PRIMARY KEY, "
+                    "word VARCHAR NOT NULL UNIQUE, definition VARCHAR NOT NULL)"
+                )
+            )
+            conn.execute(text("INSERT INTO dictionaryentry VALUES (1, 'a', 'b')"))
+
+        assert ensure_schema(engine, str(tmp_path / "state")) is True
+        with engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT version, updated_at FROM dictionaryentry")
+            ).one()
+        assert row.version == 1
+        assert row.updated_at is not None
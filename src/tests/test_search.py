@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.backend import search
+from src.backend.cache import GenerationTable
+from src.backend.search import SortedWords, WordIndex
+
+
+class _FakeSession:
+    """
+    Stands in for a Session when building the index, and for the engine
+    and session a background rebuild opens (see ``fake_sessions``).
+    """
+
+    def __init__(self, words, delay=0.0):
+        self.words = words
+        self.delay = delay
+        self.loads = 0
+
+    def exec(self, statement):
+        self.loads += 1
+        words = list(self.words)
+        time.sleep(self.delay)
+        return iter(words)
+
+    def get_bind(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeAsyncSession(_FakeSession):
+    async def stream_scalars(self, statement):
+        self.loads += 1
+        words = list(self.words)
+        await asyncio.sleep(self.delay)
+
+        async def rows():
+            for word in words:
+                yield word
+
+        return rows()
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    """Let background rebuilds use the fake session as their own."""
+    monkeypatch.setattr(search, "Session", lambda bind: bind)
+
+
+def _wait_for_rebuild(index):
+    if index._rebuilder is not None:
+        index._rebuilder.join()
+
+
+def _index(*words, compact_after=1000):
+    index = WordIndex(GenerationTable(slots=64), 0, compact_after=compact_after)
+    index.ensure_built(_FakeSession(words))
+    return index
+
+
+class TestSortedWords:
+    """Test the packed sorted word array."""
+
+    def test_sorted_and_deduplicated(self):
+        words = SortedWords(["pear", "apple", "fig", "apple"])
+        assert [words[i] for i in range(len(words))] == ["apple", "fig", "pear"]
+
+    def test_contains(self):
+        words = SortedWords(["apple", "fig"])
+        assert "fig" in words
+        assert "fi" not in words
+
+    def test_empty(self):
+        words = SortedWords([])
+        assert len(words) == 0
+        assert "a" not in words
+
+
+class TestWordIndex:
+    """Test prefix queries, incremental updates and suggestions."""
+
+    def test_prefix(self):
+        index = _index("python", "pytest", "java")
+        assert index.prefix("py", 10) == ["pytest", "python"]
+        assert index.prefix("x", 10) == []
+
+    def test_add_and_remove(self):
+        index = _index("python", "java")
+        index.add("pytest")
+        index.remove("python")
+        index.remove("never-there")
+        assert index.prefix("py", 10) == ["pytest"]
+        assert "java" in index and "python" not in index
+
+    def test_re_adding_a_deleted_word(self):
+        index = _index("python")
+        index.remove("python")
+        index.add("python")
+        assert index.prefix("", 10) == ["python"]
+
+    def test_compaction_keeps_contents(self):
+        index = _index("b", compact_after=2)
+        for word in ("a", "c", "d"):
+            index.add(word)
+        index.remove("b")
+        assert index.prefix("", 10) == ["a", "c", "d"]
+        assert len(index._added) + len(index._deleted) <= 2
+
+    def test_suggest_one_edit_away(self):
+        index = _index("python", "pylon", "java")
+        assert index.suggest("pyton", 5) == ["pylon", "python"]
+
+    def test_suggest_prefix_completion(self):
+        index = _index("international")
+        assert index.suggest("internat", 5) == ["international"]
+
+    def test_rebuilds_after_writes_from_other_workers(self, fake_sessions):
+        generations = GenerationTable(slots=64)
+        session = _FakeSession(["python"])
+        index = WordIndex(generations, min_rebuild_interval=0)
+        index.ensure_built(session)
+
+        index.ensure_built(session)
+        assert session.loads == 1
+
+        generations.bump("java")
+        session.words.append("java")
+        index.ensure_built(session)
+        _wait_for_rebuild(index)
+        assert session.loads == 2
+        assert "java" in index
+
+    def test_rebuilds_once_too_old(self, fake_sessions):
+        """Writes through other pods don't move this pod's counter."""
+        session = _FakeSession(["python"])
+        index = WordIndex(GenerationTable(slots=64), min_rebuild_interval=0, max_age=60)
+        index.ensure_built(session)
+        session.words.append("java")
+        index.ensure_built(session)
+        assert session.loads == 1
+
+        index._built_at -= 60
+        index.ensure_built(session)
+        _wait_for_rebuild(index)
+        assert session.loads == 2
+        assert "java" in index
+
+    def test_local_writes_do_not_rebuild(self):
+        generations = GenerationTable(slots=64)
+        session = _FakeSession(["python"])
+        index = WordIndex(generations, min_rebuild_interval=0)
+        index.ensure_built(session)
+
+        generations.bump("java")
+        index.add("java")
+        index.ensure_built(session)
+        assert session.loads == 1
+
+    def test_concurrent_builds_load_once(self):
+        """Requests arriving during the first build should wait for it."""
+        session = _FakeSession(["python"], delay=0.05)
+        index = WordIndex(GenerationTable(slots=64), min_rebuild_interval=0)
+        threads = [
+            threading.Thread(target=index.ensure_built, args=(session,))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert session.loads == 1
+        assert "python" in index
+
+    def test_rebuild_runs_off_the_request(self, fake_sessions):
+        """Stale checks should return at once, start one rebuild, serve the old index."""
+        generations = GenerationTable(slots=64)
+        session = _FakeSession(["python"], delay=0.2)
+        index = WordIndex(generations, min_rebuild_interval=0)
+        index.ensure_built(_FakeSession(["python"]))
+
+        generations.bump("java")
+        session.words.append("java")
+        start = time.monotonic()
+        for _ in range(5):
+            index.ensure_built(session)
+        assert time.monotonic() - start < 0.1
+        assert "java" not in index
+
+        _wait_for_rebuild(index)
+        assert session.loads == 1
+        assert "java" in index
+
+    def test_local_writes_during_rebuild_are_kept(self, fake_sessions):
+        """Writes after the rebuild read the table should survive the swap."""
+        generations = GenerationTable(slots=64)
+        session = _FakeSession(["python", "java"], delay=0.1)
+        index = WordIndex(generations, min_rebuild_interval=0)
+        index.ensure_built(_FakeSession(["python", "java"]))
+
+        generations.bump("go")
+        index.ensure_built(session)
+        while not session.loads:
+            time.sleep(0.001)
+        generations.bump("kotlin")
+        index.add("kotlin")
+        generations.bump("java")
+        index.remove("java")
+        _wait_for_rebuild(index)
+
+        assert index.prefix("", 10) == ["kotlin", "python"]
+        index.ensure_built(session)
+        assert session.loads == 1
+
+    def test_failed_rebuild_keeps_the_index(self, fake_sessions):
+        generations = GenerationTable(slots=64)
+        index = WordIndex(generations, min_rebuild_interval=60)
+        index.ensure_built(_FakeSession(["python"]))
+        index._built_at -= 60
+
+        class Broken(_FakeSession):
+            def exec(self, statement):
+                self.loads += 1
+                raise OSError("connection lost")
+
+        broken = Broken([])
+        generations.bump("java")
+        index.ensure_built(broken)
+        _wait_for_rebuild(index)
+        assert "python" in index
+        index.ensure_built(broken)
+        assert broken.loads == 1
+
+    def test_concurrent_async_builds_load_once(self):
+        session = _FakeAsyncSession(["python"], delay=0.01)
+        index = WordIndex(GenerationTable(slots=64), min_rebuild_interval=0)
+
+        async def main():
+            await asyncio.gather(*(index.ensure_built_async(session) for _ in range(8)))
+
+        asyncio.run(main())
+        assert session.loads == 1
+        assert "python" in index
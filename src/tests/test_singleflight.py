@@ -0,0 +1,138 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.backend.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls in the threadpool handlers."""
+
+    def _run_concurrently(self, flight, fn, n=10):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(flight.do("word", fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_share_one_query(self):
+        """Callers overlapping the first one should get its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        queries = []
+
+        def query():
+            queries.append(1)
+            release.wait(5)
+            return "definition"
+
+        threads, results, _ = self._run_concurrently(flight, query)
+        while flight.coalesced < 9:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(queries) == 1
+        assert results == ["definition"] * 10
+        assert flight.stats() == {"calls": 1, "coalesced": 9}
+
+    def test_errors_reach_every_caller(self):
+        """A failed query should raise in the leader and all followers."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def query():
+            release.wait(5)
+            raise RuntimeError("db down")
+
+        threads, results, errors = self._run_concurrently(flight, query, n=5)
+        while flight.coalesced < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == []
+        assert [str(e) for e in errors] == ["db down"] * 5
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Nothing is cached once the in-flight call finished."""
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("a", lambda: 2) == 2
+        assert flight.stats() == {"calls": 2, "coalesced": 0}
+
+
+class TestAsyncSingleFlight:
+    """Test coalescing of concurrent coroutines."""
+
+    def test_concurrent_coroutines_share_one_query(self):
+        flight = AsyncSingleFlight()
+        queries = []
+
+        async def query():
+            queries.append(1)
+            await asyncio.sleep(0.01)
+            return None  # a 404 is shared as well
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("missing", query) for _ in range(10))
+            )
+
+        assert asyncio.run(run()) == [None] * 10
+        assert len(queries) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 9}
+
+    def test_errors_reach_every_coroutine(self):
+        flight = AsyncSingleFlight()
+
+        async def query():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("w", query) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert [str(e) for e in results] == ["db down"] * 3
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(flight.do("w", query))
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        """A waiter should run the query itself when its leader is cancelled."""
+        flight = AsyncSingleFlight()
+        queries = []
+
+        async def query():
+            queries.append(1)
+            await asyncio.sleep(0.05)
+            return "definition"
+
+        async def run():
+            leader = asyncio.create_task(flight.do("w", query))
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.create_task(flight.do("w", query)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            return leader, waiters, results
+
+        leader, waiters, results = asyncio.run(run())
+        assert leader.cancelled()
+        assert not any(waiter.cancelled() for waiter in waiters)
+        assert results == ["definition"] * 3
+        # The leader's query and one retry shared by the waiters
+        assert len(queries) == 2